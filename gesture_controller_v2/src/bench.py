@@ -0,0 +1,226 @@
+"""Headless capture + inference benchmark (no Qt, no camera).
+
+    python -m gesture_controller_v2.src.bench --resolution 1280x720 640x480 --max-hands 1 2
+    python -m gesture_controller_v2.src.bench --source sesion.gcs --frames 600 --json bench.json
+
+Drives ``CameraLoop.process_frame`` (mirror + MediaPipe) with synthetic
+frames, an mp4 or a recorded session, and reports sustained FPS, per-frame
+inference time, CPU usage and memory for every resolution/max_hands pair.
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import cv2
+import numpy as np
+
+from .services.camera_loop import CameraLoop
+from .services.frame_pool import FramePool
+from .services.inference_scheduler import AdaptiveInferenceScheduler
+from .services.mediapipe_hand_tracker import MediapipeHandTracker
+from .services.session_recorder import read_session
+from .utils.logger import get_logger
+from reality_hologram.src.utils.latency import get_recorder, percentile
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+log = get_logger(__name__)
+
+
+def parse_resolution(text: str) -> Tuple[int, int]:
+    try:
+        width, height = text.lower().split("x")
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Resolucion invalida '{text}' (usa ANCHOxALTO, ej: 1280x720)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark headless de captura + inferencia")
+    parser.add_argument(
+        "--source",
+        default="synthetic",
+        help="synthetic, un .mp4 o una sesion grabada (.gcs).",
+    )
+    parser.add_argument(
+        "--resolution",
+        type=parse_resolution,
+        nargs="+",
+        default=[(1280, 720)],
+        help="Una o varias resoluciones ANCHOxALTO.",
+    )
+    parser.add_argument("--max-hands", type=int, nargs="+", default=[2], help="Uno o varios valores de max_hands.")
+    parser.add_argument("--frames", type=int, default=300, help="Frames medidos por configuracion.")
+    parser.add_argument("--warmup", type=int, default=30, help="Frames descartados antes de medir.")
+    parser.add_argument("--inference-width", type=int, default=0, help="Igual que en main (0 = resolucion completa).")
+    parser.add_argument("--roi", action="store_true", help="Igual que en main.")
+    parser.add_argument("--adaptive", action="store_true", help="Igual que en main.")
+    parser.add_argument("--max-skip", type=int, default=4, help="Igual que en main.")
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="Mide el pico de memoria Python con tracemalloc (agrega overhead al tiempo).",
+    )
+    parser.add_argument("--json", type=str, help="Guarda los resultados en este archivo JSON.")
+    return parser.parse_args()
+
+
+def synthetic_frames(width: int, height: int, count: int = 16) -> Iterator[np.ndarray]:
+    """Noise with a moving bright blob, so frames are not identical."""
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(count):
+        frame = rng.integers(0, 64, (height, width, 3), dtype=np.uint8)
+        center = (int(width * (0.2 + 0.6 * i / count)), height // 2)
+        cv2.circle(frame, center, max(8, height // 8), (180, 200, 220), -1)
+        frames.append(frame)
+    return itertools.cycle(frames)
+
+
+def video_frames(path: str, width: int, height: int) -> Iterator[np.ndarray]:
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise SystemExit(f"No se pudo abrir el video {path}")
+    resized = np.empty((height, width, 3), dtype=np.uint8)
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # loop so long runs do not end early
+            ok, frame = cap.read()
+            if not ok:
+                raise SystemExit(f"El video {path} no tiene frames")
+        yield _fit(frame, resized)
+
+
+def session_frames(path: str, width: int, height: int) -> Iterator[np.ndarray]:
+    resized = np.empty((height, width, 3), dtype=np.uint8)
+    while True:
+        empty = True
+        for _, frame in read_session(path):
+            empty = False
+            yield _fit(frame, resized)
+        if empty:
+            raise SystemExit(f"La sesion {path} no tiene frames")
+
+
+def _fit(frame: np.ndarray, out: np.ndarray) -> np.ndarray:
+    if frame.shape == out.shape:
+        return frame
+    return cv2.resize(frame, (out.shape[1], out.shape[0]), dst=out)
+
+
+def open_source(source: str, width: int, height: int) -> Iterator[np.ndarray]:
+    if source == "synthetic":
+        return synthetic_frames(width, height)
+    if Path(source).suffix.lower() == ".gcs":
+        return session_frames(source, width, height)
+    return video_frames(source, width, height)
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS.
+    return rss / (1024.0 * 1024.0) if sys.platform == "darwin" else rss / 1024.0
+
+
+def run_config(args, width: int, height: int, max_hands: int) -> Dict[str, object]:
+    scheduler = AdaptiveInferenceScheduler(max_hands=max_hands, max_interval=args.max_skip) if args.adaptive else None
+    tracker = MediapipeHandTracker(
+        max_hands=max_hands,
+        inference_width=args.inference_width or None,
+        roi_tracking=args.roi,
+        pool=FramePool((height, width, 3)),
+        scheduler=scheduler,
+    )
+    # Same processing path as the live loop; the camera is never opened.
+    loop = CameraLoop(camera_index=-1, callback=None, width=width, height=height, tracker=tracker)
+    frames = open_source(args.source, width, height)
+    pool = loop.pool
+
+    def step() -> float:
+        buf = pool.acquire()
+        np.copyto(buf, next(frames))  # stands in for cap.read(image=buf)
+        start = time.perf_counter()
+        loop.process_frame(buf, start)
+        elapsed = time.perf_counter() - start
+        pool.release(buf)
+        pool.end_frame()
+        return elapsed
+
+    for _ in range(args.warmup):
+        step()
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    times: List[float] = []
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for _ in range(args.frames):
+        times.append(step())
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    traced_peak = 0.0
+    if args.tracemalloc:
+        traced_peak = tracemalloc.get_traced_memory()[1] / (1024.0 * 1024.0)
+        tracemalloc.stop()
+    tracker.hands.close()
+
+    ordered = sorted(times)
+    result = {
+        "resolution": f"{width}x{height}",
+        "max_hands": max_hands,
+        "frames": args.frames,
+        "fps": args.frames / wall if wall else 0.0,
+        "infer_mean_ms": 1000.0 * sum(times) / len(times),
+        "infer_p50_ms": 1000.0 * percentile(ordered, 50),
+        "infer_p95_ms": 1000.0 * percentile(ordered, 95),
+        "infer_p99_ms": 1000.0 * percentile(ordered, 99),
+        # Can exceed 100% when MediaPipe uses several cores.
+        "cpu_percent": 100.0 * cpu / wall if wall else 0.0,
+        "peak_rss_mb": peak_rss_mb(),  # process peak so far, so it only grows across configs
+        "traced_peak_mb": traced_peak,
+        "pool_allocations": pool.stats()["allocations"],
+    }
+    if scheduler:
+        result["inference_ratio"] = scheduler.stats()["inference_ratio"]
+    return result
+
+
+def print_table(results: List[Dict[str, object]]):
+    header = f"{'resolucion':>11} {'manos':>5} {'fps':>7} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'cpu %':>6} {'rss MB':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['resolution']:>11} {r['max_hands']:>5} {r['fps']:>7.1f} {r['infer_p50_ms']:>7.1f} "
+            f"{r['infer_p95_ms']:>7.1f} {r['infer_p99_ms']:>7.1f} {r['cpu_percent']:>6.0f} {r['peak_rss_mb']:>7.0f}"
+        )
+
+
+def main():
+    args = parse_args()
+    get_recorder().interval = 0  # the table below replaces the periodic latency logs
+    results = []
+    for (width, height), max_hands in itertools.product(args.resolution, args.max_hands):
+        log.info("Benchmark %sx%s max_hands=%s (%s)", width, height, max_hands, args.source)
+        results.append(run_config(args, width, height, max_hands))
+    print_table(results)
+    if args.json:
+        report = {"source": args.source, "platform": sys.platform, "results": results}
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        log.info("Resultados guardados en %s", args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Standalone capture + inference process publishing to shared memory.
+
+    python -m gesture_controller_v2.src.capture_service serve --name gesture_ring
+    python -m gesture_controller_v2.src.main --attach gesture_ring
+    python -m gesture_controller_v2.src.capture_service record gesture_ring --record sesion.gcs
+
+The camera, MediaPipe and the GIL they need live in this process; the GUI,
+the CLI controller and recorders only read the ring.
+"""
+
+import argparse
+import signal
+import sys
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from .options import add_capture_arguments, build_engine, build_tracker
+from .services.camera_loop import CameraLoop
+from .services.landmark_arrays import NO_HAND, NUM_LANDMARKS, result_to_arrays
+from .services.landmark_store import LandmarkStoreWriter
+from .services.session_recorder import SessionRecorder
+from .services.shared_frame_ring import SharedFrameRing, SharedRingLoop
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_RING = "gesture_ring"
+
+
+class CapturePublisher:
+    """CameraLoop callback that copies each processed frame into the ring."""
+
+    def __init__(self, name: str, max_hands: int = 2, slots: int = 4):
+        self.name = name
+        self.max_hands = max_hands
+        self.slots = slots
+        self.ring: Optional[SharedFrameRing] = None
+        self._arrays = (
+            np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32),
+            np.full(max_hands, NO_HAND, dtype=np.int8),
+            np.zeros(max_hands, dtype=np.float32),
+        )
+
+    def __call__(self, frame, hand_data, trace=None):
+        if self.ring is not None and tuple(frame.shape) != self.ring.shape:
+            # The camera came back at another resolution (e.g. after a backend swap).
+            log.warning(
+                "Frame shape changed %s -> %s; recreating shared ring '%s'", self.ring.shape, frame.shape, self.name
+            )
+            self.close()
+        if self.ring is None:
+            # Sized from the first frame, which is what the camera actually negotiated.
+            self.ring = SharedFrameRing(self.name, frame.shape, self.max_hands, self.slots)
+            log.info("Publishing %s frames on shared ring '%s'", frame.shape, self.name)
+        landmarks, handedness, scores, count = result_to_arrays(hand_data, self.max_hands, out=self._arrays)
+        # Publish the grab time so consumers can measure latency from the camera.
+        ts = trace["grab"] if trace else time.perf_counter()
+        self.ring.publish(frame, landmarks, handedness, scores, count, ts)
+
+    def close(self):
+        if self.ring:
+            log.info("Shared ring '%s' published %s frames.", self.name, self.ring.write_seq)
+            self.ring.close()
+            self.ring = None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Servicio de captura + inferencia en memoria compartida")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Abre la camara, infiere y publica frames + landmarks.")
+    serve.add_argument("--name", default=DEFAULT_RING, help="Nombre del segmento de memoria compartida.")
+    serve.add_argument("--camera-index", type=int, default=0, help="Indice de camara (0/1/2).")
+    serve.add_argument("--slots", type=int, default=4, help="Frames en el ring (consumidores lentos pierden frames).")
+    add_capture_arguments(serve)
+
+    record = commands.add_parser("record", help="Se adjunta a un ring y graba frames y/o landmarks.")
+    record.add_argument("name", nargs="?", default=DEFAULT_RING, help="Nombre del ring publicado por serve.")
+    record.add_argument("--record", type=str, help="Graba los frames en este archivo de sesion.")
+    record.add_argument("--landmarks-out", type=str, help="Guarda los landmarks en un store memory-mapped.")
+    return parser.parse_args()
+
+
+def wait_for_signal(stop: Optional[threading.Event] = None):
+    stop = stop or threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    while not stop.is_set():
+        stop.wait(0.5)
+
+
+def serve(args):
+    publisher = CapturePublisher(args.name, slots=args.slots)
+    ended = threading.Event()  # a --replay session without --replay-loop finished
+    loop = CameraLoop(
+        camera_index=args.camera_index,
+        callback=publisher,
+        tracker=build_tracker(args),
+        engine=build_engine(args, args.camera_index),
+        on_finished=ended.set,
+    )
+    if not loop.start():
+        log.error("No se pudo iniciar la camara. Revisa que no este en uso y prueba otro indice (0/1/2).")
+        sys.exit(1)
+    try:
+        wait_for_signal(ended)
+    finally:
+        loop.stop()
+        publisher.close()
+
+
+def record(args):
+    if not args.record and not args.landmarks_out:
+        log.error("Indica --record y/o --landmarks-out.")
+        sys.exit(2)
+    loop = SharedRingLoop(args.name, recorder=SessionRecorder(args.record) if args.record else None)
+    landmark_writer = LandmarkStoreWriter(args.landmarks_out) if args.landmarks_out else None
+    if landmark_writer:
+        loop.add_result_hook(landmark_writer.append_result)
+    loop.start()
+    try:
+        wait_for_signal()
+    finally:
+        loop.stop()
+        if landmark_writer:
+            landmark_writer.close()
+            log.info("Landmarks guardados en %s (%s frames).", args.landmarks_out, landmark_writer.count)
+
+
+def main():
+    args = parse_args()
+    if args.command == "serve":
+        serve(args)
+    else:
+        record(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 """Qt GUI for gesture_controller_v2 using the existing architecture as referencia."""
 
 import sys
+from functools import partial
 from pathlib import Path
-from PySide6.QtCore import Qt, QProcess
+from typing import Callable, Dict, Sequence
+from PySide6.QtCore import Qt, QProcess, QTimer
 from PySide6.QtGui import QFont, QPixmap
 from PySide6.QtWidgets import (
     QCheckBox,
@@ -22,34 +24,71 @@ from PySide6.QtWidgets import QMainWindow
 from ..core.command_bridge import CommandBridge
 from ..core.events import GestureEvent
 from ..services.camera_worker import CameraWorker
+from ..services.capture_engine import CaptureEngine
+from ..services.gesture_mapper import GestureMapper
+from ..services.gesture_merger import GestureMerger
+from ..services.gesture_state import GestureStateMachine
+from ..services.mediapipe_hand_tracker import MediapipeHandTracker
 from ..utils.logger import get_logger
-from reality_hologram.src.rendering.scene_manager import SceneManager
+from reality_hologram.src.core.service_container import get_services
 import mss
 import mss.tools
 import tempfile
 import subprocess
-import time
 import ctypes
 
 log = get_logger(__name__)
 
 
 class MainWindow(QMainWindow):
-    def __init__(self, camera_index: int = 0):
+    def __init__(
+        self,
+        camera_index: int = 0,
+        tracker_factory: Callable[[], MediapipeHandTracker] | None = None,
+        engine_factory: Callable[[int], CaptureEngine] | None = None,
+        camera_indices: Sequence[int] | None = None,
+        camera_priorities: Dict[int, int] | None = None,
+        attach: str | None = None,
+        mapper_factory: Callable[[], GestureMapper] | None = None,
+        bridge: CommandBridge | None = None,
+    ):
         super().__init__()
         self.setWindowTitle("Gesture Controller - Holograma")
         self.setGeometry(100, 100, 1000, 620)
 
-        self.command_bridge = CommandBridge()
-        self.camera_worker = CameraWorker(camera_index=camera_index)
+        # Async bridges route on their own thread, keeping the GUI thread free.
+        self.command_bridge = bridge or CommandBridge()
+        # One worker (and tracker) per camera; only the first one feeds the preview.
+        # With ``attach`` a single worker reads a capture_service ring instead.
+        self.camera_indices = [camera_index] if attach else list(camera_indices or [camera_index])
+        self.camera_workers = []
+        for index in self.camera_indices:
+            worker = CameraWorker(
+                camera_index=index,
+                tracker=tracker_factory() if tracker_factory and not attach else None,
+                engine=engine_factory(index) if engine_factory and not attach else None,
+                attach=attach,
+                mapper=mapper_factory() if mapper_factory else None,
+            )
+            worker.gesture_detected.connect(partial(self._on_camera_gesture, index))
+            worker.error.connect(self.on_error)
+            self.camera_workers.append(worker)
+        self.camera_worker = self.camera_workers[0]
         self.camera_worker.frame_ready.connect(self.update_frame)
-        self.camera_worker.gesture_detected.connect(self.handle_gesture)
-        self.camera_worker.error.connect(self.on_error)
+        if camera_priorities:
+            self.gesture_merger = GestureMerger(camera_priorities)
+        else:
+            self.gesture_merger = GestureMerger.from_order(self.camera_indices)
+        # Commands go out on gesture transitions; the timer lets held gestures
+        # expire even when the workers stop reporting the hand.
+        self.gesture_state = GestureStateMachine()
+        self._gesture_timer = QTimer(self)
+        self._gesture_timer.timeout.connect(lambda: self._update_gesture_state([]))
+        self._gesture_timer.start(50)
         self.hologram_process: QProcess | None = None
         self.hologram_logs: str = ""
-        self.scene_manager = SceneManager()
+        self.scene_manager = get_services().get("scene_manager")
         self.available_scenes = self.scene_manager.list_available()
-        self._last_action_time = {"shutdown": 0.0}
         self.selected_video_path: str | None = None
         self.video_files = self._load_video_files()
         # Defaults for actor/terrain if existen
@@ -200,12 +239,14 @@ class MainWindow(QMainWindow):
         if self.camera_worker.isRunning():
             QMessageBox.information(self, "Cámara activa", "La cámara ya está en funcionamiento.")
             return
-        self.camera_worker.start()
+        for worker in self.camera_workers:
+            worker.start()
         QMessageBox.information(self, "Detección iniciada", "El sistema de gestos ha comenzado.")
 
     def stop_detection(self):
         if self.camera_worker.isRunning():
-            self.camera_worker.stop()
+            for worker in self.camera_workers:
+                worker.stop()
             QMessageBox.warning(self, "Detección detenida", "El sistema de gestos ha sido detenido.")
         else:
             QMessageBox.information(self, "Cámara inactiva", "La cámara ya estaba detenida.")
@@ -218,15 +259,29 @@ class MainWindow(QMainWindow):
         pixmap = QPixmap.fromImage(qt_image)
         self.camera_label.setPixmap(pixmap.scaled(self.camera_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
 
+    def _on_camera_gesture(self, camera_index: int, gesture: GestureEvent):
+        """Drop duplicates of the same gesture seen by lower-priority cameras."""
+        if self.gesture_merger.accept(camera_index, gesture):
+            self._update_gesture_state([gesture])
+
+    def _update_gesture_state(self, gestures):
+        for gesture in self.gesture_state.update(gestures):
+            self.handle_gesture(gesture)
+
     def handle_gesture(self, gesture: GestureEvent):
         """Update UI status and forward command to reality pipeline."""
-        self.gesture_status.setText(f"Gesto detectado: {gesture.kind} ({gesture.hand})")
+        if gesture.phase == "start":
+            self.gesture_status.setText(f"Gesto detectado: {gesture.kind} ({gesture.hand})")
         action, payload = self._map_gesture_to_command(gesture)
         if action:
-            if not self._can_send(action):
-                return
-            response = self.command_bridge.send(action, payload)
-            log.info("Gesture -> command: %s payload=%s response=%s", action, payload, response)
+            self.command_bridge.send(
+                action, payload, trace=gesture.trace, callback=partial(self._log_response, action, payload)
+            )
+
+    @staticmethod
+    def _log_response(action, payload, response):
+        # May run on the bridge's writer thread: log only, no widgets.
+        log.info("Gesture -> command: %s payload=%s response=%s", action, payload, response)
 
     def on_error(self, message: str):
         QMessageBox.critical(self, "Error de cámara", message)
@@ -298,7 +353,11 @@ class MainWindow(QMainWindow):
         action = None
         payload = None
 
-        if gesture.kind == "open":
+        if gesture.phase == "end":
+            if gesture.kind in ("open", "two_fingers"):
+                action = "move"
+                payload = {"direction": "stop", "speed": 0.0}
+        elif gesture.kind == "open":
             action = "move"
             payload = {"direction": "forward", "speed": 1.0}
         elif gesture.kind == "fist":
@@ -316,17 +375,17 @@ class MainWindow(QMainWindow):
         elif gesture.kind == "three_fingers":
             action = "resume"
             payload = {"target": "actor"}
+        elif gesture.kind == "two_hand_spread":
+            action = "zoom"
+            payload = {"delta": gesture.payload.get("delta", 0.0) if gesture.payload else 0.0}
+        elif gesture.kind in ("swipe_up", "swipe_down"):
+            action = "zoom"
+            payload = {"delta": 0.3 if gesture.kind == "swipe_up" else -0.3}
+        elif gesture.kind in ("circle_cw", "circle_ccw"):
+            action = "rotate"
+            payload = {"axis": "y", "degrees": -90.0 if gesture.kind == "circle_cw" else 90.0}
         return action, payload
 
-    def _can_send(self, action: str, cooldown: float = 0.5) -> bool:
-        """Avoid spamming the same action (especially shutdown)."""
-        now = time.time()
-        last = self._last_action_time.get(action, 0.0)
-        if now - last < cooldown:
-            return False
-        self._last_action_time[action] = now
-        return True
-
     def _button_style(self, color):
         return f"""
         QPushButton {{
@@ -370,10 +429,13 @@ class MainWindow(QMainWindow):
         """
 
     def closeEvent(self, event):
-        if self.camera_worker.isRunning():
-            self.camera_worker.stop()
+        for worker in self.camera_workers:
+            if worker.isRunning():
+                worker.stop()
         if self.hologram_process and self.hologram_process.state() != QProcess.NotRunning:
             self.hologram_process.terminate()
+        self.command_bridge.close()
+        log.info("Command bridge: %s", self.command_bridge.stats())
         super().closeEvent(event)
 
     def select_video(self):
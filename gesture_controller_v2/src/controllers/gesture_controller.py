@@ -1,27 +1,89 @@
 """Main orchestrator for gesture detection and command routing."""
 
+import threading
 import time
-from typing import Optional
+from functools import partial
+from typing import Callable, Dict, Optional, Sequence
 
 from ..core.command_bridge import CommandBridge
 from ..core.events import GestureEvent
 from ..services.camera_loop import CameraLoop
+from ..services.capture_engine import CaptureEngine
 from ..services.gesture_mapper import GestureMapper
+from ..services.gesture_merger import GestureMerger
+from ..services.gesture_state import GestureStateMachine
+from ..services.mediapipe_hand_tracker import MediapipeHandTracker
+from ..services.motion_gestures import MotionGestureRecognizer
+from ..services.session_recorder import SessionRecorder
+from ..services.shared_frame_ring import SharedRingLoop
 from ..utils.logger import get_logger
-from reality_hologram.src.rendering.scene_manager import SceneManager
+from reality_hologram.src.core.service_container import get_services
+from reality_hologram.src.utils.latency import mark
 
 log = get_logger(__name__)
 
 
+def _log_response(action, payload, response):
+    log.info("Gesture -> command: %s payload=%s response=%s", action, payload, response)
+
+
 class GestureController:
-    def __init__(self, camera_index: int = 0, warmup_frames: int = 5, preview: bool = True):
-        self.mapper = GestureMapper()
-        self.camera_loop = CameraLoop(camera_index=camera_index, callback=self._handle_frame)
-        self.bridge = CommandBridge()
-        self._frame_count = 0
+    def __init__(
+        self,
+        camera_index: int = 0,
+        warmup_frames: int = 5,
+        preview: bool = True,
+        tracker_factory: Optional[Callable[[], MediapipeHandTracker]] = None,
+        engine_factory: Optional[Callable[[int], CaptureEngine]] = None,
+        recorder: Optional[SessionRecorder] = None,
+        camera_indices: Optional[Sequence[int]] = None,
+        camera_priorities: Optional[Dict[int, int]] = None,
+        attach: Optional[str] = None,
+        mapper_factory: Optional[Callable[[], GestureMapper]] = None,
+        bridge: Optional[CommandBridge] = None,
+    ):
+        # One CameraLoop (grab + inference threads, own tracker) per camera; the
+        # native OpenCV/MediaPipe work releases the GIL so cameras run in parallel.
+        self.camera_indices = list(camera_indices or [camera_index])
+        # Each camera needs its own recognizer: trajectories are per-camera state.
+        mapper_factory = mapper_factory or (lambda: GestureMapper(motion=MotionGestureRecognizer()))
+        self.mappers: Dict[int, GestureMapper] = {}
+        self.camera_loops = []
+        if attach:
+            # Capture and inference run in a capture_service process; just read its ring.
+            self.camera_indices = [camera_index]
+            self.mappers[camera_index] = mapper_factory()
+            self.camera_loops.append(
+                SharedRingLoop(attach, callback=partial(self._handle_frame, camera_index), recorder=recorder)
+            )
+        for i, index in enumerate([] if attach else self.camera_indices):
+            self.mappers[index] = mapper_factory()
+            self.camera_loops.append(
+                CameraLoop(
+                    camera_index=index,
+                    callback=partial(self._handle_frame, index),
+                    tracker=tracker_factory() if tracker_factory else None,
+                    engine=engine_factory(index) if engine_factory else None,
+                    recorder=recorder if i == 0 else None,
+                    on_finished=self._on_loop_finished,
+                )
+            )
+        self.camera_loop = self.camera_loops[0]  # primary camera (preview, recording)
+        self.mapper = self.mappers[self.camera_indices[0]]
+        if camera_priorities:
+            self.merger = GestureMerger(camera_priorities)
+        else:
+            self.merger = GestureMerger.from_order(self.camera_indices)
+        # Shared by all cameras (after de-duplication) so each hand has one state.
+        self.gesture_state = GestureStateMachine()
+        self._dispatch_lock = threading.Lock()
+        # Set once every camera source has ended (replays without --replay-loop).
+        self.finished = threading.Event()
+        self.bridge = bridge or CommandBridge()
+        self._frame_counts: Dict[int, int] = {index: 0 for index in self.camera_indices}
         self._warmup_frames = warmup_frames
         self.preview = preview
-        self.scene_manager = SceneManager()
+        self.scene_manager = get_services().get("scene_manager")
         self.scene_ids = self.scene_manager.list_available()
         self.scene_cursor = 0
         self._action_state = {"moving": False, "playing": True}
@@ -29,12 +91,25 @@ class GestureController:
     def start(self) -> bool:
         log.info("Starting gesture loop (v2)...")
         self.bridge.send("boot", {"scene": "default"})
-        return self.camera_loop.start()
+        started = [loop.start() for loop in self.camera_loops]
+        for index, ok in zip(self.camera_indices, started):
+            if not ok:
+                log.warning("Camera %s did not start; continuing with the rest.", index)
+        return any(started)
 
     def stop(self):
         log.info("Stopping gesture loop.")
-        self.camera_loop.stop()
+        for loop in self.camera_loops:
+            loop.stop()
+        with self._dispatch_lock:
+            for gesture in self.gesture_state.reset():
+                self._dispatch_gesture(gesture)
+        log.info("Gesture states: %s", self.gesture_state.stats())
+        if len(self.camera_loops) > 1:
+            log.info("Multi-camera merge: %s", self.merger.stats())
         self.bridge.send("shutdown")
+        self.bridge.close()
+        log.info("Command bridge: %s", self.bridge.stats())
         if self.preview:
             try:
                 import cv2
@@ -43,20 +118,31 @@ class GestureController:
             except Exception:
                 pass
 
-    def _handle_frame(self, frame, hand_data):
-        """Handle a frame + hand landmarks emitted by CameraLoop."""
-        self._frame_count += 1
-        if self._frame_count <= self._warmup_frames:
-            return  # let mediapipe settle
+    def _on_loop_finished(self):
+        if all(getattr(loop, "finished", False) for loop in self.camera_loops):
+            self.finished.set()
 
-        gesture = self.mapper.classify(hand_data)
-        if not gesture:
-            if self.preview:
-                self._show_preview(frame)
-            return
+    def _handle_frame(self, camera_index, frame, hand_data, trace=None):
+        """Handle a frame + hand landmarks emitted by one camera's CameraLoop thread."""
+        self._frame_counts[camera_index] += 1
+        if self._frame_counts[camera_index] <= self._warmup_frames:
+            return  # let mediapipe settle
 
-        self._dispatch_gesture(gesture)
-        if self.preview:
+        # Only the primary camera previews: HighGUI windows are not thread-safe.
+        show_preview = self.preview and camera_index == self.camera_indices[0]
+        # Every tracked hand in one batch, plus combined two-hand gestures.
+        gestures = self.mappers[camera_index].classify_all(hand_data)
+        mark(trace, "classify")
+        accepted = []
+        for gesture in gestures:
+            gesture.trace = dict(trace) if trace is not None else None  # one trace per command
+            if self.merger.accept(camera_index, gesture):
+                accepted.append(gesture)
+        # Commands only on enter/exit (or at the repeat rate of continuous gestures).
+        with self._dispatch_lock:
+            for gesture in self.gesture_state.update(accepted):
+                self._dispatch_gesture(gesture)
+        if show_preview:
             self._show_preview(frame)
 
     def _dispatch_gesture(self, gesture: GestureEvent):
@@ -65,7 +151,12 @@ class GestureController:
         payload: Optional[dict] = None
 
         # Mapeo de gestos a controles tipo WASD/rotar/zoom
-        if gesture.kind == "open":
+        if gesture.phase == "end":
+            if gesture.kind in ("open", "two_fingers"):
+                # Soltar el gesto detiene el movimiento
+                action = "move"
+                payload = {"direction": "stop", "speed": 0.0}
+        elif gesture.kind == "open":
             # Adelante (W)
             action = "move"
             payload = {"direction": "forward", "speed": 1.0}
@@ -93,10 +184,22 @@ class GestureController:
             # Acelerar
             action = "accelerate"
             payload = {"factor": 0.5}
+        elif gesture.kind == "two_hand_spread":
+            # Dos manos abiertas: separar acerca, juntar aleja
+            action = "zoom"
+            payload = {"delta": gesture.payload.get("delta", 0.0)}
+        elif gesture.kind in ("swipe_up", "swipe_down"):
+            # Deslizar arriba acerca, abajo aleja
+            action = "zoom"
+            payload = {"delta": 0.3 if gesture.kind == "swipe_up" else -0.3}
+        elif gesture.kind in ("circle_cw", "circle_ccw"):
+            # Circulo: cuarto de vuelta en el sentido del dedo
+            action = "rotate"
+            payload = {"axis": "y", "degrees": -90.0 if gesture.kind == "circle_cw" else 90.0}
 
         if action:
-            response = self.bridge.send(action, payload)
-            log.info("Gesture -> command: %s payload=%s response=%s", action, payload, response)
+            # With an async bridge the response arrives later, on its writer thread.
+            self.bridge.send(action, payload, trace=gesture.trace, callback=partial(_log_response, action, payload))
         else:
             log.debug("Gesture ignored: %s", gesture)
 
@@ -1,18 +1,226 @@
 """Bridge between gesture controller and reality_hologram pipeline."""
 
-from typing import Dict, Optional
+import collections
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Deque, Dict, Optional
 
 from reality_hologram.src.controllers.command_router import CommandRouter
+from reality_hologram.src.core.command_coalescer import DEFAULT_POLICIES
 from reality_hologram.src.core.pipeline import RealityPipeline
+from reality_hologram.src.utils.latency import LatencyRecorder, mark
+
+from ..utils.logger import get_logger
+
+log = get_logger(__name__)
+
+Response = Dict[str, object]
+ResponseCallback = Callable[[Response], None]
+
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce")
+# Scene/lifecycle commands are never dropped to make room.
+KEEP_ACTIONS = frozenset({"boot", "load_scene", "shutdown"})
+
+
+class _Pending:
+    __slots__ = ("action", "payload", "source", "trace", "futures", "queued_at")
+
+    def __init__(self, action, payload, source, trace, future: Future):
+        self.action = action
+        self.payload = payload
+        self.source = source
+        self.trace = trace
+        self.futures = [future]
+        self.queued_at = time.perf_counter()
 
 
 class CommandBridge:
-    """Thin helper to route normalized commands into the renderer pipeline."""
+    """Thin helper to route normalized commands into the renderer pipeline.
 
-    def __init__(self, pipeline: Optional[RealityPipeline] = None):
+    By default ``send`` routes inline and returns the pipeline response.
+    With ``async_dispatch`` it only enqueues: a writer thread routes the
+    commands in order and ``send`` returns a Future with the response. The
+    queue holds ``queue_size`` commands; when full, ``overflow`` decides
+    what gives: ``drop_oldest`` discards the oldest droppable command,
+    ``coalesce`` first merges the new command into a queued one of the same
+    kind (rotate/zoom/move, as the pipeline coalescer does) and only drops
+    when nothing merges. Dropped commands resolve with ``status: dropped``.
+    """
+
+    def __init__(
+        self,
+        pipeline: Optional[RealityPipeline] = None,
+        async_dispatch: bool = False,
+        queue_size: int = 256,
+        overflow: str = "drop_oldest",
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}' (valid: {', '.join(OVERFLOW_POLICIES)})")
         self.pipeline = pipeline or RealityPipeline()
         self.router = CommandRouter(pipeline=self.pipeline)
+        self.async_dispatch = async_dispatch
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        # "queue_wait": enqueue -> picked by the writer; "send": enqueue -> response.
+        self.latency = LatencyRecorder(interval=0)
+        self._queue: Deque[_Pending] = collections.deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def send(
+        self,
+        action: str,
+        payload: Optional[Dict[str, object]] = None,
+        source: str = "gesture_controller_v2",
+        trace: Optional[Dict[str, float]] = None,
+        callback: Optional[ResponseCallback] = None,
+    ):
+        """Response dict (sync) or Future of it (async); ``callback`` gets the response either way."""
+        mark(trace, "send")
+        if not self.async_dispatch:
+            start = time.perf_counter()
+            response = self.router.route_command(action=action, payload=payload, source=source, trace=trace)
+            self.sent += 1
+            self.latency.record("send", time.perf_counter() - start)
+            if callback is not None:
+                callback(response)
+            return response
+
+        future: Future = Future()
+        if callback is not None:
+            future.add_done_callback(lambda done: callback(done.result()))
+        entry = _Pending(action, payload, source, trace, future)
+        with self._cond:
+            if self._closed:
+                future.set_result({"status": "dropped", "reason": "bridge closed"})
+                return future
+            self._ensure_thread()
+            self._enqueue_locked(entry)
+            self.max_depth = max(self.max_depth, len(self._queue))
+            self._cond.notify()
+        return future
+
+    def _enqueue_locked(self, entry: _Pending):
+        if len(self._queue) < self.queue_size:
+            self._queue.append(entry)
+            return
+        if self.overflow == "coalesce" and self._coalesce_locked(entry):
+            return
+        victim = next((queued for queued in self._queue if queued.action not in KEEP_ACTIONS), None)
+        if victim is not None:
+            self._queue.remove(victim)
+            self._queue.append(entry)
+        elif entry.action in KEEP_ACTIONS:
+            self._queue.append(entry)  # only lifecycle commands queued: let it grow
+            return
+        else:
+            victim = entry
+        self.dropped += 1
+        self._resolve(victim, {"status": "dropped", "reason": "dispatch queue full"})
+
+    def _coalesce_locked(self, entry: _Pending) -> bool:
+        merge = DEFAULT_POLICIES.get(entry.action)
+        if merge is None:
+            return False
+        # Only the newest queued command may absorb it: nothing sits between them.
+        last = self._queue[-1]
+        if last.action != entry.action:
+            return False
+        merged = merge(
+            {"action": last.action, "payload": last.payload or {}, "trace": last.trace},
+            {"action": entry.action, "payload": entry.payload or {}, "trace": entry.trace},
+        )
+        if merged is None:
+            return False
+        last.payload = merged["payload"]
+        last.trace = merged.get("trace")
+        last.futures.extend(entry.futures)
+        self.coalesced += 1
+        return True
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="CommandBridge", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                entry = self._queue.popleft()
+                self._busy = True
+            self.latency.record("queue_wait", time.perf_counter() - entry.queued_at)
+            mark(entry.trace, "dispatch")
+            try:
+                response = self.router.route_command(
+                    action=entry.action, payload=entry.payload, source=entry.source, trace=entry.trace
+                )
+            except Exception as exc:
+                log.warning("Command %s failed: %s", entry.action, exc)
+                response = {"status": "error", "reason": str(exc)}
+            self.sent += 1
+            self.latency.record("send", time.perf_counter() - entry.queued_at)
+            self._resolve(entry, response)
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    @staticmethod
+    def _resolve(entry: _Pending, response: Response):
+        for future in entry.futures:
+            try:
+                future.set_result(response)
+            except Exception as exc:
+                log.warning("Response callback for %s failed: %s", entry.action, exc)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued command has been routed; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 2.0):
+        """Route what is queued, then stop the writer thread.
 
-    def send(self, action: str, payload: Optional[Dict[str, object]] = None, source: str = "gesture_controller_v2"):
-        return self.router.route_command(action=action, payload=payload, source=source)
+        Commands still queued after ``timeout`` (the writer is stuck) resolve
+        with ``status: dropped`` so no caller waits on them forever.
+        """
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._cond:
+            abandoned = list(self._queue)
+            self._queue.clear()
+        if abandoned:
+            log.warning("Bridge closed with %d commands still queued; dropping them", len(abandoned))
+            self.dropped += len(abandoned)
+        for entry in abandoned:
+            self._resolve(entry, {"status": "dropped", "reason": "bridge closed"})
 
+    def stats(self):
+        return {
+            "depth": len(self._queue),
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "latency": self.latency.summary(),
+        }
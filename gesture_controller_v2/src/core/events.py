@@ -10,6 +10,8 @@ class GestureEvent:
     hand: str  # "Left" or "Right" from MediaPipe
     confidence: float
     payload: Optional[Dict[str, float]] = None
+    phase: str = "start"  # start / repeat / end, see services.gesture_state
+    trace: Optional[Dict[str, float]] = None  # stage -> perf_counter, see reality_hologram.src.utils.latency
 
 
 @dataclass
@@ -1,15 +1,25 @@
 """Entry point for gesture_controller_v2 (GUI por defecto, CLI opcional)."""
 
 import argparse
+import shlex
 import signal
 import sys
-import time
+from functools import partial
 
 from PySide6.QtWidgets import QApplication
 
 from .components.main_window import MainWindow
 from .controllers.gesture_controller import GestureController
+from .options import add_capture_arguments, build_engine, build_mapper, build_tracker
+from .services.gesture_classifier import open_classifier
+from .services.landmark_store import LandmarkStoreWriter
+from .services.session_recorder import SessionRecorder
+from .core.command_bridge import OVERFLOW_POLICIES, CommandBridge
 from .utils.logger import get_logger
+from reality_hologram.src.core.command_queue import CommandQueue
+from reality_hologram.src.core.command_socket import CommandFanout
+from reality_hologram.src.core.pipeline import RealityPipeline
+from reality_hologram.src.utils.latency import dump_at_exit
 
 log = get_logger(__name__)
 
@@ -17,17 +27,135 @@ log = get_logger(__name__)
 def parse_args():
     parser = argparse.ArgumentParser(description="Gesture Controller v2")
     parser.add_argument("--camera-index", type=int, default=0, help="Indice de camara (0/1/2).")
+    parser.add_argument(
+        "--cameras",
+        type=int,
+        nargs="+",
+        help="Varias camaras a la vez (ej: 0 1 2). La primera tiene mayor prioridad y es la del preview.",
+    )
+    parser.add_argument(
+        "--camera-priority",
+        type=int,
+        nargs="+",
+        help="Prioridad por camara, en el mismo orden que --cameras (mayor gana al deduplicar gestos).",
+    )
     parser.add_argument("--no-preview", action="store_true", help="Desactiva ventana de preview (solo CLI).")
     parser.add_argument("--cli", action="store_true", help="Ejecuta en modo CLI (sin Qt).")
+    parser.add_argument(
+        "--embedded",
+        action="store_true",
+        help="Corre el viewer de Panda3D en este mismo proceso (sin Qt ni preview); los comandos van por memoria.",
+    )
+    parser.add_argument(
+        "--viewer-args",
+        type=str,
+        default="--pepper",
+        help="Argumentos del viewer en modo --embedded (ej: \"--pepper --scene bosque\").",
+    )
+    add_capture_arguments(parser)
+    parser.add_argument(
+        "--attach",
+        type=str,
+        metavar="NOMBRE",
+        help="Consume frames y landmarks de un capture_service ya en marcha (memoria compartida) en vez de abrir la camara.",
+    )
+    parser.add_argument(
+        "--classifier",
+        type=str,
+        default="rules",
+        metavar="MODELO",
+        help="rules (reglas de dedos, por defecto) o un modelo .npz entrenado con gesture_controller_v2.src.train.",
+    )
+    parser.add_argument(
+        "--async-dispatch",
+        action="store_true",
+        help="Envia los comandos al pipeline desde un hilo propio (cola acotada) sin bloquear captura ni GUI.",
+    )
+    parser.add_argument("--dispatch-queue", type=int, default=256, help="Tamano de la cola con --async-dispatch.")
+    parser.add_argument(
+        "--dispatch-overflow",
+        choices=OVERFLOW_POLICIES,
+        default="drop_oldest",
+        help="Cola llena: descartar el comando mas viejo o fusionarlo con el ultimo del mismo tipo (coalesce).",
+    )
+    parser.add_argument(
+        "--fanout",
+        action="store_true",
+        help="Envia tambien los comandos a todos los viewers lanzados con --listen (socket local, una piramide por viewer).",
+    )
+    parser.add_argument("--record", type=str, help="Graba los frames crudos de la sesion en este archivo (CLI).")
+    parser.add_argument(
+        "--landmarks-out", type=str, help="Guarda los landmarks de cada inferencia en un store memory-mapped (CLI)."
+    )
+    parser.add_argument(
+        "--latency-report", type=str, help="Al salir, guarda p50/p95/p99 de latencia por etapa (JSON) en esta ruta."
+    )
     return parser.parse_args()
 
 
-def run_cli(camera_index: int, preview: bool):
-    controller = GestureController(camera_index=camera_index, preview=preview)
+def camera_priorities(args):
+    if not args.camera_priority:
+        return None
+    return dict(zip(args.cameras or [args.camera_index], args.camera_priority))
 
-    def shutdown(signum=None, frame=None):
+
+def build_pipeline(args, command_queue=None) -> RealityPipeline:
+    return RealityPipeline(fanout=CommandFanout() if args.fanout else None, command_queue=command_queue)
+
+
+def build_bridge(args, pipeline=None) -> CommandBridge:
+    return CommandBridge(
+        pipeline or build_pipeline(args),
+        async_dispatch=args.async_dispatch,
+        queue_size=args.dispatch_queue,
+        overflow=args.dispatch_overflow,
+    )
+
+
+def build_controller(args, preview: bool, bridge=None) -> GestureController:
+    classifier = open_classifier(args.classifier)
+    recorder = SessionRecorder(args.record) if args.record else None
+    return GestureController(
+        camera_index=args.camera_index,
+        preview=preview,
+        tracker_factory=partial(build_tracker, args),
+        engine_factory=partial(build_engine, args),
+        recorder=recorder,
+        camera_indices=args.cameras,
+        camera_priorities=camera_priorities(args),
+        attach=args.attach,
+        mapper_factory=partial(build_mapper, classifier),
+        bridge=bridge or build_bridge(args),
+    )
+
+
+def open_landmark_writer(args, controller: GestureController):
+    if not args.landmarks_out:
+        return None
+    landmark_writer = LandmarkStoreWriter(args.landmarks_out)
+    # Attached loops have no local tracker but publish the same result hooks.
+    hooks = controller.camera_loop.tracker or controller.camera_loop
+    hooks.add_result_hook(landmark_writer.append_result)
+    return landmark_writer
+
+
+def close_landmark_writer(args, landmark_writer):
+    if landmark_writer:
+        landmark_writer.close()
+        log.info("Landmarks guardados en %s (%s frames).", args.landmarks_out, landmark_writer.count)
+
+
+def run_cli(args):
+    controller = build_controller(args, preview=not args.no_preview)
+    landmark_writer = open_landmark_writer(args, controller)
+
+    def close():
         log.info("Shutting down gesture loop.")
         controller.stop()
+        close_landmark_writer(args, landmark_writer)
+
+    def shutdown(signum=None, frame=None):
+        close()
         sys.exit(0)
 
     signal.signal(signal.SIGINT, shutdown)
@@ -39,25 +167,72 @@ def run_cli(camera_index: int, preview: bool):
         sys.exit(1)
 
     try:
-        while True:
-            time.sleep(0.5)
+        # Until Ctrl+C, or until a --replay session (without --replay-loop) ends.
+        while not controller.finished.wait(0.5):
+            pass
     except KeyboardInterrupt:
         shutdown()
+    log.info("All capture sources ended.")
+    close()
+
+
+def run_embedded(args):
+    """Viewer and gesture pipeline in one process: Panda3D owns the main thread.
+
+    Capture/inference keep running on their CameraLoop threads and hand
+    commands to the viewer through an in-memory queue drained every frame.
+    """
+    from reality_hologram.src.viewer import build_parser, create_viewer
+
+    viewer_args = build_parser().parse_args(shlex.split(args.viewer_args))
+    queue = CommandQueue()
+    bridge = build_bridge(args, build_pipeline(args, command_queue=queue))
+    viewer = create_viewer(viewer_args, command_queue=queue)
+    # The OpenCV preview would need the main thread too; Panda3D's window replaces it.
+    controller = build_controller(args, preview=False, bridge=bridge)
+    landmark_writer = open_landmark_writer(args, controller)
+    if not controller.start():
+        log.error("No se pudo iniciar la camara. Revisa que no este en uso y prueba otro indice (0/1/2).")
+        sys.exit(1)
+    try:
+        viewer.run()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        controller.stop()
+        close_landmark_writer(args, landmark_writer)
+        log.info("Cola de comandos: %s", queue.stats())
 
 
-def run_gui(camera_index: int):
+def run_gui(args):
     app = QApplication(sys.argv)
-    window = MainWindow(camera_index=camera_index)
+    classifier = open_classifier(args.classifier)
+    window = MainWindow(
+        camera_index=args.camera_index,
+        tracker_factory=partial(build_tracker, args),
+        engine_factory=partial(build_engine, args),
+        camera_indices=args.cameras,
+        camera_priorities=camera_priorities(args),
+        attach=args.attach,
+        mapper_factory=partial(build_mapper, classifier),
+        bridge=build_bridge(args),
+    )
     window.show()
     sys.exit(app.exec())
 
 
 def main():
     args = parse_args()
-    if args.cli:
-        run_cli(camera_index=args.camera_index, preview=not args.no_preview)
+    if args.latency_report:
+        dump_at_exit(args.latency_report)
+    if (args.record or args.landmarks_out) and not (args.cli or args.embedded):
+        log.warning("--record/--landmarks-out solo aplican en modo CLI; se ignoran en la GUI.")
+    if args.embedded:
+        run_embedded(args)
+    elif args.cli:
+        run_cli(args)
     else:
-        run_gui(camera_index=args.camera_index)
+        run_gui(args)
 
 
 if __name__ == "__main__":
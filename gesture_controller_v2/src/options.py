@@ -0,0 +1,65 @@
+"""Capture/inference CLI flags shared by main.py and capture_service.py."""
+
+from typing import Optional
+
+from .services.capture_engine import BACKENDS, CaptureEngine
+from .services.gesture_classifier import LandmarkClassifier
+from .services.gesture_mapper import GestureMapper
+from .services.inference_scheduler import AdaptiveInferenceScheduler
+from .services.mediapipe_hand_tracker import MediapipeHandTracker
+from .services.motion_gestures import MotionGestureRecognizer
+from .services.session_recorder import ReplayEngine
+
+
+def add_capture_arguments(parser):
+    parser.add_argument(
+        "--inference-width",
+        type=int,
+        default=0,
+        help="Ancho del frame usado por MediaPipe (0 = resolucion completa). Ej: 640.",
+    )
+    parser.add_argument("--roi", action="store_true", help="Recorta alrededor de la mano detectada para inferir.")
+    parser.add_argument(
+        "--roi-rescan",
+        type=int,
+        default=10,
+        help="Con --roi y menos manos que el maximo, cada cuantos frames se busca en el frame completo (0 = nunca).",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Infiere cada frame solo con movimiento rapido; en reposo extrapola landmarks entre inferencias.",
+    )
+    parser.add_argument("--max-skip", type=int, default=4, help="Intervalo maximo entre inferencias con --adaptive.")
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        help="Backend de captura (por defecto segun plataforma: v4l2 en Linux, dshow/msmf en Windows).",
+    )
+    parser.add_argument("--fps", type=float, default=30.0, help="FPS fijo solicitado a la camara.")
+    parser.add_argument("--replay", type=str, help="Reproduce una sesion grabada en lugar de abrir la camara.")
+    parser.add_argument("--replay-fast", action="store_true", help="Replay lo mas rapido posible (sin pacing).")
+    parser.add_argument("--replay-loop", action="store_true", help="Repite la sesion al llegar al final.")
+
+
+def build_engine(args, camera_index: int):
+    """Camera engine from CLI flags; ``--replay`` swaps the camera for a recorded session."""
+    if args.replay:
+        return ReplayEngine(args.replay, realtime=not args.replay_fast, loop=args.replay_loop)
+    backends = [args.backend] if args.backend else None
+    return CaptureEngine(camera_index, fps=args.fps, backends=backends)
+
+
+def build_tracker(args) -> MediapipeHandTracker:
+    scheduler = AdaptiveInferenceScheduler(max_interval=args.max_skip) if args.adaptive else None
+    return MediapipeHandTracker(
+        inference_width=args.inference_width or None,
+        roi_tracking=args.roi,
+        roi_rescan_every=args.roi_rescan,
+        scheduler=scheduler,
+    )
+
+
+def build_mapper(classifier: Optional[LandmarkClassifier] = None) -> GestureMapper:
+    """Mapper per camera; the (read-only) classifier model is shared between them."""
+    return GestureMapper(motion=MotionGestureRecognizer(), classifier=classifier)
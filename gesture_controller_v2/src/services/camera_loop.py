@@ -1,95 +1,138 @@
 """Threaded camera capture that feeds frames to a callback."""
 
 import threading
-import time
 from typing import Callable, Optional
 
 import cv2
 
+from .capture_engine import CaptureEngine
+from .frame_grabber import EndOfStream, FrameGrabber
 from .mediapipe_hand_tracker import MediapipeHandTracker
+from .session_recorder import SessionRecorder
 from ..utils.logger import get_logger
+from reality_hologram.src.utils.latency import mark, start_trace
 
 log = get_logger(__name__)
 
 
 class CameraLoop:
-    def __init__(self, camera_index: int, callback: Callable, width: int = 1280, height: int = 720):
+    def __init__(
+        self,
+        camera_index: int,
+        callback: Callable,
+        width: int = 1280,
+        height: int = 720,
+        tracker: Optional[MediapipeHandTracker] = None,
+        engine: Optional[CaptureEngine] = None,
+        recorder: Optional[SessionRecorder] = None,
+        on_finished: Optional[Callable[[], None]] = None,
+    ):
         self.camera_index = camera_index
         self.callback = callback
         self.running = False
         self.thread: Optional[threading.Thread] = None
         self.cap: Optional[cv2.VideoCapture] = None
-        self.tracker = MediapipeHandTracker()
+        self.tracker = tracker or MediapipeHandTracker()
         self.width = width
         self.height = height
-        self._consecutive_failures = 0
+        # Any object with open/reopen_alternate/release works here (e.g. ReplayEngine).
+        self.engine = engine or CaptureEngine(camera_index, width=width, height=height)
+        # Raw frames are recorded from the grab thread; the loop closes the recorder on stop.
+        self.recorder = recorder
+        # Called from the loop thread once the source has no more frames (end of a replay).
+        self.on_finished = on_finished
+        self.finished = False
+        self.pool = self.tracker.pool
+        self.grabber = FrameGrabber(
+            read=self._read_frame,
+            on_failure=self._restart_with_alternate_backend,
+            pool=self.pool,
+            on_frame=recorder.write if recorder else None,
+            lossless=getattr(self.engine, "lossless", False),
+        )
 
     def start(self) -> bool:
         if self.running:
             log.info("CameraLoop already running.")
             return True
 
-        self.cap = self._open_camera()
+        self.cap = self.engine.open()
         if not self.cap or not self.cap.isOpened():
-            log.error("Cannot open camera index %s (tried MSMF/DSHOW).", self.camera_index)
+            log.error("Cannot open camera index %s (tried %s).", self.camera_index, self.engine.description)
             return False
 
-        # Try to set a stable resolution to reduce backend quirks.
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
-
         self.running = True
+        self.grabber.start()
         self.thread = threading.Thread(target=self._run, daemon=True)
         self.thread.start()
-        log.info("CameraLoop started at index %s", self.camera_index)
+        log.info("CameraLoop started at index %s %s", self.camera_index, self.engine.stats())
         return True
 
     def stop(self):
         self.running = False
         if self.thread and self.thread.is_alive() and threading.current_thread() != self.thread:
             self.thread.join(timeout=2.0)
-        if self.cap:
-            self.cap.release()
-        log.info("CameraLoop stopped.")
+        self.grabber.stop()
+        self.engine.release()
+        self.cap = None
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+            self.grabber.on_frame = None
+        log.info("CameraLoop stopped. Frames %s pool %s", self.grabber.stats(), self.pool.stats())
+        if self.tracker.scheduler:
+            log.info("Inference scheduler: %s", self.tracker.scheduler.stats())
+
+    def _read_frame(self, image=None):
+        if not self.cap:
+            return False, None
+        ret, frame = self.cap.read(image=image) if image is not None else self.cap.read()
+        if not ret and getattr(self.cap, "at_end", False):
+            raise EndOfStream()  # replay finished: stop instead of swapping backends
+        return ret, frame
 
     def _run(self):
+        # Inference runs here; grabbing happens on FrameGrabber's thread so a
+        # slow tracker only drops frames instead of acting on stale ones.
         while self.running:
-            ret, frame = self.cap.read()
-            if not ret:
-                self._consecutive_failures += 1
-                if self._consecutive_failures >= 10:
-                    log.warning("Frame grab failed %s times; swapping backend.", self._consecutive_failures)
-                    self._restart_with_alternate_backend()
-                time.sleep(0.05)
+            latest = self.grabber.latest(timeout=0.5)
+            if latest is None:
+                if self.grabber.finished:
+                    self._finish()
+                    return
                 continue
-
-            self._consecutive_failures = 0
-
-            frame = cv2.flip(frame, 1)  # mirror for natural UX
-            hand_data = self.tracker.process(frame)
-
-            if self.callback:
-                self.callback(frame, hand_data)
-
-            time.sleep(0.01)  # small yield to avoid tight loop
-
-    def _open_camera(self, prefer_dshow: bool = True) -> Optional[cv2.VideoCapture]:
-        """Try DirectShow first (mas estable), luego MSMF."""
-        backends = [cv2.CAP_DSHOW, cv2.CAP_MSMF] if prefer_dshow else [cv2.CAP_MSMF, cv2.CAP_DSHOW]
-        for backend in backends:
-            cap = cv2.VideoCapture(self.camera_index, backend)
-            if cap.isOpened():
-                name = "DirectShow" if backend == cv2.CAP_DSHOW else "MSMF"
-                log.info("Camera opened with backend: %s", name)
-                return cap
-        return None
+            _, frame, grab_ts = latest
+            self.process_frame(frame, grab_ts)
+            self.grabber.release(frame)
+            self.pool.end_frame()
+
+    def _finish(self):
+        log.info("Camera %s: source ended after %s frames.", self.camera_index, self.grabber.frames_grabbed)
+        self.finished = True
+        if self.on_finished:
+            self.on_finished()
+
+    def process_frame(self, frame, grab_ts: Optional[float] = None):
+        """Mirror, infer and hand one frame to the callback (no capture involved).
+
+        ``frame`` is modified in place. Also used by ``bench`` to drive the
+        processing path from synthetic frames, videos or recorded sessions.
+        """
+        trace = start_trace(grab_ts)
+
+        cv2.flip(frame, 1, dst=frame)  # mirror for natural UX (in place)
+        mark(trace, "flip")
+        hand_data = self.tracker.process(frame)
+        mark(trace, "infer")
+
+        # The frame buffer is recycled after the callback returns; callers
+        # that keep it around must copy it. The trace carries on with the gesture.
+        if self.callback:
+            self.callback(frame, hand_data, trace)
+        return hand_data
 
     def _restart_with_alternate_backend(self):
-        """Attempt to reopen the camera with the other backend."""
-        current_prefer_dshow = not self.cap or self.cap.getBackendName().lower() != "dshow"
-        if self.cap:
-            self.cap.release()
-        self.cap = self._open_camera(prefer_dshow=current_prefer_dshow)
-        self._consecutive_failures = 0
+        """Attempt to reopen the camera with the next backend."""
+        self.cap = self.engine.reopen_alternate()
         if not self.cap:
             log.error("Could not reopen camera on alternate backend.")
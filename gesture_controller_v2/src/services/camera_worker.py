@@ -1,12 +1,29 @@
 """Qt camera worker with MediaPipe gesture detection and overlay."""
 
+import dataclasses
+from typing import Optional
+
 import cv2
 import mediapipe as mp
 from PySide6.QtCore import QThread, Signal
 from PySide6.QtGui import QImage
 
+from .capture_engine import CaptureEngine
+from .frame_grabber import EndOfStream, FrameGrabber
+from .frame_pool import FramePool
 from .mediapipe_hand_tracker import MediapipeHandTracker
 from .gesture_mapper import GestureMapper
+from .motion_gestures import MotionGestureRecognizer
+from .shared_frame_ring import SharedFrameRingReader
+from ..utils.logger import get_logger
+from reality_hologram.src.utils.latency import mark, start_trace
+
+log = get_logger(__name__)
+
+
+def _swap_rb(style):
+    """MediaPipe styles are BGR; the overlay is drawn on the shared RGB buffer."""
+    return {key: dataclasses.replace(spec, color=tuple(reversed(spec.color))) for key, spec in style.items()}
 
 
 class CameraWorker(QThread):
@@ -14,7 +31,17 @@ class CameraWorker(QThread):
     gesture_detected = Signal(object)  # GestureEvent
     error = Signal(str)
 
-    def __init__(self, camera_index: int = 0, width: int = 1280, height: int = 720, annotate: bool = True):
+    def __init__(
+        self,
+        camera_index: int = 0,
+        width: int = 1280,
+        height: int = 720,
+        annotate: bool = True,
+        tracker: Optional[MediapipeHandTracker] = None,
+        engine: Optional[CaptureEngine] = None,
+        attach: Optional[str] = None,
+        mapper: Optional[GestureMapper] = None,
+    ):
         super().__init__()
         self.camera_index = camera_index
         self.width = width
@@ -22,86 +49,147 @@ class CameraWorker(QThread):
         self.annotate = annotate
         self.running = False
         self.cap = None
-        self.tracker = MediapipeHandTracker()
-        self.mapper = GestureMapper()
+        # With ``attach`` frames and landmarks come from a capture_service ring.
+        self.attach = attach
+        self.tracker = None if attach else tracker or MediapipeHandTracker()
+        self.engine = None if attach else engine or CaptureEngine(camera_index, width=width, height=height)
+        self.mapper = mapper or GestureMapper(motion=MotionGestureRecognizer())
         self._hands = mp.solutions.hands
         self._drawer = mp.solutions.drawing_utils
-        self._style = mp.solutions.drawing_styles
-        self._consecutive_failures = 0
+        style = mp.solutions.drawing_styles
+        self._landmark_style = _swap_rb(style.get_default_hand_landmarks_style())
+        self._connection_style = _swap_rb(style.get_default_hand_connections_style())
+        self.pool = FramePool() if attach else self.tracker.pool
+        self.grabber = None
+        if not attach:
+            self.grabber = FrameGrabber(
+                read=self._read_frame,
+                on_failure=self._restart_with_alternate_backend,
+                name="CameraWorkerGrabber",
+                pool=self.pool,
+                lossless=getattr(self.engine, "lossless", False),
+            )
 
     def run(self):
-        self.cap = self._open_camera(prefer_dshow=True)
+        if self.attach:
+            self._run_attached()
+            return
+        self.cap = self.engine.open()
         if not self.cap or not self.cap.isOpened():
             self.error.emit(f"No se pudo abrir la camara en indice {self.camera_index}")
             return
 
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
-
         self.running = True
+        self.grabber.start()
         while self.running:
-            ret, frame = self.cap.read()
-            if not ret:
-                self._consecutive_failures += 1
-                if self._consecutive_failures >= 10:
-                    self._restart_with_alternate_backend()
+            latest = self.grabber.latest(timeout=0.5)
+            if latest is None:
+                if self.grabber.finished:
+                    log.info("Camera %s: source ended.", self.camera_index)
+                    break
                 continue
-            self._consecutive_failures = 0
-
-            frame = cv2.flip(frame, 1)
-            result = self.tracker.process(frame)
-
-            gesture = self.mapper.classify(result)
-            if gesture:
-                self.gesture_detected.emit(gesture)
-
-            if self.annotate and result and result.multi_hand_landmarks:
-                for hand_landmarks in result.multi_hand_landmarks:
-                    self._drawer.draw_landmarks(
-                        frame,
-                        hand_landmarks,
-                        self._hands.HAND_CONNECTIONS,
-                        self._style.get_default_hand_landmarks_style(),
-                        self._style.get_default_hand_connections_style(),
-                    )
-                if gesture:
-                    cv2.putText(
-                        frame,
-                        f"Gesto: {gesture.kind}",
-                        (10, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        1,
-                        (0, 255, 0),
-                        2,
-                        cv2.LINE_AA,
-                    )
-
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb.shape
-            bytes_per_line = ch * w
-            image = QImage(rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
-            self.frame_ready.emit(image)
+            _, frame, grab_ts = latest
+            trace = start_trace(grab_ts)
+
+            cv2.flip(frame, 1, dst=frame)
+            # Single BGR->RGB conversion shared by the tracker and the preview.
+            rgb = self._to_rgb(frame)
+            self.grabber.release(frame)
+            mark(trace, "flip")
+            result = self.tracker.process_rgb(rgb)
+            mark(trace, "infer")
+            self._present(rgb, result, trace)
+
+    def _run_attached(self):
+        """Consume a capture_service ring: no capture or inference in this process."""
+        self.running = True
+        reader = None
+        try:
+            while self.running:
+                if reader is None:
+                    try:
+                        reader = SharedFrameRingReader(self.attach)
+                    except FileNotFoundError:
+                        self.msleep(500)  # producer not up yet
+                        continue
+                latest = reader.read()
+                if latest is None:
+                    if reader.retired:
+                        # Producer closed the ring or recreated it at a new resolution.
+                        reader.close()
+                        reader = None
+                        continue
+                    self.msleep(2)
+                    continue
+                seq, frame, ts = latest
+                # Frames in the ring are already mirrored; convert straight out of shared memory.
+                rgb = self._to_rgb(frame)
+                if not reader.still_valid(seq):
+                    continue  # overwritten mid-copy, wait for the next one
+                self._present(rgb, reader.result(), mark(start_trace(ts), "ring"))
+        finally:
+            if reader:
+                reader.close()
+
+    def _to_rgb(self, frame):
+        rgb = self.pool.scratch("preview", frame.shape)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+        return rgb
+
+    def _present(self, rgb, result, trace=None):
+        gestures = self.mapper.classify_all(result)
+        mark(trace, "classify")
+        for gesture in gestures:
+            gesture.trace = dict(trace) if trace is not None else None  # one trace per command
+            self.gesture_detected.emit(gesture)
+
+        if self.annotate and result and result.multi_hand_landmarks:
+            for hand_landmarks in result.multi_hand_landmarks:
+                self._drawer.draw_landmarks(
+                    rgb,
+                    hand_landmarks,
+                    self._hands.HAND_CONNECTIONS,
+                    self._landmark_style,
+                    self._connection_style,
+                )
+            if gestures:
+                cv2.putText(
+                    rgb,
+                    "Gesto: " + ", ".join(g.kind for g in gestures),
+                    (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    1,
+                    (0, 255, 0),
+                    2,
+                    cv2.LINE_AA,
+                )
+
+        h, w, ch = rgb.shape
+        bytes_per_line = ch * w
+        image = QImage(rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
+        # The queued signal may be delivered after the next frame reuses (or a
+        # new resolution frees) the scratch buffer, so the GUI gets its own copy.
+        self.frame_ready.emit(image.copy())
+        self.pool.end_frame()
 
     def stop(self):
         self.running = False
         self.wait()
-        if self.cap:
-            self.cap.release()
+        if self.attach:
+            return
+        self.grabber.stop()
+        self.engine.release()
+        self.cap = None
 
-    def _open_camera(self, prefer_dshow: bool = True):
-        backends = [cv2.CAP_DSHOW, cv2.CAP_MSMF] if prefer_dshow else [cv2.CAP_MSMF, cv2.CAP_DSHOW]
-        for backend in backends:
-            cap = cv2.VideoCapture(self.camera_index, backend)
-            if cap.isOpened():
-                return cap
-        return None
+    def _read_frame(self, image=None):
+        if not self.cap:
+            return False, None
+        ret, frame = self.cap.read(image=image) if image is not None else self.cap.read()
+        if not ret and getattr(self.cap, "at_end", False):
+            raise EndOfStream()  # replay finished: stop instead of swapping backends
+        return ret, frame
 
     def _restart_with_alternate_backend(self):
-        current_backend = self.cap.getBackendName().lower() if self.cap else ""
-        prefer_dshow = current_backend != "dshow"
-        if self.cap:
-            self.cap.release()
-        self.cap = self._open_camera(prefer_dshow=prefer_dshow)
-        self._consecutive_failures = 0
+        self.cap = self.engine.reopen_alternate()
         if not self.cap:
             self.error.emit("No se pudo reabrir la camara despues de fallos.")
@@ -0,0 +1,198 @@
+"""Shared camera opening logic: pluggable backends, format negotiation and probing."""
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import cv2
+
+from ..utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+@dataclass
+class CaptureBackend:
+    name: str
+    api_attr: str  # name of the cv2.CAP_* constant, resolved lazily (not every build ships all of them)
+
+    @property
+    def api(self) -> Optional[int]:
+        return getattr(cv2, self.api_attr, None)
+
+
+@dataclass
+class CaptureMode:
+    fourcc: Optional[str]
+    width: int
+    height: int
+    fps: float
+    frame_interval: float = 0.0  # measured by the probe (seconds)
+
+
+BACKENDS: Dict[str, CaptureBackend] = {}
+
+
+def register_backend(name: str, api_attr: str) -> CaptureBackend:
+    """Register (or replace) a backend usable by name in ``CaptureEngine``."""
+    backend = CaptureBackend(name=name, api_attr=api_attr)
+    BACKENDS[name] = backend
+    return backend
+
+
+register_backend("v4l2", "CAP_V4L2")
+register_backend("gstreamer", "CAP_GSTREAMER")
+register_backend("dshow", "CAP_DSHOW")
+register_backend("msmf", "CAP_MSMF")
+register_backend("avfoundation", "CAP_AVFOUNDATION")
+register_backend("any", "CAP_ANY")
+
+
+def default_backends(platform: str = sys.platform) -> List[str]:
+    if platform.startswith("linux"):
+        return ["v4l2", "any"]
+    if platform.startswith("win"):
+        # DirectShow primero (mas estable), luego MSMF.
+        return ["dshow", "msmf", "any"]
+    if platform == "darwin":
+        return ["avfoundation", "any"]
+    return ["any"]
+
+
+def fourcc_to_str(value: float) -> str:
+    code = int(value)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+class CaptureEngine:
+    """Opens a camera on the best available backend and negotiates its mode.
+
+    Used by both CameraLoop (CLI) and CameraWorker (Qt). On open it requests
+    a small driver buffer and a fixed FPS, and if ``probe`` is set it times
+    every candidate pixel format and keeps the one with the shortest frame
+    interval.
+    """
+
+    def __init__(
+        self,
+        camera_index: int,
+        width: int = 1280,
+        height: int = 720,
+        fps: float = 30.0,
+        backends: Optional[Sequence[str]] = None,
+        formats: Sequence[str] = ("MJPG", "YUYV"),
+        buffer_size: int = 1,
+        probe: bool = True,
+        probe_frames: int = 8,
+    ):
+        self.camera_index = camera_index
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.backends = list(backends or default_backends())
+        self.formats = list(formats)
+        self.buffer_size = buffer_size
+        self.probe_enabled = probe
+        self.probe_frames = probe_frames
+        self.cap: Optional[cv2.VideoCapture] = None
+        self.backend: Optional[str] = None
+        self.mode: Optional[CaptureMode] = None
+
+    @property
+    def description(self) -> str:
+        return "/".join(name.upper() for name in self.backends)
+
+    def open(self, order: Optional[Sequence[str]] = None) -> Optional[cv2.VideoCapture]:
+        """Open the camera trying backends in ``order`` (defaults to the engine's list)."""
+        for name in order or self.backends:
+            backend = BACKENDS.get(name)
+            if backend is None or backend.api is None:
+                continue
+            cap = cv2.VideoCapture(self.camera_index, backend.api)
+            if not cap.isOpened():
+                cap.release()
+                continue
+            log.info("Camera opened with backend: %s", name)
+            self.cap = cap
+            self.backend = name
+            self.mode = self._negotiate(cap)
+            return cap
+        return None
+
+    def reopen_alternate(self) -> Optional[cv2.VideoCapture]:
+        """Release the current capture and retry starting with the next backend."""
+        if self.cap:
+            self.cap.release()
+        order = list(self.backends)
+        if self.backend in order:
+            idx = order.index(self.backend)
+            order = order[idx + 1 :] + order[: idx + 1]
+        self.cap = None
+        return self.open(order)
+
+    def release(self):
+        if self.cap:
+            self.cap.release()
+        self.cap = None
+
+    # --------------------------
+    # Mode negotiation
+    # --------------------------
+    def _negotiate(self, cap: cv2.VideoCapture) -> CaptureMode:
+        if self.probe_enabled and len(self.formats) > 1:
+            modes = [self._probe_mode(cap, fourcc) for fourcc in self.formats]
+            modes = [m for m in modes if m is not None]
+            if modes:
+                best = min(modes, key=lambda m: m.frame_interval)
+                log.info(
+                    "Capture probe: %s",
+                    ", ".join(f"{m.fourcc} {m.width}x{m.height} {m.frame_interval * 1000:.1f}ms" for m in modes),
+                )
+                return self._apply(cap, best.fourcc) or best
+        for fourcc in self.formats:
+            mode = self._apply(cap, fourcc)
+            if mode:
+                return mode
+        return self._apply(cap, None)
+
+    def _apply(self, cap: cv2.VideoCapture, fourcc: Optional[str]) -> Optional[CaptureMode]:
+        """Request a mode; returns None if the driver refused the pixel format."""
+        if fourcc:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        # Try to set a stable resolution to reduce backend quirks.
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        cap.set(cv2.CAP_PROP_FPS, self.fps)
+        # Keep the driver queue short so reads return fresh frames.
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+
+        actual = fourcc_to_str(cap.get(cv2.CAP_PROP_FOURCC))
+        if fourcc and actual.strip("\x00") and actual != fourcc:
+            return None
+        return CaptureMode(
+            fourcc=actual or fourcc,
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=cap.get(cv2.CAP_PROP_FPS),
+        )
+
+    def _probe_mode(self, cap: cv2.VideoCapture, fourcc: str) -> Optional[CaptureMode]:
+        mode = self._apply(cap, fourcc)
+        if mode is None:
+            return None
+        stamps: List[float] = []
+        # First reads after a mode switch include driver warmup; skip them.
+        for i in range(self.probe_frames + 2):
+            ok, _ = cap.read()
+            if not ok:
+                return None
+            if i >= 2:
+                stamps.append(time.perf_counter())
+        if len(stamps) < 2:
+            return None
+        mode.frame_interval = (stamps[-1] - stamps[0]) / (len(stamps) - 1)
+        return mode
+
+    def stats(self) -> Dict[str, object]:
+        return {"backend": self.backend, "mode": self.mode}
@@ -0,0 +1,159 @@
+"""Dedicated grab thread with a latest-frame-wins slot."""
+
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from .frame_pool import FramePool, same_buffer
+from ..utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+class EndOfStream(Exception):
+    """Raised by a grabber's ``read`` when the source has no more frames (end of a replay)."""
+
+
+class FrameGrabber:
+    """Reads frames on its own thread and keeps only the newest one.
+
+    The consumer (inference) always gets the most recent frame; frames that
+    were overwritten before being consumed are counted as dropped instead of
+    piling up in the driver queue. With a ``pool`` the ``read`` callable gets
+    a recycled buffer to decode into (``cap.read(image=buf)``) and consumers
+    hand frames back through ``release``. ``on_frame`` sees every grabbed
+    frame (dropped ones included) on the grab thread, e.g. for recording.
+    ``lossless`` makes the grab thread wait for the consumer instead of
+    dropping (deterministic replay). When ``read`` raises ``EndOfStream`` (or
+    anything unexpected, which is logged) the grabber stops, sets ``finished`` and calls ``on_eof``; ``latest`` still
+    hands out the last pending frame, then returns None.
+    """
+
+    def __init__(
+        self,
+        read: Callable[[Optional[object]], Tuple[bool, object]],
+        on_failure: Optional[Callable[[], None]] = None,
+        failure_threshold: int = 10,
+        name: str = "FrameGrabber",
+        pool: Optional[FramePool] = None,
+        on_frame: Optional[Callable[[object, float], None]] = None,
+        lossless: bool = False,
+        on_eof: Optional[Callable[[], None]] = None,
+    ):
+        self._read = read
+        self.on_eof = on_eof
+        self.finished = False
+        self.pool = pool
+        self.on_frame = on_frame
+        self.lossless = lossless
+        self._on_failure = on_failure
+        self.failure_threshold = failure_threshold
+        self.name = name
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._cond = threading.Condition()
+        self._frame = None
+        self._frame_ts = 0.0
+        self._seq = 0
+        self._consumed_seq = 0
+        self._consecutive_failures = 0
+        self.frames_grabbed = 0
+        self.frames_consumed = 0
+        self.frames_dropped = 0
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self.thread and self.thread.is_alive() and threading.current_thread() != self.thread:
+            self.thread.join(timeout=2.0)
+
+    def latest(self, timeout: float = 0.5) -> Optional[Tuple[int, object, float]]:
+        """Block until a frame newer than the last one handed out is available.
+
+        Returns ``(seq, frame, grab_ts)`` or None on timeout/stop.
+        """
+        with self._cond:
+            if self._seq == self._consumed_seq:
+                self._cond.wait_for(lambda: self._seq != self._consumed_seq or not self.running, timeout=timeout)
+            if self._seq == self._consumed_seq:
+                return None
+            self._consumed_seq = self._seq
+            self.frames_consumed += 1
+            frame, self._frame = self._frame, None
+            self._cond.notify_all()
+            return self._seq, frame, self._frame_ts
+
+    def release(self, frame):
+        """Return a consumed frame to the pool."""
+        if self.pool is not None:
+            self.pool.release(frame)
+
+    def stats(self):
+        return {
+            "grabbed": self.frames_grabbed,
+            "consumed": self.frames_consumed,
+            "dropped": self.frames_dropped,
+        }
+
+    def _run(self):
+        while self.running:
+            buf = self.pool.acquire() if self.pool is not None else None
+            try:
+                ret, frame = self._read(buf)
+            except EndOfStream:
+                self.release(buf)
+                self._end()
+                return
+            except Exception:
+                # Never die silently: end the stream so consumers stop waiting.
+                log.exception("Frame source failed; ending the stream.")
+                self.release(buf)
+                self._end()
+                return
+            if not ret:
+                self.release(buf)
+                self._consecutive_failures += 1
+                if self._consecutive_failures >= self.failure_threshold:
+                    log.warning("Frame grab failed %s times; swapping backend.", self._consecutive_failures)
+                    self._consecutive_failures = 0
+                    if self._on_failure:
+                        self._on_failure()
+                time.sleep(0.05)
+                continue
+
+            self._consecutive_failures = 0
+            grab_ts = time.perf_counter()
+            if self.pool is not None and not same_buffer(frame, buf):
+                # Backend allocated its own array (first frame / new resolution).
+                self.release(buf)
+                self.pool.adopt(frame)
+            if self.on_frame:
+                self.on_frame(frame, grab_ts)
+            with self._cond:
+                if self.lossless:
+                    self._cond.wait_for(lambda: self._seq == self._consumed_seq or not self.running)
+                if self._seq != self._consumed_seq:
+                    # Previous frame never reached inference: overwrite it.
+                    self.frames_dropped += 1
+                    self.release(self._frame)
+                self._frame = frame
+                self._frame_ts = grab_ts
+                self._seq += 1
+                self.frames_grabbed += 1
+                self._cond.notify_all()
+
+    def _end(self):
+        with self._cond:
+            self.finished = True
+            self.running = False
+            self._cond.notify_all()
+        if self.on_eof:
+            self.on_eof()
@@ -0,0 +1,105 @@
+"""Preallocated, recycled frame buffers for the capture hot path."""
+
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+class FramePool:
+    """Recycles full-size frame buffers and keeps named scratch buffers.
+
+    Frames go through ``acquire``/``release`` (grab -> inference -> back to the
+    pool); fixed intermediate images (RGB conversion, resized copies) use
+    ``scratch``. Every real allocation is counted so ``stats`` can show that
+    the steady state allocates nothing per frame.
+    """
+
+    def __init__(self, shape: Optional[Tuple[int, ...]] = None, count: int = 4, dtype=np.uint8):
+        self.shape = tuple(shape) if shape else None
+        self.count = count
+        self.dtype = dtype
+        self._free: deque = deque()
+        self._scratch: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self.allocations = 0
+        self.frames = 0
+        self.last_frame_allocations = 0
+        self._frame_allocations = 0
+        if self.shape:
+            self._fill()
+
+    def acquire(self) -> Optional[np.ndarray]:
+        """Return a free frame buffer, or None while the frame shape is unknown."""
+        with self._lock:
+            if not self.shape:
+                return None
+            if self._free:
+                return self._free.popleft()
+            self._count_allocation()
+            return np.empty(self.shape, dtype=self.dtype)
+
+    def release(self, buf: Optional[np.ndarray]):
+        if buf is None:
+            return
+        with self._lock:
+            if buf.shape == self.shape and len(self._free) < self.count:
+                self._free.append(buf)
+
+    def adopt(self, frame: np.ndarray):
+        """Take ownership of a frame the backend allocated itself.
+
+        Happens on the first read and whenever the camera changes resolution;
+        the pool is re-shaped to match.
+        """
+        with self._lock:
+            self._count_allocation()
+            if frame.shape != self.shape:
+                self.shape = frame.shape
+                self.dtype = frame.dtype
+                self._free.clear()
+                self._fill()
+
+    def scratch(self, key: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Persistent buffer for ``key``, reallocated only when ``shape`` changes."""
+        buf = self._scratch.get(key)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            with self._lock:
+                self._count_allocation()
+            buf = np.empty(shape, dtype=dtype)
+            self._scratch[key] = buf
+        return buf
+
+    def end_frame(self):
+        """Close the per-frame allocation counter."""
+        with self._lock:
+            self.frames += 1
+            self.last_frame_allocations = self._frame_allocations
+            self._frame_allocations = 0
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "shape": self.shape,
+                "free": len(self._free),
+                "allocations": self.allocations,
+                "frames": self.frames,
+                "last_frame_allocations": self.last_frame_allocations,
+            }
+
+    def _fill(self):
+        # Preallocation is not counted: only misses in steady state matter.
+        for _ in range(self.count - len(self._free)):
+            self._free.append(np.empty(self.shape, dtype=self.dtype))
+
+    def _count_allocation(self):
+        self.allocations += 1
+        self._frame_allocations += 1
+
+
+def same_buffer(a: Optional[np.ndarray], b: Optional[np.ndarray]) -> bool:
+    """True if ``a`` and ``b`` are the same memory (cv2 may rewrap outputs)."""
+    if a is None or b is None:
+        return False
+    return a is b or (a.shape == b.shape and a.ctypes.data == b.ctypes.data)
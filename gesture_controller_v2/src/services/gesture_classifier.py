@@ -0,0 +1,258 @@
+"""Trainable gesture classifiers over normalized hand landmarks (numpy only).
+
+Models are saved as ``.npz`` and plug into ``GestureMapper(classifier=...)``
+in place of the finger-up rules. Train them with ``python -m
+gesture_controller_v2.src.train`` from ``LandmarkStore`` recordings.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from .landmark_arrays import HANDEDNESS_CODES, NUM_LANDMARKS
+
+LEFT = HANDEDNESS_CODES["Left"]
+MIDDLE_MCP = 9
+NUM_FEATURES = (NUM_LANDMARKS - 1) * 3  # the wrist is the origin and is dropped
+NONE_KIND = "none"  # label for "no gesture" samples
+PREDICT_CHUNK = 1024
+
+
+def hand_features(landmarks: np.ndarray, handedness: np.ndarray) -> np.ndarray:
+    """(N, 21, 3) landmarks -> (N, 60) pose features invariant to position, size and tilt.
+
+    The wrist becomes the origin, left hands are mirrored onto right hands,
+    the wrist -> middle MCP axis is rotated to point up and its length
+    scales everything to 1. What is left is the finger configuration.
+    """
+    pts = np.asarray(landmarks, dtype=np.float32)
+    pts = pts - pts[:, :1, :]
+    pts[:, :, 0] *= np.where(np.asarray(handedness) == LEFT, -1.0, 1.0).astype(np.float32)[:, None]
+    axis = pts[:, MIDDLE_MCP, :2]
+    scale = np.maximum(np.hypot(axis[:, 0], axis[:, 1]), 1e-6)
+    ux = (axis[:, 0] / scale)[:, None]
+    uy = (axis[:, 1] / scale)[:, None]
+    x, y = pts[:, 1:, 0], pts[:, 1:, 1]
+    # Rotation taking (ux, uy) to (0, -1); y grows downward, so "up" is -y.
+    out = np.empty((pts.shape[0], NUM_LANDMARKS - 1, 3), dtype=np.float32)
+    out[:, :, 0] = -uy * x + ux * y
+    out[:, :, 1] = -ux * x - uy * y
+    out[:, :, 2] = pts[:, 1:, 2]
+    out /= scale[:, None, None]
+    return out.reshape(pts.shape[0], NUM_FEATURES)
+
+
+class LandmarkClassifier:
+    """Base strategy: ``predict`` maps hands to indices into ``kinds``.
+
+    Subclasses implement ``fit``/``_probabilities`` and list the arrays that
+    make up the model in ``_arrays``; saving and loading are shared.
+    """
+
+    name = ""
+    _arrays: Tuple[str, ...] = ()
+    _params: Tuple[str, ...] = ()
+
+    def __init__(self, kinds: Sequence[str] = (), min_confidence: float = 0.6):
+        self.kinds = tuple(kinds)
+        # Below this class probability the hand is reported as no gesture.
+        self.min_confidence = min_confidence
+
+    def fit(self, landmarks: np.ndarray, handedness: np.ndarray, labels: np.ndarray) -> "LandmarkClassifier":
+        raise NotImplementedError
+
+    def predict(self, landmarks: np.ndarray, handedness: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """``(labels, confidence)``: int indices into ``kinds`` and the winning probability."""
+        if len(landmarks) == 0:
+            return np.empty(0, np.int64), np.empty(0, np.float32)
+        features = hand_features(landmarks, handedness)
+        # Chunked so whole datasets (train.py validation) stay bounded in memory.
+        probs = np.concatenate(
+            [self._probabilities(features[i : i + PREDICT_CHUNK]) for i in range(0, len(features), PREDICT_CHUNK)]
+        )
+        labels = probs.argmax(axis=1)
+        return labels, probs[np.arange(len(labels)), labels].astype(np.float32)
+
+    def _probabilities(self, features: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {name: getattr(self, name) for name in self._arrays}
+        params = {name: np.asarray(getattr(self, name)) for name in self._params}
+        with open(path, "wb") as fh:  # keeps the exact name (np.savez appends .npz)
+            np.savez(
+                fh,
+                model=np.asarray(self.name),
+                kinds=np.asarray(self.kinds),
+                min_confidence=np.asarray(self.min_confidence),
+                **params,
+                **arrays,
+            )
+        return path
+
+    @classmethod
+    def _from_npz(cls, data) -> "LandmarkClassifier":
+        model = cls(kinds=[str(k) for k in data["kinds"]], min_confidence=float(data["min_confidence"]))
+        for name in cls._params:
+            setattr(model, name, data[name].item())
+        for name in cls._arrays:
+            setattr(model, name, data[name])
+        return model
+
+
+class KNNClassifier(LandmarkClassifier):
+    """k nearest neighbours over a precomputed index of training features.
+
+    The index stores the features transposed (features x rows, contiguous for
+    BLAS) and their squared norms, so a query is one matrix product.
+    ``max_per_class`` caps the index to keep that product small.
+    """
+
+    name = "knn"
+    _arrays = ("index", "index_norms", "index_labels")
+    _params = ("k",)
+
+    def __init__(self, kinds: Sequence[str] = (), k: int = 5, min_confidence: float = 0.6, max_per_class: int = 1000):
+        super().__init__(kinds, min_confidence)
+        self.k = k
+        self.max_per_class = max_per_class
+        self.index = np.zeros((NUM_FEATURES, 0), dtype=np.float32)
+        self.index_norms = np.zeros(0, dtype=np.float32)
+        self.index_labels = np.zeros(0, dtype=np.int64)
+
+    def fit(self, landmarks, handedness, labels, seed: int = 0):
+        labels = np.asarray(labels, dtype=np.int64)
+        if len(labels) == 0:
+            raise ValueError("Cannot fit a KNN classifier on an empty dataset")
+        rng = np.random.default_rng(seed)
+        keep = []
+        for label in np.unique(labels):
+            rows = np.flatnonzero(labels == label)
+            if self.max_per_class and len(rows) > self.max_per_class:
+                rows = rng.choice(rows, self.max_per_class, replace=False)
+            keep.append(rows)
+        rows = np.sort(np.concatenate(keep))
+        features = hand_features(landmarks[rows], handedness[rows])
+        self.index = np.ascontiguousarray(features.T)
+        self.index_norms = np.einsum("ij,ij->i", features, features)
+        self.index_labels = labels[rows]
+        return self
+
+    def _probabilities(self, features):
+        if len(self.index_labels) == 0:
+            raise ValueError("KNN classifier has an empty index; fit or load a model first")
+        k = min(self.k, len(self.index_labels))
+        # |a - b|^2 = |a|^2 - 2 a.b + |b|^2; |a|^2 is the same for every row and can be dropped.
+        dist = self.index_norms[None, :] - 2.0 * (features @ self.index)
+        nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        neighbours = self.index_labels[nearest]
+        votes = (neighbours[:, :, None] == np.arange(len(self.kinds))).sum(axis=1)
+        return votes.astype(np.float32) / k
+
+
+class MLPClassifier(LandmarkClassifier):
+    """One hidden ReLU layer with a softmax output, trained with Adam."""
+
+    name = "mlp"
+    _arrays = ("mean", "std", "w1", "b1", "w2", "b2")
+
+    def __init__(
+        self,
+        kinds: Sequence[str] = (),
+        hidden: int = 64,
+        min_confidence: float = 0.6,
+        epochs: int = 40,
+        batch_size: int = 256,
+        learning_rate: float = 3e-3,
+        weight_decay: float = 1e-4,
+    ):
+        super().__init__(kinds, min_confidence)
+        self.hidden = hidden
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self.weight_decay = weight_decay
+        self.mean = np.zeros(NUM_FEATURES, dtype=np.float32)
+        self.std = np.ones(NUM_FEATURES, dtype=np.float32)
+        self.w1 = np.zeros((NUM_FEATURES, hidden), dtype=np.float32)
+        self.b1 = np.zeros(hidden, dtype=np.float32)
+        self.w2 = np.zeros((hidden, len(self.kinds)), dtype=np.float32)
+        self.b2 = np.zeros(len(self.kinds), dtype=np.float32)
+
+    def fit(self, landmarks, handedness, labels, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        x = hand_features(landmarks, handedness)
+        y = np.asarray(labels, dtype=np.int64)
+        self.mean = x.mean(axis=0)
+        self.std = x.std(axis=0) + 1e-6
+        x = (x - self.mean) / self.std
+        classes = len(self.kinds)
+        params = {
+            "w1": rng.normal(0.0, np.sqrt(2.0 / NUM_FEATURES), (NUM_FEATURES, self.hidden)).astype(np.float32),
+            "b1": np.zeros(self.hidden, dtype=np.float32),
+            "w2": rng.normal(0.0, np.sqrt(2.0 / self.hidden), (self.hidden, classes)).astype(np.float32),
+            "b2": np.zeros(classes, dtype=np.float32),
+        }
+        moments = {name: (np.zeros_like(p), np.zeros_like(p)) for name, p in params.items()}
+        beta1, beta2, step = 0.9, 0.999, 0
+        for _ in range(self.epochs):
+            order = rng.permutation(len(x))
+            for start in range(0, len(x), self.batch_size):
+                batch = order[start : start + self.batch_size]
+                xb, yb = x[batch], y[batch]
+                h = np.maximum(xb @ params["w1"] + params["b1"], 0.0)
+                probs = _softmax(h @ params["w2"] + params["b2"])
+                # Cross-entropy gradient w.r.t. the logits.
+                probs[np.arange(len(yb)), yb] -= 1.0
+                probs /= len(yb)
+                dh = (probs @ params["w2"].T) * (h > 0)
+                grads = {
+                    "w2": h.T @ probs + self.weight_decay * params["w2"],
+                    "b2": probs.sum(axis=0),
+                    "w1": xb.T @ dh + self.weight_decay * params["w1"],
+                    "b1": dh.sum(axis=0),
+                }
+                step += 1
+                lr = self.learning_rate * np.sqrt(1 - beta2**step) / (1 - beta1**step)
+                for name, grad in grads.items():
+                    m, v = moments[name]
+                    m *= beta1
+                    m += (1 - beta1) * grad
+                    v *= beta2
+                    v += (1 - beta2) * grad * grad
+                    params[name] -= (lr * m / (np.sqrt(v) + 1e-8)).astype(np.float32)
+        for name, value in params.items():
+            setattr(self, name, value)
+        return self
+
+    def _probabilities(self, features):
+        x = (features - self.mean) / self.std
+        h = np.maximum(x @ self.w1 + self.b1, 0.0)
+        return _softmax(h @ self.w2 + self.b2)
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+CLASSIFIERS: Dict[str, Type[LandmarkClassifier]] = {cls.name: cls for cls in (KNNClassifier, MLPClassifier)}
+
+
+def load_classifier(path) -> LandmarkClassifier:
+    with np.load(path, allow_pickle=False) as data:
+        name = str(data["model"])
+        if name not in CLASSIFIERS:
+            raise ValueError(f"Unknown classifier '{name}' in {path}")
+        return CLASSIFIERS[name]._from_npz(data)
+
+
+def open_classifier(spec: Optional[str]) -> Optional[LandmarkClassifier]:
+    """``None``/``"rules"`` keeps the rule-based mapper; anything else is a model path."""
+    if not spec or spec == "rules":
+        return None
+    return load_classifier(spec)
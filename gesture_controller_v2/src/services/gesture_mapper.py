@@ -1,77 +1,250 @@
 """Map MediaPipe landmarks to high level gesture events."""
 
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 
 from ..core.events import GestureEvent
+from .gesture_classifier import LandmarkClassifier
+from .landmark_arrays import HANDEDNESS_CODES, HANDEDNESS_LABELS, NO_HAND, NUM_LANDMARKS, result_to_arrays
+from .motion_gestures import MotionGestureRecognizer
+
+# Gesture codes returned by classify_batch index into this tuple.
+GESTURE_KINDS = ("pinch", "open", "fist", "two_fingers", "three_fingers", "four_fingers", "point")
+GESTURE_CODES = {kind: code for code, kind in enumerate(GESTURE_KINDS)}
+NO_GESTURE = -1
+
+LEFT = HANDEDNESS_CODES["Left"]
+RIGHT = HANDEDNESS_CODES["Right"]
+
+# Finger tips / PIP joints of index..pinky (thumb handled on x): 8,12,16,20 and 6,10,14,18.
+FINGER_TIPS = slice(8, 21, 4)
+FINGER_PIPS = slice(6, 19, 4)
+THUMB_TIP, THUMB_IP, INDEX_TIP = 4, 3, 8
+MIDDLE_MCP = 9  # palm centre used for two-hand distances
+
+# Combined gestures emitted by classify_all with hand="Both".
+TWO_HAND_KINDS = ("two_hand_spread",)
 
 
 class GestureMapper:
-    def __init__(self, pinch_threshold: float = 0.06, confidence_min: float = 0.5):
+    def __init__(
+        self,
+        pinch_threshold: float = 0.06,
+        confidence_min: float = 0.5,
+        max_hands: int = 2,
+        spread_step: float = 0.03,
+        spread_gain: float = 4.0,
+        motion: Optional[MotionGestureRecognizer] = None,
+        classifier: Optional[LandmarkClassifier] = None,
+    ):
         self.pinch_threshold = pinch_threshold
         self.confidence_min = confidence_min
+        self.max_hands = max_hands
+        # Two open hands moving apart/together by ``spread_step`` (normalized
+        # palm distance) emit two_hand_spread with delta = change * gain.
+        self.spread_step = spread_step
+        self.spread_gain = spread_gain
+        self._spread_ref: Optional[float] = None
+        # Optional swipe/circle recognition on the same packed arrays.
+        self.motion = motion
+        # Trained model replacing the finger-up rules (None = rules).
+        self.classifier = classifier
+        if classifier is not None:
+            self._classifier_codes = np.array(
+                [GESTURE_CODES.get(kind, NO_GESTURE) for kind in classifier.kinds], dtype=np.int8
+            )
+        # Live-path buffers: hands packed from the result, one row of outputs per hand.
+        self._arrays = (
+            np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32),
+            np.full(max_hands, NO_HAND, dtype=np.int8),
+            np.zeros(max_hands, dtype=np.float32),
+        )
+        self._out = (np.empty(max_hands, np.int8), np.empty(max_hands, np.float32), np.empty(max_hands, np.int8))
+        self._work: Dict[str, np.ndarray] = {}
+        self._work_capacity = 0
 
     def classify(self, mediapipe_result) -> Optional[GestureEvent]:
         """Return a GestureEvent or None based on the first detected hand."""
         if not mediapipe_result or not mediapipe_result.multi_hand_landmarks:
             return None
+        landmarks, handedness, scores = (a[:1] for a in self._arrays)
+        result_to_arrays(mediapipe_result, 1, out=(landmarks, handedness, scores))
+        codes, strengths, directions = self.classify_batch(
+            landmarks, handedness, scores, out=tuple(a[:1] for a in self._out)
+        )
+        return self._event(int(codes[0]), int(handedness[0]), float(scores[0]), strengths[0], directions[0])
 
-        hand_landmarks = mediapipe_result.multi_hand_landmarks[0]
-        if mediapipe_result.multi_handedness:
-            handedness = mediapipe_result.multi_handedness[0].classification[0]
-            hand_label = handedness.label  # "Left" / "Right"
-            confidence = handedness.score
-        else:
-            hand_label = "Unknown"
-            confidence = 0.0
-        if confidence < self.confidence_min:
-            return None
+    def classify_all(self, mediapipe_result) -> List[GestureEvent]:
+        """One GestureEvent per detected hand, classified in a single batch.
 
-        tips = [4, 8, 12, 16, 20]
-        pip_joints = [3, 6, 10, 14, 18]
+        When both hands are open they act together: instead of two "open"
+        events, a two_hand_spread event (hand="Both") is emitted whenever the
+        distance between the palms changes by ``spread_step``. With ``motion``
+        set, swipes and circles are appended and fast-moving hands report no pose.
+        """
+        if not mediapipe_result or not mediapipe_result.multi_hand_landmarks:
+            self._spread_ref = None
+            if self.motion:
+                self.motion.update(self._arrays[0], self._arrays[1], 0)
+            return []
+        landmarks, handedness, scores, count = result_to_arrays(mediapipe_result, self.max_hands, out=self._arrays)
+        codes, strengths, directions = self.classify_batch(
+            landmarks[:count], handedness[:count], scores[:count], out=tuple(a[:count] for a in self._out)
+        )
+        if count == 2 and codes[0] == codes[1] == GESTURE_CODES["open"]:
+            if self.motion:
+                # Spreading hands would read as opposite swipes.
+                self.motion.update(landmarks, handedness, 0)
+            spread = self._two_hand_spread(landmarks, float(min(scores[0], scores[1])))
+            return [spread] if spread else []
+        self._spread_ref = None
+        motion_events = self.motion.update(landmarks, handedness, count) if self.motion else []
+        events = []
+        for i in range(count):
+            if self.motion and self.motion.is_moving(int(handedness[i])):
+                continue  # poses are unreliable mid-stroke
+            event = self._event(int(codes[i]), int(handedness[i]), float(scores[i]), strengths[i], directions[i])
+            if event:
+                events.append(event)
+        return events + motion_events
 
-        # MediaPipe coords are normalized [0,1]; y increases downward.
-        finger_up = []
-        for tip_id, pip_id in zip(tips, pip_joints):
-            tip = hand_landmarks.landmark[tip_id]
-            pip = hand_landmarks.landmark[pip_id]
-            finger_up.append(tip.y < pip.y)
+    def classify_batch(
+        self,
+        landmarks: np.ndarray,
+        handedness: np.ndarray,
+        scores: np.ndarray,
+        out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Classify N hands at once.
 
-        thumb_tip = hand_landmarks.landmark[4]
-        index_tip = hand_landmarks.landmark[8]
-        pinch_distance = np.linalg.norm(
-            np.array([thumb_tip.x, thumb_tip.y]) - np.array([index_tip.x, index_tip.y])
-        )
+        ``landmarks`` is (N, 21, 3) normalized MediaPipe coordinates (y grows
+        downward), ``handedness`` int8 codes from ``landmark_arrays`` and
+        ``scores`` the handedness confidence. Returns ``(codes, strengths,
+        directions)``: int8 indices into ``GESTURE_KINDS`` (``NO_GESTURE`` for
+        none), pinch strength in [0, 1] and point direction (-1 Left, 1 Right).
+        Pass ``out`` to reuse output arrays; intermediates are always reused.
+        With a ``classifier`` the codes come from the model instead of the rules.
+        """
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        n = landmarks.shape[0]
+        if out is None:
+            out = (np.empty(n, np.int8), np.empty(n, np.float32), np.empty(n, np.int8))
+        codes, strengths, directions = out
+        if n == 0:
+            return codes, strengths, directions
+        w = self._workspace(n)
+        up, total, mask, other, is_right = w["up"], w["total"], w["mask"], w["other"], w["right"]
+        x = landmarks[:, :, 0]
+        y = landmarks[:, :, 1]
+
+        # Fingers are up when the tip is above the PIP joint.
+        np.less(y[:, FINGER_TIPS], y[:, FINGER_PIPS], out=up[:, 1:])
+        # Thumb uses the x-axis; inverted for anything that is not a right hand.
+        np.equal(handedness, RIGHT, out=is_right)
+        np.less(x[:, THUMB_TIP], x[:, THUMB_IP], out=up[:, 0])
+        np.greater(x[:, THUMB_TIP], x[:, THUMB_IP], out=other)
+        np.copyto(up[:, 0], other, where=is_right)
+        np.sum(up, axis=1, out=total)
 
-        # Thumb uses x-axis; invert for left hand.
-        thumb_up = (
-            thumb_tip.x > hand_landmarks.landmark[3].x
-            if hand_label == "Right"
-            else thumb_tip.x < hand_landmarks.landmark[3].x
+        codes.fill(NO_GESTURE)
+        strengths.fill(0.0)
+        directions.fill(0)
+
+        # Rules from lowest to highest priority; later ones overwrite.
+        np.equal(total, 1, out=mask)
+        mask &= up[:, 1]
+        np.copyto(codes, GESTURE_CODES["point"], where=mask)
+        np.copyto(directions, 1, where=mask)
+        np.equal(handedness, LEFT, out=other)
+        other &= mask
+        np.copyto(directions, -1, where=other)
+        for kind, fingers in (("four_fingers", 4), ("three_fingers", 3), ("fist", 0), ("open", 5)):
+            np.equal(total, fingers, out=mask)
+            np.copyto(codes, GESTURE_CODES[kind], where=mask)
+        np.equal(total, 2, out=mask)
+        mask &= up[:, 1]
+        mask &= up[:, 2]
+        np.copyto(codes, GESTURE_CODES["two_fingers"], where=mask)
+
+        dx, dy, dist = w["dx"], w["dy"], w["dist"]
+        np.subtract(x[:, THUMB_TIP], x[:, INDEX_TIP], out=dx)
+        np.subtract(y[:, THUMB_TIP], y[:, INDEX_TIP], out=dy)
+        np.hypot(dx, dy, out=dist)
+        np.less(dist, self.pinch_threshold, out=mask)
+        np.copyto(codes, GESTURE_CODES["pinch"], where=mask)
+        np.copyto(directions, 0, where=mask)
+        np.subtract(self.pinch_threshold, dist, out=dx)
+        dx /= self.pinch_threshold
+        np.copyto(strengths, dx, where=mask)
+        if self.classifier is not None:
+            self._apply_classifier(landmarks, handedness, codes, strengths, directions, dist)
+
+        # Empty rows and low handedness confidence yield no gesture.
+        np.less(scores, self.confidence_min, out=mask)
+        np.equal(handedness, NO_HAND, out=other)
+        mask |= other
+        np.copyto(codes, NO_GESTURE, where=mask)
+        np.copyto(strengths, 0.0, where=mask)
+        np.copyto(directions, 0, where=mask)
+        return codes, strengths, directions
+
+    def _apply_classifier(self, landmarks, handedness, codes, strengths, directions, dist):
+        labels, confidence = self.classifier.predict(landmarks, handedness)
+        codes[:] = self._classifier_codes[labels]
+        codes[confidence < self.classifier.min_confidence] = NO_GESTURE
+        # The model names the pose; pinch strength and point direction stay geometric.
+        pinch = codes == GESTURE_CODES["pinch"]
+        strengths[:] = np.where(pinch, np.clip((self.pinch_threshold - dist) / self.pinch_threshold, 0.1, 1.0), 0.0)
+        point = codes == GESTURE_CODES["point"]
+        directions[:] = np.where(point, np.where(handedness == LEFT, -1, 1), 0)
+
+    def _two_hand_spread(self, landmarks: np.ndarray, confidence: float) -> Optional[GestureEvent]:
+        dx = float(landmarks[0, MIDDLE_MCP, 0] - landmarks[1, MIDDLE_MCP, 0])
+        dy = float(landmarks[0, MIDDLE_MCP, 1] - landmarks[1, MIDDLE_MCP, 1])
+        distance = (dx * dx + dy * dy) ** 0.5
+        if self._spread_ref is None:
+            self._spread_ref = distance
+            return None
+        change = distance - self._spread_ref
+        if abs(change) < self.spread_step:
+            return None
+        self._spread_ref = distance
+        # Apart = positive delta (zoom in), together = negative (zoom out).
+        delta = max(-1.0, min(1.0, change * self.spread_gain))
+        return GestureEvent(
+            kind="two_hand_spread",
+            hand="Both",
+            confidence=confidence,
+            payload={"delta": delta, "distance": distance},
         )
-        finger_up[0] = thumb_up
-
-        total_up = sum(1 for v in finger_up if v)
-
-        if pinch_distance < self.pinch_threshold:
-            strength = float(max(0.0, (self.pinch_threshold - pinch_distance) / self.pinch_threshold))
-            return GestureEvent(kind="pinch", hand=hand_label, confidence=confidence, payload={"strength": strength})
-
-        # Gestos
-        if total_up == 5:
-            return GestureEvent(kind="open", hand=hand_label, confidence=confidence)
-        if total_up == 0:
-            return GestureEvent(kind="fist", hand=hand_label, confidence=confidence)
-        if finger_up[1] and finger_up[2] and total_up == 2:
-            # Dos dedos
-            return GestureEvent(kind="two_fingers", hand=hand_label, confidence=confidence)
-        if total_up == 3:
-            return GestureEvent(kind="three_fingers", hand=hand_label, confidence=confidence)
-        if total_up == 4:
-            return GestureEvent(kind="four_fingers", hand=hand_label, confidence=confidence)
-        if finger_up[1] and total_up == 1:
-            direction = -1 if hand_label == "Left" else 1
-            return GestureEvent(kind="point", hand=hand_label, confidence=confidence, payload={"direction": direction})
-
-        return None
+
+    def _event(self, code: int, handedness: int, score: float, strength, direction) -> Optional[GestureEvent]:
+        if code == NO_GESTURE:
+            return None
+        kind = GESTURE_KINDS[code]
+        hand = HANDEDNESS_LABELS.get(handedness, "Unknown")
+        payload = None
+        if kind == "pinch":
+            payload = {"strength": float(strength)}
+        elif kind == "point":
+            payload = {"direction": int(direction)}
+        return GestureEvent(kind=kind, hand=hand, confidence=score, payload=payload)
+
+    def _workspace(self, n: int) -> Dict[str, np.ndarray]:
+        """Intermediate buffers for ``n`` rows, grown on demand and then reused."""
+        if n > self._work_capacity:
+            self._work_capacity = n
+            self._work = {
+                "up": np.empty((n, 5), dtype=bool),
+                "total": np.empty(n, dtype=np.int64),
+                "mask": np.empty(n, dtype=bool),
+                "other": np.empty(n, dtype=bool),
+                "right": np.empty(n, dtype=bool),
+                "dx": np.empty(n, dtype=np.float32),
+                "dy": np.empty(n, dtype=np.float32),
+                "dist": np.empty(n, dtype=np.float32),
+            }
+        if n == self._work_capacity:
+            return self._work
+        return {key: buf[:n] for key, buf in self._work.items()}
@@ -0,0 +1,52 @@
+"""Merge GestureEvent streams from several cameras into one."""
+
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from ..core.events import GestureEvent
+
+
+class GestureMerger:
+    """De-duplicates the same gesture seen by several cameras.
+
+    The first camera to report a gesture kind owns it while it keeps
+    reporting it within ``window`` seconds; the same kind from other cameras
+    is dropped unless they have a higher priority, in which case they take
+    over. Thread-safe, so per-camera capture threads can call ``accept``
+    directly.
+    """
+
+    def __init__(self, priorities: Optional[Dict[int, int]] = None, window: float = 0.3):
+        self.priorities = dict(priorities or {})
+        self.window = window
+        self.accepted = 0
+        self.duplicates = 0
+        self._owners: Dict[str, Tuple[int, float]] = {}  # kind -> (camera_id, last_seen)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_order(cls, camera_ids: Sequence[int], window: float = 0.3) -> "GestureMerger":
+        """First camera in ``camera_ids`` gets the highest priority."""
+        count = len(camera_ids)
+        return cls({camera_id: count - i for i, camera_id in enumerate(camera_ids)}, window=window)
+
+    def accept(self, camera_id: int, gesture: GestureEvent, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            owner = self._owners.get(gesture.kind)
+            if owner is not None:
+                owner_id, last_seen = owner
+                fresh = now - last_seen <= self.window
+                if fresh and owner_id != camera_id and self._priority(camera_id) <= self._priority(owner_id):
+                    self.duplicates += 1
+                    return False
+            self._owners[gesture.kind] = (camera_id, now)
+            self.accepted += 1
+            return True
+
+    def stats(self):
+        return {"accepted": self.accepted, "duplicates": self.duplicates}
+
+    def _priority(self, camera_id: int) -> int:
+        return self.priorities.get(camera_id, 0)
@@ -0,0 +1,117 @@
+"""Per-hand gesture state machine: turns per-frame detections into transitions."""
+
+import dataclasses
+import time
+from typing import Dict, Iterable, List, Optional
+
+from ..core.events import GestureEvent
+from .motion_gestures import MOTION_KINDS
+
+# Continuous gestures re-emit while held (Hz); everything else fires once on enter.
+DEFAULT_REPEAT_RATES = {"pinch": 10.0, "point": 10.0}
+# Already edge-triggered by the mapper: passed through without debouncing.
+IMPULSE_KINDS = ("two_hand_spread",) + MOTION_KINDS
+
+
+@dataclasses.dataclass
+class _HandState:
+    active: Optional[str] = None
+    last_seen: float = 0.0
+    last_emit: float = 0.0
+    last_event: Optional[GestureEvent] = None
+    candidate: Optional[str] = None
+    candidate_since: float = 0.0
+    candidate_seen: float = 0.0
+
+
+class GestureStateMachine:
+    """Debounces detections per hand into ``start`` / ``repeat`` / ``end`` events.
+
+    A gesture becomes active after it is seen for ``enter_delay`` seconds with
+    confidence >= ``enter_confidence``; it stays active while seen with the
+    lower ``exit_confidence`` and ends ``exit_delay`` seconds after the last
+    sighting, or as soon as a different gesture qualifies. Delays are in time
+    rather than frames so several cameras and adaptive inference can feed the
+    same machine. Call ``update`` every frame, even with no events, so held
+    gestures can expire.
+    """
+
+    def __init__(
+        self,
+        enter_delay: float = 0.08,
+        exit_delay: float = 0.25,
+        enter_confidence: float = 0.6,
+        exit_confidence: float = 0.45,
+        repeat_rates: Optional[Dict[str, float]] = None,
+        impulse_kinds: Iterable[str] = IMPULSE_KINDS,
+    ):
+        self.enter_delay = enter_delay
+        self.exit_delay = exit_delay
+        self.enter_confidence = enter_confidence
+        self.exit_confidence = exit_confidence
+        self.repeat_rates = dict(DEFAULT_REPEAT_RATES if repeat_rates is None else repeat_rates)
+        self.impulse_kinds = set(impulse_kinds)
+        self.observed = 0
+        self.emitted = 0
+        self._hands: Dict[str, _HandState] = {}
+
+    def update(self, events: Iterable[GestureEvent], now: Optional[float] = None) -> List[GestureEvent]:
+        now = time.monotonic() if now is None else now
+        out: List[GestureEvent] = []
+        for event in events:
+            self.observed += 1
+            if event.kind in self.impulse_kinds:
+                out.append(dataclasses.replace(event, phase="start"))
+                continue
+            self._observe(self._hands.setdefault(event.hand, _HandState()), event, now, out)
+        for state in self._hands.values():
+            if state.active and now - state.last_seen >= self.exit_delay:
+                out.append(self._end(state))
+        self.emitted += len(out)
+        return out
+
+    def active(self) -> Dict[str, str]:
+        """Currently held gesture per hand."""
+        return {hand: state.active for hand, state in self._hands.items() if state.active}
+
+    def reset(self) -> List[GestureEvent]:
+        """End every active gesture (e.g. when the camera stops)."""
+        out = [self._end(state) for state in self._hands.values() if state.active]
+        self._hands.clear()
+        return out
+
+    def stats(self):
+        return {"observed": self.observed, "emitted": self.emitted}
+
+    def _observe(self, state: _HandState, event: GestureEvent, now: float, out: List[GestureEvent]):
+        if event.kind == state.active and event.confidence >= self.exit_confidence:
+            state.last_seen = now
+            state.last_event = event
+            state.candidate = None
+            rate = self.repeat_rates.get(event.kind)
+            if rate and now - state.last_emit >= 1.0 / rate:
+                state.last_emit = now
+                out.append(dataclasses.replace(event, phase="repeat"))
+            return
+
+        if event.confidence < self.enter_confidence:
+            return  # too weak to start anything; the active gesture expires on its own
+        if state.candidate != event.kind or now - state.candidate_seen > self.exit_delay:
+            state.candidate = event.kind
+            state.candidate_since = now
+        state.candidate_seen = now
+        if now - state.candidate_since < self.enter_delay:
+            return
+
+        if state.active:
+            out.append(self._end(state))
+        state.candidate = None
+        state.active = event.kind
+        state.last_seen = now
+        state.last_emit = now
+        state.last_event = event
+        out.append(dataclasses.replace(event, phase="start"))
+
+    def _end(self, state: _HandState) -> GestureEvent:
+        state.active = None
+        return dataclasses.replace(state.last_event, phase="end", trace=None)
@@ -0,0 +1,119 @@
+"""Adaptive inference rate with landmark extrapolation between detections."""
+
+from typing import Optional
+
+import numpy as np
+
+from .landmark_arrays import NO_HAND, NUM_LANDMARKS, arrays_to_result, result_to_arrays
+
+
+class AdaptiveInferenceScheduler:
+    """Runs MediaPipe every frame during fast motion and every Nth frame otherwise.
+
+    After each real inference the landmark velocity is estimated; the next
+    inference interval shrinks to 1 when the hand moves fast or tracking
+    confidence drops, and grows up to ``max_interval`` when the hand is
+    steady or absent. Skipped frames get a constant-velocity extrapolation
+    of the last landmarks (damped so a missed stop does not run away).
+    """
+
+    def __init__(
+        self,
+        max_hands: int = 2,
+        max_interval: int = 4,
+        absent_interval: Optional[int] = None,
+        fast_motion: float = 0.015,
+        slow_motion: float = 0.004,
+        min_score: float = 0.85,
+        velocity_smoothing: float = 0.6,
+        damping: float = 0.8,
+    ):
+        self.max_hands = max_hands
+        self.max_interval = max(1, max_interval)
+        self.absent_interval = absent_interval or self.max_interval
+        self.fast_motion = fast_motion
+        self.slow_motion = slow_motion
+        self.min_score = min_score
+        self.velocity_smoothing = velocity_smoothing
+        self.damping = damping
+        self.interval = 1
+        self.inferences = 0
+        self.predictions = 0
+        self.motion = 0.0
+        self._since = 0
+        self._count = 0
+        self._pos = np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        self._vel = np.zeros_like(self._pos)
+        self._step = np.zeros_like(self._pos)
+        self._handedness = np.full(max_hands, NO_HAND, dtype=np.int8)
+        self._scores = np.zeros(max_hands, dtype=np.float32)
+        self._new = (
+            np.zeros_like(self._pos),
+            np.full(max_hands, NO_HAND, dtype=np.int8),
+            np.zeros(max_hands, dtype=np.float32),
+        )
+
+    def should_infer(self) -> bool:
+        return self._since + 1 >= self.interval
+
+    def observe(self, result):
+        """Feed a real inference result and pick the next interval."""
+        landmarks, handedness, scores, count = result_to_arrays(result, self.max_hands, out=self._new)
+        frames = self._since + 1
+        self._since = 0
+        self.inferences += 1
+
+        if count == 0:
+            self._count = 0
+            self._vel.fill(0.0)
+            self._handedness.fill(NO_HAND)
+            self.motion = 0.0
+            self.interval = self.absent_interval
+            return
+
+        same_hands = count == self._count and np.array_equal(handedness[:count], self._handedness[:count])
+        if same_hands:
+            measured = (landmarks[:count] - self._pos[:count]) / frames
+            a = self.velocity_smoothing
+            self._vel[:count] = a * measured + (1.0 - a) * self._vel[:count]
+            self.motion = float(np.abs(self._vel[:count, :, :2]).mean(axis=(1, 2)).max())
+        else:
+            # New or swapped hands: no usable history, stay at full rate.
+            self._vel.fill(0.0)
+            self.motion = float("inf")
+
+        self._pos[:] = landmarks
+        self._handedness[:] = handedness
+        self._scores[:] = scores
+        self._count = count
+        self.interval = self._pick_interval(float(scores[:count].min()))
+
+    def predict(self):
+        """Result-like object with extrapolated landmarks for a skipped frame."""
+        self._since += 1
+        self.predictions += 1
+        if self._count == 0:
+            return arrays_to_result(self._pos, self._handedness, self._scores)
+        # Geometric damping: sum_{k=1..n} d^k of the last velocity.
+        d = self.damping
+        gain = d * (1.0 - d ** self._since) / (1.0 - d) if d != 1.0 else float(self._since)
+        np.multiply(self._vel, gain, out=self._step)
+        self._step += self._pos
+        return arrays_to_result(self._step, self._handedness, self._scores)
+
+    def stats(self):
+        total = self.inferences + self.predictions
+        return {
+            "interval": self.interval,
+            "inferences": self.inferences,
+            "predictions": self.predictions,
+            "inference_ratio": (self.inferences / total) if total else 1.0,
+        }
+
+    def _pick_interval(self, min_score: float) -> int:
+        if self.motion >= self.fast_motion or min_score < self.min_score:
+            return 1
+        if self.motion <= self.slow_motion:
+            return self.max_interval
+        span = (self.fast_motion - self.motion) / (self.fast_motion - self.slow_motion)
+        return max(1, int(round(1 + span * (self.max_interval - 1))))
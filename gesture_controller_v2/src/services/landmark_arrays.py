@@ -0,0 +1,91 @@
+"""Convert MediaPipe hand results to dense arrays and back (no mediapipe import)."""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+HANDEDNESS_CODES = {"Left": 0, "Right": 1}
+HANDEDNESS_LABELS = {0: "Left", 1: "Right"}
+NO_HAND = -1
+
+
+def result_to_arrays(
+    result, max_hands: int = 2, out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """Pack a MediaPipe result into ``(landmarks, handedness, scores, count)``.
+
+    ``landmarks`` is float32 (max_hands, 21, 3); ``handedness`` is int8 with
+    -1 for empty rows; ``scores`` is float32. Pass ``out`` to fill existing
+    arrays instead of allocating.
+    """
+    if out is None:
+        landmarks = np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        handedness = np.full(max_hands, NO_HAND, dtype=np.int8)
+        scores = np.zeros(max_hands, dtype=np.float32)
+    else:
+        landmarks, handedness, scores = out
+        handedness.fill(NO_HAND)
+        scores.fill(0.0)
+
+    hands = (result.multi_hand_landmarks or []) if result else []
+    labels = (result.multi_handedness or []) if result else []
+    count = min(len(hands), max_hands)
+    for i in range(count):
+        row = landmarks[i]
+        for j, lm in enumerate(hands[i].landmark):
+            row[j, 0] = lm.x
+            row[j, 1] = lm.y
+            row[j, 2] = lm.z
+        if i < len(labels):
+            cls = labels[i].classification[0]
+            handedness[i] = HANDEDNESS_CODES.get(cls.label, NO_HAND)
+            scores[i] = cls.score
+    return landmarks, handedness, scores, count
+
+
+@dataclass
+class Landmark:
+    x: float
+    y: float
+    z: float = 0.0
+
+
+@dataclass
+class LandmarkList:
+    landmark: List[Landmark] = field(default_factory=list)
+
+
+@dataclass
+class Classification:
+    label: str
+    score: float
+
+
+@dataclass
+class ClassificationList:
+    classification: List[Classification] = field(default_factory=list)
+
+
+@dataclass
+class HandResult:
+    """Duck-typed stand-in for ``mediapipe.solutions.hands`` results."""
+
+    multi_hand_landmarks: Optional[List[LandmarkList]] = None
+    multi_handedness: Optional[List[ClassificationList]] = None
+
+
+def arrays_to_result(landmarks: np.ndarray, handedness: np.ndarray, scores: np.ndarray) -> HandResult:
+    """Rebuild a result object that GestureMapper and drawing code accept."""
+    hands: List[LandmarkList] = []
+    labels: List[ClassificationList] = []
+    for i in range(len(handedness)):
+        code = int(handedness[i])
+        if code == NO_HAND:
+            continue
+        hands.append(LandmarkList([Landmark(float(x), float(y), float(z)) for x, y, z in landmarks[i]]))
+        labels.append(ClassificationList([Classification(HANDEDNESS_LABELS.get(code, "Unknown"), float(scores[i]))]))
+    if not hands:
+        return HandResult()
+    return HandResult(multi_hand_landmarks=hands, multi_handedness=labels)
@@ -0,0 +1,140 @@
+"""Columnar, memory-mapped store of recorded hand landmarks.
+
+Layout of a store directory::
+
+    landmarks.npy   float32 (frames, hands, 21, 3)
+    handedness.npy  int8    (frames, hands)   -1 = no hand, 0 = Left, 1 = Right
+    score.npy       float32 (frames, hands)
+    timestamp.npy   float64 (frames,)
+    meta.json       {"count": n, "max_hands": h}
+
+Files are standard ``.npy`` so readers only need numpy (no mediapipe) and
+get zero-parse access through ``np.load(mmap_mode="r")``.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from .landmark_arrays import NUM_LANDMARKS, result_to_arrays
+
+COLUMNS = {
+    "landmarks": (np.float32, (NUM_LANDMARKS, 3)),
+    "handedness": (np.int8, ()),
+    "score": (np.float32, ()),
+    "timestamp": (np.float64, None),  # None = one value per frame, not per hand
+}
+
+
+class LandmarkStoreWriter:
+    """Appends tracker results to a store; capacity doubles as it fills.
+
+    Meant to be registered as a ``MediapipeHandTracker`` result hook::
+
+        writer = LandmarkStoreWriter("data/session01")
+        tracker.add_result_hook(writer.append_result)
+    """
+
+    def __init__(self, path, max_hands: int = 2, capacity: int = 4096):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_hands = max_hands
+        self.count = 0
+        self._capacity = 0
+        self._columns: Dict[str, np.memmap] = {}
+        self._lock = threading.Lock()
+        self._grow(capacity)
+
+    def append_result(self, result, ts: Optional[float] = None):
+        with self._lock:
+            if self.count >= self._capacity:
+                self._grow(self._capacity * 2)
+            i = self.count
+            out = (self._columns["landmarks"][i], self._columns["handedness"][i], self._columns["score"][i])
+            result_to_arrays(result, self.max_hands, out=out)
+            self._columns["timestamp"][i] = time.perf_counter() if ts is None else ts
+            self.count += 1
+
+    def append(self, landmarks: np.ndarray, handedness: np.ndarray, scores: np.ndarray, ts: float):
+        """Append one frame of already-packed arrays (e.g. from a replayed store)."""
+        with self._lock:
+            if self.count >= self._capacity:
+                self._grow(self._capacity * 2)
+            i = self.count
+            self._columns["landmarks"][i] = landmarks
+            self._columns["handedness"][i] = handedness
+            self._columns["score"][i] = scores
+            self._columns["timestamp"][i] = ts
+            self.count += 1
+
+    def flush(self):
+        with self._lock:
+            for column in self._columns.values():
+                column.flush()
+            self._write_meta()
+
+    def close(self):
+        self.flush()
+        self._columns.clear()
+
+    def _grow(self, capacity: int):
+        for name, (dtype, tail) in COLUMNS.items():
+            shape = (capacity,) if tail is None else (capacity, self.max_hands) + tail
+            tmp = self.path / f"{name}.tmp.npy"
+            new = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=shape)
+            old = self._columns.pop(name, None)
+            if old is not None:
+                new[: self.count] = old[: self.count]
+                del old  # drop the mapping before replacing the file (Windows)
+            if name == "handedness":
+                new[self.count :] = -1
+            new.flush()
+            del new
+            tmp.replace(self.path / f"{name}.npy")
+            self._columns[name] = np.load(self.path / f"{name}.npy", mmap_mode="r+")
+        self._capacity = capacity
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {"count": self.count, "max_hands": self.max_hands, "capacity": self._capacity}
+        (self.path / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+
+class LandmarkStore:
+    """Read-only view over a store directory; columns are memory-mapped."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        self.count = int(meta["count"])
+        self.max_hands = int(meta["max_hands"])
+        self.landmarks = self._column("landmarks")
+        self.handedness = self._column("handedness")
+        self.score = self._column("score")
+        self.timestamp = self._column("timestamp")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def hands(self):
+        """Flatten to one row per detected hand: ``(landmarks (N,21,3), handedness, score)``."""
+        mask = self.handedness >= 0
+        return self.landmarks[mask], self.handedness[mask], self.score[mask]
+
+    def iter_batches(self, batch_frames: int = 65536):
+        """Yield frame-aligned slices without loading the whole store."""
+        for start in range(0, self.count, batch_frames):
+            stop = min(start + batch_frames, self.count)
+            yield (
+                self.landmarks[start:stop],
+                self.handedness[start:stop],
+                self.score[start:stop],
+                self.timestamp[start:stop],
+            )
+
+    def _column(self, name: str):
+        return np.load(self.path / f"{name}.npy", mmap_mode="r")[: self.count]
@@ -1,11 +1,30 @@
 """Wrapper around MediaPipe Hands for gesture_controller_v2."""
 
+import time
+from typing import Callable, List, Optional, Tuple
+
 import cv2
 import mediapipe as mp
 
+from .frame_pool import FramePool
+from .inference_scheduler import AdaptiveInferenceScheduler
+
 
 class MediapipeHandTracker:
-    def __init__(self, max_hands: int = 2, detection_confidence: float = 0.6, tracking_confidence: float = 0.5):
+    def __init__(
+        self,
+        max_hands: int = 2,
+        detection_confidence: float = 0.6,
+        tracking_confidence: float = 0.5,
+        inference_width: Optional[int] = None,
+        roi_tracking: bool = False,
+        roi_margin: float = 0.35,
+        roi_size: int = 256,
+        roi_rescan_every: int = 10,
+        pool: Optional[FramePool] = None,
+        scheduler: Optional[AdaptiveInferenceScheduler] = None,
+    ):
+        self.max_hands = max_hands
         self.mp_hands = mp.solutions.hands
         self.hands = self.mp_hands.Hands(
             static_image_mode=False,
@@ -13,9 +32,150 @@ class MediapipeHandTracker:
             min_detection_confidence=detection_confidence,
             min_tracking_confidence=tracking_confidence,
         )
+        # Reduced-resolution inference (None = full frame, legacy behaviour).
+        self.inference_width = inference_width
+        self.roi_tracking = roi_tracking
+        self.roi_margin = roi_margin
+        self.roi_size = roi_size
+        self._roi: Optional[Tuple[int, int, int, int]] = None  # x0, y0, side, side in full-frame pixels
+        # The crop only sees the hands already tracked: while fewer than
+        # ``max_hands`` are, every ``roi_rescan_every``-th frame is a full pass.
+        self.roi_rescan_every = roi_rescan_every
+        self._roi_hands = 0
+        self._roi_frames = 0
+        # Shared with the capture loop so frames and scratch images come from one place.
+        self.pool = pool or FramePool()
+        self._result_hooks: List[Callable[[object, float], None]] = []
+        # Optional: skip inference on steady frames and extrapolate landmarks instead.
+        self.scheduler = scheduler
 
     def process(self, frame):
-        """Return MediaPipe result object after RGB conversion."""
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return self.hands.process(rgb)
+        """Return MediaPipe result object after RGB conversion.
+
+        In ROI mode the landmarks are re-projected to full-frame normalized
+        coordinates, so consumers never see the crop. With a scheduler,
+        skipped frames return extrapolated landmarks and do not fire hooks.
+        """
+        return self._scheduled(frame, is_rgb=False)
+
+    def process_rgb(self, rgb):
+        """Same as ``process`` for a frame that is already RGB (shared with the preview)."""
+        return self._scheduled(rgb, is_rgb=True)
+
+    def add_result_hook(self, hook: Callable[[object, float], None]):
+        """Call ``hook(result, ts)`` after every inference (e.g. LandmarkStoreWriter.append_result)."""
+        self._result_hooks.append(hook)
+
+    def remove_result_hook(self, hook: Callable[[object, float], None]):
+        if hook in self._result_hooks:
+            self._result_hooks.remove(hook)
+
+    def _scheduled(self, frame, is_rgb: bool):
+        if self.scheduler and not self.scheduler.should_infer():
+            return self.scheduler.predict()
+        result = self._process(frame, is_rgb)
+        if self.scheduler:
+            self.scheduler.observe(result)
+        return self._notify(result)
+
+    def _notify(self, result):
+        if self._result_hooks:
+            ts = time.perf_counter()
+            for hook in self._result_hooks:
+                hook(result, ts)
+        return result
+
+    def reset_roi(self):
+        self._roi = None
+
+    def _process(self, frame, is_rgb: bool):
+        if self.roi_tracking and self._roi and not self._rescan_due():
+            self._roi_frames += 1
+            return self._process_roi(frame, is_rgb)
+
+        small = self._downscale(frame)
+        result = self._infer(small, is_rgb, key="full")
+        self._roi_frames = 0
+        self._update_roi(result, frame.shape)
+        return result
+
+    def _infer(self, image, is_rgb: bool, key: str):
+        if is_rgb:
+            rgb = image
+        else:
+            rgb = self.pool.scratch(f"{key}_rgb", image.shape)
+            cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb)
+        # Read-only arrays are passed to MediaPipe by reference instead of copied.
+        was_writeable = rgb.flags.writeable
+        rgb.flags.writeable = False
+        try:
+            return self.hands.process(rgb)
+        finally:
+            if was_writeable:
+                rgb.flags.writeable = True
+
+    def _downscale(self, frame):
+        if not self.inference_width:
+            return frame
+        h, w = frame.shape[:2]
+        if w <= self.inference_width:
+            return frame
+        target_h = max(1, int(round(h * self.inference_width / w)))
+        small = self.pool.scratch("small", (target_h, self.inference_width) + frame.shape[2:])
+        cv2.resize(frame, (self.inference_width, target_h), dst=small, interpolation=cv2.INTER_AREA)
+        return small
+
+    def _process_roi(self, frame, is_rgb: bool):
+        x0, y0, side_w, side_h = self._roi
+        crop = frame[y0 : y0 + side_h, x0 : x0 + side_w]
+        roi = self.pool.scratch("roi", (self.roi_size, self.roi_size) + frame.shape[2:])
+        cv2.resize(crop, (self.roi_size, self.roi_size), dst=roi, interpolation=cv2.INTER_AREA)
+        result = self._infer(roi, is_rgb, key="roi")
+
+        if not result or not result.multi_hand_landmarks:
+            # Hand left the crop: fall back to a full-frame pass right away.
+            self._roi = None
+            return self._process(frame, is_rgb)
+
+        h, w = frame.shape[:2]
+        sx, sy = side_w / w, side_h / h
+        ox, oy = x0 / w, y0 / h
+        for hand_landmarks in result.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = ox + lm.x * sx
+                lm.y = oy + lm.y * sy
+                lm.z = lm.z * sx  # z shares the x scale in MediaPipe
+        self._update_roi(result, frame.shape)
+        return result
+
+    def _rescan_due(self) -> bool:
+        """Full-frame pass to look for hands outside the crop."""
+        if self._roi_hands >= self.max_hands or self.roi_rescan_every <= 0:
+            return False
+        return self._roi_frames >= self.roi_rescan_every
+
+    def _update_roi(self, result, frame_shape):
+        """Track a square crop around every detected hand for the next frame."""
+        if not self.roi_tracking:
+            return
+        if not result or not result.multi_hand_landmarks:
+            self._roi = None
+            self._roi_hands = 0
+            return
+        self._roi_hands = len(result.multi_hand_landmarks)
 
+        h, w = frame_shape[:2]
+        xs = [lm.x for hand in result.multi_hand_landmarks for lm in hand.landmark]
+        ys = [lm.y for hand in result.multi_hand_landmarks for lm in hand.landmark]
+        min_x, max_x = min(xs) * w, max(xs) * w
+        min_y, max_y = min(ys) * h, max(ys) * h
+        side = max(max_x - min_x, max_y - min_y) * (1.0 + 2.0 * self.roi_margin)
+        if side >= min(w, h):
+            # Hands span the whole frame: a crop would not save anything.
+            self._roi = None
+            return
+        side = int(max(side, min(self.roi_size, w, h)))
+        cx, cy = (min_x + max_x) / 2.0, (min_y + max_y) / 2.0
+        x0 = int(min(max(cx - side / 2.0, 0), w - side))
+        y0 = int(min(max(cy - side / 2.0, 0), h - side))
+        self._roi = (x0, y0, side, side)
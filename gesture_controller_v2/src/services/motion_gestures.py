@@ -0,0 +1,229 @@
+"""Swipe and circle gestures from streaming ring buffers of palm positions."""
+
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from ..core.events import GestureEvent
+from .landmark_arrays import HANDEDNESS_CODES, HANDEDNESS_LABELS, NO_HAND
+
+PALM = 9  # middle finger MCP, stable while the fingers move
+
+MOTION_KINDS = ("swipe_left", "swipe_right", "swipe_up", "swipe_down", "circle_cw", "circle_ccw")
+
+
+class TrajectoryRing:
+    """Last ``window`` positions per slot with O(1) trajectory features.
+
+    Running sums of the step lengths and of the shoelace cross terms are
+    updated as positions enter and leave the ring, so path length,
+    displacement and enclosed area never walk the history. All slots are
+    updated together with array operations.
+    """
+
+    def __init__(self, slots: int, window: int):
+        self.window = window
+        self.pos = np.zeros((slots, window, 2), dtype=np.float64)
+        self.ts = np.zeros((slots, window), dtype=np.float64)
+        self.step = np.zeros((slots, window), dtype=np.float64)  # |p[j] - p[j-1]|
+        self.cross = np.zeros((slots, window), dtype=np.float64)  # p[j-1] x p[j]
+        self.path = np.zeros(slots, dtype=np.float64)
+        self.cross_sum = np.zeros(slots, dtype=np.float64)
+        self.filled = np.zeros(slots, dtype=np.int64)
+        self.head = 0
+        self._slots = np.arange(slots)
+
+    def push(self, present: np.ndarray, new: np.ndarray, ts: float) -> np.ndarray:
+        """Append ``new[slot]`` for every present slot; returns the step lengths."""
+        head = self.head = (self.head + 1) % self.window
+        prev = self.pos[:, head - 1]
+        has_prev = present & (self.filled > 0)
+
+        # Drop the step that referenced the position being overwritten.
+        nxt = (head + 1) % self.window
+        full = present & (self.filled >= self.window)
+        self.path -= np.where(full, self.step[:, nxt], 0.0)
+        self.cross_sum -= np.where(full, self.cross[:, nxt], 0.0)
+        self.step[full, nxt] = 0.0
+        self.cross[full, nxt] = 0.0
+
+        delta = new - prev
+        step = np.where(has_prev, np.hypot(delta[:, 0], delta[:, 1]), 0.0)
+        cross = np.where(has_prev, prev[:, 0] * new[:, 1] - new[:, 0] * prev[:, 1], 0.0)
+        self.step[present, head] = step[present]
+        self.cross[present, head] = cross[present]
+        self.path += np.where(present, step, 0.0)
+        self.cross_sum += np.where(present, cross, 0.0)
+        self.pos[present, head] = new[present]
+        self.ts[present, head] = ts
+        self.filled = np.where(present, np.minimum(self.filled + 1, self.window), self.filled)
+        return step
+
+    def features(self):
+        """``(displacement (S,2), distance, path, duration, signed area, roundness)`` per slot.
+
+        The area closes the trajectory back to its start; roundness compares
+        it with a circle of the same perimeter (1.0 = circle, 0 = line).
+        """
+        oldest_idx = (self.head - self.filled + 1) % self.window
+        oldest = self.pos[self._slots, oldest_idx]
+        newest = self.pos[:, self.head]
+        disp = newest - oldest
+        dist = np.hypot(disp[:, 0], disp[:, 1])
+        path = np.maximum(self.path, 1e-9)
+        duration = self.ts[:, self.head] - self.ts[self._slots, oldest_idx]
+        area = 0.5 * (self.cross_sum + newest[:, 0] * oldest[:, 1] - oldest[:, 0] * newest[:, 1])
+        perimeter = path + dist
+        roundness = 4.0 * np.pi * np.abs(area) / (perimeter * perimeter)
+        return disp, dist, path, duration, area, roundness
+
+    def reset(self, slot: int):
+        self.pos[slot] = 0.0
+        self.step[slot] = 0.0
+        self.cross[slot] = 0.0
+        self.path[slot] = 0.0
+        self.cross_sum[slot] = 0.0
+        self.filled[slot] = 0
+
+
+class MotionGestureRecognizer:
+    """Recognizes swipes and circles per hand in constant time per frame.
+
+    Each hand (slot = handedness code) feeds two rings of palm positions: a
+    short one for swipes (fast, straight strokes) and a longer one for
+    circles. Coordinates are normalized and already mirrored by the capture
+    loop, so "left"/"right" and "cw"/"ccw" are as the user sees them.
+    """
+
+    def __init__(
+        self,
+        swipe_window: int = 10,
+        circle_window: int = 30,
+        min_frames: int = 5,
+        swipe_distance: float = 0.22,
+        swipe_straightness: float = 0.9,
+        swipe_max_roundness: float = 0.15,
+        circle_min_path: float = 0.5,
+        circle_closure: float = 0.3,
+        circle_roundness: float = 0.6,
+        moving_speed: float = 0.015,
+        refractory: float = 0.75,
+    ):
+        slots = len(HANDEDNESS_CODES)
+        self.swipes = TrajectoryRing(slots, swipe_window)
+        self.circles = TrajectoryRing(slots, circle_window)
+        self.min_frames = min_frames
+        self.swipe_distance = swipe_distance
+        self.swipe_straightness = swipe_straightness
+        # Arcs are fairly straight too; their enclosed area tells them apart.
+        self.swipe_max_roundness = swipe_max_roundness
+        self.circle_min_path = circle_min_path
+        # Max end-to-start gap relative to the path length.
+        self.circle_closure = circle_closure
+        self.circle_roundness = circle_roundness
+        self.moving_speed = moving_speed
+        # After an event a hand stays disarmed until its palm slows below
+        # ``moving_speed`` or ``refractory`` seconds pass: one stroke, one event.
+        self.refractory = refractory
+        self._armed = np.ones(slots, dtype=bool)
+        self._disarmed_at = np.zeros(slots, dtype=np.float64)
+        self._speed = np.zeros(slots, dtype=np.float64)
+        self._present = np.zeros(slots, dtype=bool)
+        self._new = np.zeros((slots, 2), dtype=np.float64)
+
+    def update(
+        self, landmarks: np.ndarray, handedness: np.ndarray, count: int, ts: Optional[float] = None
+    ) -> List[GestureEvent]:
+        """Feed one frame of packed hands (``result_to_arrays`` layout)."""
+        ts = time.perf_counter() if ts is None else ts
+        was_present = self._present.copy()
+        self._present.fill(False)
+        for i in range(count):
+            slot = int(handedness[i])
+            if slot != NO_HAND:
+                self._present[slot] = True
+                self._new[slot] = landmarks[i, PALM, :2]
+        for slot in np.flatnonzero(was_present & ~self._present):
+            self.reset(int(slot))
+
+        step = self.swipes.push(self._present, self._new, ts)
+        self.circles.push(self._present, self._new, ts)
+        self._speed = np.where(self._present, 0.5 * self._speed + 0.5 * step, 0.0)
+        self._rearm(ts)
+        return self._swipe_events(ts) + self._circle_events(ts)
+
+    def is_moving(self, handedness: int) -> bool:
+        """True while the palm moves fast enough that static poses are unreliable."""
+        return handedness != NO_HAND and bool(self._speed[handedness] >= self.moving_speed)
+
+    def reset(self, slot: int):
+        self.swipes.reset(slot)
+        self.circles.reset(slot)
+        self._speed[slot] = 0.0
+        self._armed[slot] = True
+
+    def _rearm(self, ts: float):
+        ready = ~self._armed & (
+            (self._speed < self.moving_speed) | (ts - self._disarmed_at >= self.refractory)
+        )
+        for slot in np.flatnonzero(ready):
+            slot = int(slot)
+            self._armed[slot] = True
+            # Start from here: the rings still hold the tail of the last stroke.
+            self.swipes.reset(slot)
+            self.circles.reset(slot)
+
+    def _swipe_events(self, ts: float) -> List[GestureEvent]:
+        ring = self.swipes
+        ready = self._present & self._armed & (ring.filled >= self.min_frames)
+        if not ready.any():
+            return []
+        disp, dist, path, duration, _, roundness = ring.features()
+        hits = (
+            ready
+            & (dist >= self.swipe_distance)
+            & (dist >= self.swipe_straightness * path)
+            & (roundness <= self.swipe_max_roundness)
+        )
+        events = []
+        for slot in np.flatnonzero(hits):
+            slot = int(slot)
+            dx, dy = disp[slot]
+            if abs(dx) >= abs(dy):
+                kind = "swipe_right" if dx > 0 else "swipe_left"
+            else:
+                kind = "swipe_down" if dy > 0 else "swipe_up"  # y grows downward
+            payload = {"distance": float(dist[slot]), "speed": float(dist[slot] / max(duration[slot], 1e-3))}
+            events.append(self._event(kind, slot, payload, ts))
+        return events
+
+    def _circle_events(self, ts: float) -> List[GestureEvent]:
+        ring = self.circles
+        ready = self._present & self._armed & (ring.filled >= self.min_frames)
+        if not ready.any():
+            return []
+        _, dist, path, _, area, roundness = ring.features()
+        hits = (
+            ready
+            & (path >= self.circle_min_path)
+            & (dist <= self.circle_closure * path)
+            & (roundness >= self.circle_roundness)
+        )
+        events = []
+        for slot in np.flatnonzero(hits):
+            slot = int(slot)
+            # y grows downward, so a positive shoelace area is clockwise on screen.
+            kind = "circle_cw" if area[slot] > 0 else "circle_ccw"
+            payload = {"radius": float(np.sqrt(abs(area[slot]) / np.pi)), "roundness": float(roundness[slot])}
+            events.append(self._event(kind, slot, payload, ts))
+        return events
+
+    def _event(self, kind: str, slot: int, payload, ts: float) -> GestureEvent:
+        # The speed is kept so the pose stays suppressed while the hand moves.
+        self._armed[slot] = False
+        self._disarmed_at[slot] = ts
+        self.swipes.reset(slot)
+        self.circles.reset(slot)
+        hand = HANDEDNESS_LABELS.get(slot, "Unknown")
+        return GestureEvent(kind=kind, hand=hand, confidence=1.0, payload=payload)
@@ -0,0 +1,238 @@
+"""Record raw camera sessions to a chunked file and replay them as a camera."""
+
+import queue
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ..utils.logger import get_logger
+
+log = get_logger(__name__)
+
+MAGIC = b"GCSESS01"
+CHUNK_TAG = b"CHNK"
+# tag, frames in chunk, compressed payload size, flags (bit 0 = zlib)
+CHUNK_HEADER = struct.Struct("<4sIII")
+# capture timestamp, height, width, channels
+FRAME_HEADER = struct.Struct("<dHHB")
+FLAG_ZLIB = 1
+
+
+class SessionRecorder:
+    """Writes frames + capture timestamps to a compact chunked session file.
+
+    ``write`` only copies the frame and queues it; chunking, compression and
+    disk I/O happen on a background thread so the grab loop is not slowed
+    down. If the writer falls behind, frames are dropped and counted.
+    """
+
+    def __init__(self, path, chunk_frames: int = 30, compress: bool = True, max_pending: int = 120):
+        self.path = Path(path)
+        self.chunk_frames = chunk_frames
+        self.compress = compress
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC)
+        self._thread = threading.Thread(target=self._run, name="SessionRecorder", daemon=True)
+        self._thread.start()
+
+    def write(self, frame, ts: Optional[float] = None):
+        try:
+            self._queue.put_nowait((time.perf_counter() if ts is None else ts, frame.copy()))
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5.0)
+        self._file.close()
+        log.info("Session saved to %s (%s frames, %s dropped).", self.path, self.frames_written, self.frames_dropped)
+
+    def _run(self):
+        pending: List[Tuple[float, np.ndarray]] = []
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            pending.append(item)
+            if len(pending) >= self.chunk_frames:
+                self._write_chunk(pending)
+                pending = []
+        if pending:
+            self._write_chunk(pending)
+
+    def _write_chunk(self, frames: List[Tuple[float, np.ndarray]]):
+        parts = []
+        for ts, frame in frames:
+            h, w = frame.shape[:2]
+            channels = frame.shape[2] if frame.ndim == 3 else 1
+            parts.append(FRAME_HEADER.pack(ts, h, w, channels))
+        parts.extend(np.ascontiguousarray(frame, dtype=np.uint8).tobytes() for _, frame in frames)
+        payload = b"".join(parts)
+        flags = 0
+        if self.compress:
+            payload = zlib.compress(payload, 1)
+            flags |= FLAG_ZLIB
+        self._file.write(CHUNK_HEADER.pack(CHUNK_TAG, len(frames), len(payload), flags))
+        self._file.write(payload)
+        self.frames_written += len(frames)
+
+
+def read_session(path) -> Iterator[Tuple[float, np.ndarray]]:
+    """Yield ``(capture_ts, frame)`` from a session file, one chunk in memory at a time.
+
+    A recorder killed mid-write leaves a truncated last chunk; reading stops
+    at the last complete chunk with a warning instead of raising.
+    """
+    with open(path, "rb") as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a gesture session file")
+        while True:
+            header = fh.read(CHUNK_HEADER.size)
+            if not header:
+                return
+            if len(header) < CHUNK_HEADER.size:
+                log.warning("Session %s ends in a truncated chunk header; stopping there.", path)
+                return
+            tag, count, size, flags = CHUNK_HEADER.unpack(header)
+            if tag != CHUNK_TAG:
+                raise ValueError(f"Corrupt chunk in {path}")
+            frames = _read_chunk(fh.read(size), count, size, flags)
+            if frames is None:
+                log.warning("Session %s ends in a truncated chunk; stopping at the last complete one.", path)
+                return
+            yield from frames
+
+
+def _read_chunk(payload: bytes, count: int, size: int, flags: int) -> Optional[List[Tuple[float, np.ndarray]]]:
+    """Frames of one chunk, or None if the chunk is incomplete."""
+    if len(payload) < size:
+        return None
+    try:
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        headers = [FRAME_HEADER.unpack_from(payload, i * FRAME_HEADER.size) for i in range(count)]
+    except (zlib.error, struct.error):
+        return None
+    frames = []
+    offset = FRAME_HEADER.size * count
+    for ts, h, w, channels in headers:
+        nbytes = h * w * channels
+        if offset + nbytes > len(payload):
+            return None
+        shape = (h, w, channels) if channels > 1 else (h, w)
+        frames.append((ts, np.frombuffer(payload, dtype=np.uint8, count=nbytes, offset=offset).reshape(shape)))
+        offset += nbytes
+    return frames
+
+
+class ReplaySource:
+    """Plays a session file back through the ``cv2.VideoCapture`` interface.
+
+    With ``realtime`` frames are paced by their original capture timestamps;
+    otherwise they are returned as fast as the consumer reads them.
+    """
+
+    def __init__(self, path, realtime: bool = True, loop: bool = False):
+        self.path = Path(path)
+        self.realtime = realtime
+        self.loop = loop
+        self._frames: Optional[Iterator[Tuple[float, np.ndarray]]] = None
+        self._first_ts: Optional[float] = None
+        self._start_wall = 0.0
+        self.at_end = False  # a non-looping session has been read to the end
+        self._opened = self.path.exists()
+        if self._opened:
+            self._rewind()
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def read(self, image=None):
+        if not self._opened:
+            return False, None
+        item = next(self._frames, None)
+        if item is None and self.loop:
+            self._rewind()
+            item = next(self._frames, None)
+        if item is None:
+            self.at_end = True
+            return False, None
+
+        ts, frame = item
+        if self.realtime:
+            if self._first_ts is None:
+                self._first_ts, self._start_wall = ts, time.perf_counter()
+            delay = (ts - self._first_ts) - (time.perf_counter() - self._start_wall)
+            if delay > 0:
+                time.sleep(delay)
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame.copy()
+
+    def release(self):
+        self._opened = False
+        self._frames = None
+
+    def set(self, prop_id, value) -> bool:
+        return False
+
+    def get(self, prop_id) -> float:
+        return 0.0
+
+    def _rewind(self):
+        self._frames = read_session(self.path)
+        self._first_ts = None
+
+
+class ReplayEngine:
+    """CaptureEngine stand-in that opens a ReplaySource instead of a camera.
+
+    Fast (non-realtime) replay is ``lossless``: the grabber waits for every
+    frame to be consumed, so runs are deterministic regardless of CPU speed.
+    """
+
+    def __init__(self, path, realtime: bool = True, loop: bool = False):
+        self.path = Path(path)
+        self.realtime = realtime
+        self.loop = loop
+        self.cap: Optional[ReplaySource] = None
+        self.finished = False
+        self.lossless = not realtime
+
+    @property
+    def description(self) -> str:
+        return f"replay:{self.path}"
+
+    def open(self) -> Optional[ReplaySource]:
+        self.finished = False
+        self.cap = ReplaySource(self.path, realtime=self.realtime, loop=self.loop)
+        if not self.cap.isOpened():
+            return None
+        log.info("Replaying session %s (%s)", self.path, "realtime" if self.realtime else "fast")
+        return self.cap
+
+    def reopen_alternate(self) -> Optional[ReplaySource]:
+        # Reads only fail at the end of a non-looping session (normally
+        # reported as EndOfStream before the grabber gets here).
+        if not self.finished:
+            log.info("Replay finished: %s", self.path)
+            self.finished = True
+        self.release()
+        return None
+
+    def release(self):
+        if self.cap:
+            self.cap.release()
+        self.cap = None
+
+    def stats(self):
+        return {"backend": "replay", "path": str(self.path), "realtime": self.realtime}
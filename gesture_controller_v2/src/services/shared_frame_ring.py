@@ -0,0 +1,304 @@
+"""Shared-memory ring of frames + landmark arrays between processes.
+
+One producer (``capture_service``) publishes every processed frame with its
+landmarks; any number of consumers attach by name and read the newest slot
+without copying the frame. Each slot is guarded by a sequence counter
+(odd while being written) so readers can detect torn or overwritten data.
+
+The frame shape is fixed per segment. When the producer closes a ring (on
+exit, or to recreate it for a new camera resolution) it overwrites the
+magic with ``RETIRED`` first; readers see ``retired`` and re-attach by name.
+"""
+
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from .landmark_arrays import NO_HAND, NUM_LANDMARKS, arrays_to_result
+from .session_recorder import SessionRecorder
+from ..utils.logger import get_logger
+from reality_hologram.src.utils.latency import mark, start_trace
+
+log = get_logger(__name__)
+
+MAGIC = 0x47435231  # "GCR1"
+RETIRED = 0
+# magic, slots, height, width, channels, max_hands, slot_size, write_seq
+HEADER = struct.Struct("<IIIIIIQQ")
+# seq, capture ts, hand count
+SLOT_HEADER = struct.Struct("<QdI")
+ALIGN = 64
+
+
+def _align(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _slot_layout(shape: Tuple[int, int, int], max_hands: int):
+    """Byte offsets inside a slot: header, handedness, scores, landmarks, frame."""
+    handedness = _align(SLOT_HEADER.size)
+    scores = _align(handedness + max_hands)
+    landmarks = _align(scores + 4 * max_hands)
+    frame = _align(landmarks + 4 * max_hands * NUM_LANDMARKS * 3)
+    size = _align(frame + int(np.prod(shape)))
+    return handedness, scores, landmarks, frame, size
+
+
+def _detach_from_tracker(shm: shared_memory.SharedMemory):
+    # Before Python 3.13 attaching registers the segment with the resource
+    # tracker, which would unlink it when a consumer exits.
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")  # noqa: SLF001
+    except Exception:
+        pass
+
+
+class _RingViews:
+    """Numpy views over every slot of the mapped segment."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int, shape, max_hands: int):
+        off_hand, off_score, off_lm, off_frame, slot_size = _slot_layout(shape, max_hands)
+        self.slot_size = slot_size
+        self.frames = []
+        self.landmarks = []
+        self.handedness = []
+        self.scores = []
+        for i in range(slots):
+            base = HEADER.size + i * slot_size
+            buf = shm.buf
+            self.handedness.append(np.ndarray((max_hands,), np.int8, buf, base + off_hand))
+            self.scores.append(np.ndarray((max_hands,), np.float32, buf, base + off_score))
+            self.landmarks.append(np.ndarray((max_hands, NUM_LANDMARKS, 3), np.float32, buf, base + off_lm))
+            self.frames.append(np.ndarray(shape, np.uint8, buf, base + off_frame))
+
+    def clear(self):
+        # Views must be gone before the segment can be closed.
+        self.frames.clear()
+        self.landmarks.clear()
+        self.handedness.clear()
+        self.scores.clear()
+
+
+class SharedFrameRing:
+    """Producer side: creates the segment and publishes frames."""
+
+    def __init__(self, name: str, shape: Tuple[int, int, int], max_hands: int = 2, slots: int = 4):
+        self.name = name
+        self.shape = tuple(shape)
+        self.max_hands = max_hands
+        self.slots = slots
+        slot_size = _slot_layout(self.shape, max_hands)[-1]
+        size = HEADER.size + slots * slot_size
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Stale segment from a crashed producer: take it over.
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._views = _RingViews(self.shm, slots, self.shape, max_hands)
+        self.write_seq = 0
+        h, w, c = self.shape
+        HEADER.pack_into(self.shm.buf, 0, MAGIC, slots, h, w, c, max_hands, self._views.slot_size, 0)
+
+    def publish(self, frame, landmarks, handedness, scores, count: int, ts: float):
+        """Write one slot; raises ValueError if ``frame`` does not have the ring's shape."""
+        if tuple(frame.shape) != self.shape:
+            raise ValueError(f"Frame of shape {frame.shape} does not fit ring '{self.name}' {self.shape}")
+        n = self.write_seq
+        slot = n % self.slots
+        base = HEADER.size + slot * self._views.slot_size
+        SLOT_HEADER.pack_into(self.shm.buf, base, 2 * n + 1, ts, count)  # odd: write in progress
+        try:
+            np.copyto(self._views.frames[slot], frame)
+            np.copyto(self._views.landmarks[slot], landmarks)
+            np.copyto(self._views.handedness[slot], handedness)
+            np.copyto(self._views.scores[slot], scores)
+        finally:
+            # Never leave the slot odd. After a failed copy write_seq is not
+            # advanced, so readers never look at this slot's partial data.
+            SLOT_HEADER.pack_into(self.shm.buf, base, 2 * n + 2, ts, count)
+        self.write_seq = n + 1
+        struct.pack_into("<Q", self.shm.buf, HEADER.size - 8, self.write_seq)
+
+    def close(self):
+        # Attached readers notice and re-attach (or wait for a new producer).
+        struct.pack_into("<I", self.shm.buf, 0, RETIRED)
+        self._views.clear()
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedFrameRingReader:
+    """Consumer side: attaches by name and hands out the newest slot.
+
+    ``read`` returns the frame as a view into shared memory (no copy); the
+    small landmark arrays are copied so they stay valid. Call ``still_valid``
+    after using the frame to check the producer did not overwrite it.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.shm = shared_memory.SharedMemory(name=name)
+        _detach_from_tracker(self.shm)
+        magic, slots, h, w, c, max_hands, slot_size, _ = HEADER.unpack_from(self.shm.buf, 0)
+        if magic != MAGIC:
+            self.shm.close()
+            raise ValueError(f"Shared memory '{name}' is not a frame ring")
+        self.slots = slots
+        self.shape = (h, w, c)
+        self.max_hands = max_hands
+        self._views = _RingViews(self.shm, slots, self.shape, max_hands)
+        self.last_seq = 0
+        self.retired = False  # the producer closed or replaced this segment
+        self.frames_read = 0
+        self.frames_missed = 0
+        self.landmarks = np.zeros((max_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        self.handedness = np.full(max_hands, NO_HAND, dtype=np.int8)
+        self.scores = np.zeros(max_hands, dtype=np.float32)
+
+    def write_seq(self) -> int:
+        return struct.unpack_from("<Q", self.shm.buf, HEADER.size - 8)[0]
+
+    def read(self) -> Optional[Tuple[int, np.ndarray, float]]:
+        """Return ``(seq, frame_view, ts)`` for the newest frame, or None if nothing new.
+
+        None with ``retired`` set means the producer closed the segment: close
+        this reader and attach again.
+        """
+        if struct.unpack_from("<I", self.shm.buf, 0)[0] != MAGIC:
+            self.retired = True
+            return None
+        n = self.write_seq()
+        if n == self.last_seq:
+            return None
+        slot = (n - 1) % self.slots
+        base = HEADER.size + slot * self._views.slot_size
+        seq, ts, count = SLOT_HEADER.unpack_from(self.shm.buf, base)
+        if seq != 2 * (n - 1) + 2:
+            return None  # being rewritten; try again next poll
+        np.copyto(self.landmarks, self._views.landmarks[slot])
+        np.copyto(self.handedness, self._views.handedness[slot])
+        np.copyto(self.scores, self._views.scores[slot])
+        if SLOT_HEADER.unpack_from(self.shm.buf, base)[0] != seq:
+            return None
+        if self.last_seq:
+            self.frames_missed += n - self.last_seq - 1
+        self.last_seq = n
+        self.frames_read += 1
+        return n, self._views.frames[slot], ts
+
+    def still_valid(self, seq: int) -> bool:
+        slot = (seq - 1) % self.slots
+        base = HEADER.size + slot * self._views.slot_size
+        return SLOT_HEADER.unpack_from(self.shm.buf, base)[0] == 2 * (seq - 1) + 2
+
+    def result(self):
+        """Result-like object for the landmarks of the last ``read``."""
+        return arrays_to_result(self.landmarks, self.handedness, self.scores)
+
+    def close(self):
+        self._views.clear()
+        self.shm.close()
+
+
+class SharedRingLoop:
+    """CameraLoop stand-in that consumes a ring published by another process.
+
+    Calls ``callback(frame, hand_data, trace)`` like CameraLoop does; ``frame`` is
+    a shared-memory view that is only valid during the callback. Result
+    hooks get ``(result, ts)`` like ``MediapipeHandTracker`` hooks, and an
+    optional recorder stores the frames as a session file (un-mirrored, like
+    CameraLoop records them).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        callback: Optional[Callable] = None,
+        recorder: Optional[SessionRecorder] = None,
+        poll_interval: float = 0.002,
+    ):
+        self.name = name
+        self.callback = callback
+        self.recorder = recorder
+        self.poll_interval = poll_interval
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self.reader: Optional[SharedFrameRingReader] = None
+        self.tracker = None  # inference happens in the producer process
+        self._hooks: List[Callable] = []
+
+    def add_result_hook(self, hook: Callable):
+        self._hooks.append(hook)
+
+    def remove_result_hook(self, hook: Callable):
+        if hook in self._hooks:
+            self._hooks.remove(hook)
+
+    def start(self) -> bool:
+        if self.running:
+            return True
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        log.info("Attached consumer to shared ring '%s'", self.name)
+        return True
+
+    def stop(self):
+        self.running = False
+        if self.thread and self.thread.is_alive() and threading.current_thread() != self.thread:
+            self.thread.join(timeout=2.0)
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+        if self.reader:
+            log.info(
+                "Shared ring '%s' read %s frames (%s missed).",
+                self.name,
+                self.reader.frames_read,
+                self.reader.frames_missed,
+            )
+            self.reader.close()
+            self.reader = None
+
+    def _run(self):
+        while self.running:
+            if self.reader is None:
+                try:
+                    self.reader = SharedFrameRingReader(self.name)
+                except FileNotFoundError:
+                    time.sleep(0.5)  # producer not up yet
+                    continue
+            latest = self.reader.read()
+            if latest is None:
+                if self.reader.retired:
+                    log.info("Shared ring '%s' was replaced by its producer; re-attaching.", self.name)
+                    self.reader.close()
+                    self.reader = None
+                    continue
+                time.sleep(self.poll_interval)
+                continue
+            seq, frame, ts = latest
+            result = self.reader.result()
+            for hook in self._hooks:
+                hook(result, ts)
+            if self.recorder:
+                # Ring frames are already mirrored; sessions hold raw camera
+                # frames (replay mirrors them again), so un-mirror on the way in.
+                self.recorder.write(frame[:, ::-1], ts)
+                if not self.reader.still_valid(seq):
+                    log.debug("Frame %s overwritten while recording; consumer is too slow.", seq)
+            if self.callback:
+                # The producer's grab timestamp keeps end-to-end latency across processes.
+                self.callback(frame, result, mark(start_trace(ts), "ring"))
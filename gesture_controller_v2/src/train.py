@@ -0,0 +1,153 @@
+"""Train a gesture classifier from recorded landmark stores (numpy only).
+
+    python -m gesture_controller_v2.src.train --data open=data/open01 fist=data/fist01 none=data/idle01 \\
+        --model mlp --out models/gestos.npz
+
+Each ``GESTO=RUTA`` store (recorded with ``--landmarks-out`` while holding
+that gesture) labels all of its detected hands. The model is then used with
+``main --classifier models/gestos.npz``.
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from .services.gesture_classifier import CLASSIFIERS, NONE_KIND, KNNClassifier, MLPClassifier
+from .services.gesture_mapper import GESTURE_CODES, GESTURE_KINDS, NO_GESTURE, GestureMapper
+from .services.landmark_store import LandmarkStore
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def parse_labeled_store(text: str) -> Tuple[str, str]:
+    kind, sep, path = text.partition("=")
+    if not sep or not path:
+        raise argparse.ArgumentTypeError(f"Formato invalido '{text}' (usa GESTO=RUTA, ej: open=data/open01)")
+    if kind not in GESTURE_KINDS and kind != NONE_KIND:
+        valid = ", ".join(GESTURE_KINDS + (NONE_KIND,))
+        raise argparse.ArgumentTypeError(f"Gesto desconocido '{kind}' (validos: {valid})")
+    return kind, path
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Entrena un clasificador de gestos desde landmarks grabados")
+    parser.add_argument(
+        "--data",
+        type=parse_labeled_store,
+        nargs="+",
+        required=True,
+        metavar="GESTO=RUTA",
+        help="Stores de landmarks etiquetados; 'none' para manos sin gesto. Un gesto puede repetirse.",
+    )
+    parser.add_argument("--model", choices=sorted(CLASSIFIERS), default="knn", help="Tipo de modelo.")
+    parser.add_argument("--out", type=str, required=True, help="Archivo .npz de salida.")
+    parser.add_argument("--k", type=int, default=5, help="Vecinos (knn).")
+    parser.add_argument("--max-per-class", type=int, default=1000, help="Muestras maximas por gesto en el indice (knn).")
+    parser.add_argument("--hidden", type=int, default=64, help="Neuronas de la capa oculta (mlp).")
+    parser.add_argument("--epochs", type=int, default=40, help="Epocas de entrenamiento (mlp).")
+    parser.add_argument(
+        "--min-confidence", type=float, default=0.6, help="Probabilidad minima para reportar un gesto al usar el modelo."
+    )
+    parser.add_argument(
+        "--val",
+        type=float,
+        default=0.2,
+        help="Fraccion final de cada store reservada para validar (un bloque contiguo, asi frames vecinos "
+        "casi iguales no quedan repartidos entre entrenamiento y validacion).",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def load_dataset(sources: List[Tuple[str, str]], kinds: Tuple[str, ...]):
+    """Stacked ``(landmarks, handedness, labels, sizes)``; ``sizes`` are hands per store, in order."""
+    landmarks, handedness, labels, sizes = [], [], [], []
+    for kind, path in sources:
+        lms, hands, _ = LandmarkStore(path).hands()
+        log.info("%s: %s manos de %s", kind, len(hands), path)
+        landmarks.append(np.asarray(lms, dtype=np.float32))
+        handedness.append(np.asarray(hands, dtype=np.int8))
+        labels.append(np.full(len(hands), kinds.index(kind), dtype=np.int64))
+        sizes.append(len(hands))
+    return np.concatenate(landmarks), np.concatenate(handedness), np.concatenate(labels), sizes
+
+
+def holdout_split(sizes: List[int], fraction: float) -> Tuple[np.ndarray, np.ndarray]:
+    """``(val, train)`` row indices holding out the last ``fraction`` of every store.
+
+    Consecutive frames of a recording are near-duplicates; a per-frame random
+    split would put copies of validation hands in the training set.
+    """
+    val, train = [], []
+    start = 0
+    for size in sizes:
+        n_val = int(size * fraction)
+        rows = np.arange(start, start + size)
+        train.append(rows[: size - n_val])
+        val.append(rows[size - n_val :])
+        start += size
+    return np.concatenate(val), np.concatenate(train)
+
+
+def build_model(args, kinds):
+    if args.model == "knn":
+        return KNNClassifier(kinds, k=args.k, min_confidence=args.min_confidence, max_per_class=args.max_per_class)
+    return MLPClassifier(kinds, hidden=args.hidden, min_confidence=args.min_confidence, epochs=args.epochs)
+
+
+def rule_labels(landmarks, handedness, kinds) -> np.ndarray:
+    """What the rule-based mapper says for the same hands, as indices into ``kinds``."""
+    scores = np.ones(len(handedness), dtype=np.float32)
+    codes, _, _ = GestureMapper().classify_batch(landmarks, handedness, scores)
+    lookup = {GESTURE_CODES.get(kind, NO_GESTURE): i for i, kind in enumerate(kinds)}
+    return np.array([lookup.get(int(code), -1) for code in codes], dtype=np.int64)
+
+
+def per_frame_us(model, landmarks, handedness, hands: int = 2, repeats: int = 200) -> float:
+    batch, sides = landmarks[:hands], handedness[:hands]
+    model.predict(batch, sides)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.predict(batch, sides)
+    return 1e6 * (time.perf_counter() - start) / repeats
+
+
+def main():
+    args = parse_args()
+    kinds = tuple(sorted({kind for kind, _ in args.data}, key=lambda k: (k == NONE_KIND, k)))
+    landmarks, handedness, labels, sizes = load_dataset(args.data, kinds)
+    if len(labels) == 0:
+        raise SystemExit("Los stores no tienen manos detectadas")
+
+    val, train = holdout_split(sizes, args.val)
+    n_val = len(val)
+
+    model = build_model(args, kinds)
+    start = time.perf_counter()
+    model.fit(landmarks[train], handedness[train], labels[train], seed=args.seed)
+    log.info("Modelo %s entrenado con %s muestras en %.1f s", args.model, len(train), time.perf_counter() - start)
+
+    if n_val:
+        predicted, _ = model.predict(landmarks[val], handedness[val])
+        rules = rule_labels(landmarks[val], handedness[val], kinds)
+        print(f"{'gesto':>14} {'muestras':>8} {'modelo':>7} {'reglas':>7}")
+        for i, kind in enumerate(kinds):
+            rows = labels[val] == i
+            if rows.any():
+                print(
+                    f"{kind:>14} {int(rows.sum()):>8} {np.mean(predicted[rows] == i):>7.1%} "
+                    f"{np.mean(rules[rows] == i):>7.1%}"
+                )
+        print(f"{'total':>14} {n_val:>8} {np.mean(predicted == labels[val]):>7.1%} {np.mean(rules == labels[val]):>7.1%}")
+    log.info("Inferencia: %.1f us por frame (2 manos)", per_frame_us(model, landmarks, handedness))
+
+    path = model.save(Path(args.out))
+    log.info("Modelo guardado en %s (usar con --classifier %s)", path, path)
+
+
+if __name__ == "__main__":
+    main()
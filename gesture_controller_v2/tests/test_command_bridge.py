@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+
+from gesture_controller_v2.src.core.command_bridge import CommandBridge
+
+
+class GatedRouter:
+    """Records routed commands; blocks inside ``route_command`` until ``release``."""
+
+    def __init__(self):
+        self.routed = []
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+
+    def route_command(self, action, payload=None, source=None, trace=None):
+        self.entered.set()
+        self.gate.wait(5.0)
+        self.routed.append((action, payload))
+        return {"status": "ok", "action": action}
+
+    def release(self):
+        self.gate.set()
+
+
+@pytest.fixture
+def make_bridge():
+    bridges = []
+
+    def make(**kwargs):
+        bridge = CommandBridge(async_dispatch=True, **kwargs)
+        bridge.router = GatedRouter()
+        bridges.append(bridge)
+        # Park the writer on a first command so the rest stay queued.
+        busy = bridge.send("pause", {"target": "actor"})
+        assert bridge.router.entered.wait(1.0)
+        return bridge, busy
+
+    yield make
+    for bridge in bridges:
+        bridge.router.release()
+        bridge.close()
+
+
+def dropped(future):
+    return future.done() and future.result()["status"] == "dropped"
+
+
+def test_drop_oldest_never_evicts_lifecycle_commands(make_bridge):
+    bridge, _ = make_bridge(queue_size=2, overflow="drop_oldest")
+    load = bridge.send("load_scene", {"scene": "garage"})
+    zoom = bridge.send("zoom", {"delta": 0.2})
+    move = bridge.send("move", {"direction": "forward"})  # evicts zoom, not load_scene
+    assert dropped(zoom) and not load.done()
+
+    stop = bridge.send("shutdown")  # evicts move
+    assert dropped(move)
+    rotate = bridge.send("rotate", {"degrees": 5.0})  # only lifecycle queued: the new one goes
+    assert dropped(rotate)
+    boot = bridge.send("boot")  # lifecycle: the queue grows past its size
+    assert bridge.stats()["depth"] == 3
+
+    bridge.router.release()
+    assert bridge.flush(1.0)
+    assert [action for action, _ in bridge.router.routed] == ["pause", "load_scene", "shutdown", "boot"]
+    assert all(future.result()["status"] == "ok" for future in (load, stop, boot))
+    assert bridge.dropped == 3
+
+
+def test_coalesce_merges_only_into_the_newest_queued_command(make_bridge):
+    bridge, _ = make_bridge(queue_size=2, overflow="coalesce")
+    zoom = bridge.send("zoom", {"delta": 0.2})
+    first = bridge.send("rotate", {"axis": "y", "degrees": 10.0})
+    second = bridge.send("rotate", {"axis": "y", "degrees": 5.0})  # merges into the newest
+    assert bridge.coalesced == 1 and bridge.stats()["depth"] == 2
+
+    late_zoom = bridge.send("zoom", {"delta": 0.2})  # the older zoom is not the newest: drop instead
+    assert bridge.coalesced == 1
+    assert dropped(zoom) and not late_zoom.done()
+
+    bridge.router.release()
+    assert bridge.flush(1.0)
+    assert bridge.router.routed[1:] == [
+        ("rotate", {"axis": "y", "degrees": 15.0}),
+        ("zoom", {"delta": 0.2}),
+    ]
+    assert first.result() is second.result()
+    assert first.result()["status"] == "ok"
+
+
+def test_close_resolves_every_future(make_bridge):
+    bridge, busy = make_bridge(queue_size=8)
+    queued = [bridge.send("rotate", {"axis": axis, "degrees": 1.0}) for axis in "xyz"]
+    bridge.close(timeout=0.05)  # writer still stuck in the router
+    assert all(dropped(future) for future in queued)
+    assert dropped(bridge.send("zoom", {"delta": 0.1}))
+
+    bridge.router.release()
+    assert busy.result(1.0)["status"] == "ok"
+
+
+def test_close_routes_what_is_queued(make_bridge):
+    bridge, busy = make_bridge()
+    queued = [bridge.send("zoom", {"delta": 0.1}) for _ in range(3)]
+    bridge.router.release()
+    bridge.close()
+    assert all(future.result(0)["status"] == "ok" for future in [busy] + queued)
+    assert len(bridge.router.routed) == 4
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from gesture_controller_v2.src.services.gesture_classifier import KNNClassifier
+from gesture_controller_v2.src.services.landmark_arrays import NUM_LANDMARKS
+
+
+def hands(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0.3, 0.7, size=(n, NUM_LANDMARKS, 3)).astype(np.float32), np.ones(n, np.int8)
+
+
+def test_unfitted_knn_refuses_to_predict():
+    landmarks, handedness = hands(3)
+    with pytest.raises(ValueError):
+        KNNClassifier(kinds=("open", "fist")).predict(landmarks, handedness)
+
+
+def test_knn_refuses_an_empty_dataset():
+    landmarks, handedness = hands(0)
+    with pytest.raises(ValueError):
+        KNNClassifier(kinds=("open", "fist")).fit(landmarks, handedness, np.zeros(0, np.int64))
+
+
+def test_knn_predicts_its_training_rows():
+    landmarks, handedness = hands(20)
+    labels = np.arange(20) % 2
+    model = KNNClassifier(kinds=("open", "fist"), k=1).fit(landmarks, handedness, labels)
+    predicted, confidence = model.predict(landmarks, handedness)
+    assert predicted.tolist() == labels.tolist()
+    assert np.all(confidence == 1.0)
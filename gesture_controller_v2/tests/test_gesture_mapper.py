@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from gesture_controller_v2.src.services.gesture_mapper import GESTURE_KINDS, NO_GESTURE, GestureMapper
+from gesture_controller_v2.src.services.landmark_arrays import (
+    NUM_LANDMARKS,
+    Classification,
+    ClassificationList,
+    HandResult,
+    Landmark,
+    LandmarkList,
+)
+
+
+def reference_classify(result, pinch_threshold=0.06, confidence_min=0.5):
+    """The per-hand rules GestureMapper.classify applied before it was vectorized."""
+    hand = result.multi_hand_landmarks[0].landmark
+    label = result.multi_handedness[0].classification[0]
+    if label.score < confidence_min:
+        return None
+    finger_up = [hand[tip].y < hand[pip].y for tip, pip in zip((4, 8, 12, 16, 20), (3, 6, 10, 14, 18))]
+    finger_up[0] = hand[4].x > hand[3].x if label.label == "Right" else hand[4].x < hand[3].x
+    total = sum(finger_up)
+    distance = float(np.hypot(hand[4].x - hand[8].x, hand[4].y - hand[8].y))
+    if distance < pinch_threshold:
+        return "pinch", {"strength": (pinch_threshold - distance) / pinch_threshold}
+    if total == 5:
+        return "open", None
+    if total == 0:
+        return "fist", None
+    if finger_up[1] and finger_up[2] and total == 2:
+        return "two_fingers", None
+    if total == 3:
+        return "three_fingers", None
+    if total == 4:
+        return "four_fingers", None
+    if finger_up[1] and total == 1:
+        return "point", {"direction": -1 if label.label == "Left" else 1}
+    return None
+
+
+def random_result(rng):
+    # float32 coordinates so both paths compare exactly the same values
+    points = rng.uniform(0.4, 0.6, size=(NUM_LANDMARKS, 2)).astype(np.float32)
+    landmarks = LandmarkList([Landmark(float(x), float(y)) for x, y in points])
+    label = Classification(str(rng.choice(["Left", "Right"])), float(rng.uniform(0.3, 1.0)))
+    return HandResult([landmarks], [ClassificationList([label])])
+
+
+def test_classify_matches_the_per_hand_rules_on_random_poses():
+    rng = np.random.default_rng(12)
+    mapper = GestureMapper()
+    seen = set()
+    for _ in range(3000):
+        result = random_result(rng)
+        expected = reference_classify(result)
+        event = mapper.classify(result)
+        if expected is None:
+            assert event is None
+            continue
+        kind, payload = expected
+        seen.add(kind)
+        assert event.kind == kind
+        assert event.hand == result.multi_handedness[0].classification[0].label
+        if kind == "pinch":
+            assert event.payload["strength"] == pytest.approx(payload["strength"], abs=1e-5)
+        else:
+            assert event.payload == payload
+    assert seen == set(GESTURE_KINDS)
+
+
+def test_empty_batch_before_any_other_batch():
+    mapper = GestureMapper()
+    codes, strengths, directions = mapper.classify_batch(
+        np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32), np.zeros(0, np.int8), np.zeros(0, np.float32)
+    )
+    assert codes.shape == strengths.shape == directions.shape == (0,)
+    assert mapper.classify_all(HandResult([], [])) == []
+
+
+def test_batch_rows_match_single_hand_results():
+    rng = np.random.default_rng(3)
+    results = [random_result(rng) for _ in range(64)]
+    single = GestureMapper()
+    expected = []
+    for result in results:
+        event = single.classify(result)
+        expected.append(GESTURE_KINDS.index(event.kind) if event else NO_GESTURE)
+    landmarks = np.array(
+        [[(lm.x, lm.y, lm.z) for lm in result.multi_hand_landmarks[0].landmark] for result in results],
+        dtype=np.float32,
+    )
+    handedness = np.array(
+        [1 if result.multi_handedness[0].classification[0].label == "Right" else 0 for result in results], np.int8
+    )
+    scores = np.array([result.multi_handedness[0].classification[0].score for result in results], np.float32)
+    codes, _, _ = GestureMapper().classify_batch(landmarks, handedness, scores)
+    assert codes.tolist() == expected
@@ -0,0 +1,54 @@
+import numpy as np
+
+from gesture_controller_v2.src.services.landmark_arrays import HANDEDNESS_CODES
+from gesture_controller_v2.src.services.motion_gestures import PALM, MotionGestureRecognizer
+
+FPS = 30.0
+RIGHT = HANDEDNESS_CODES["Right"]
+
+
+def feed(recognizer, points, start_ts=0.0):
+    """Feed one right hand whose palm follows ``points``; returns the event kinds."""
+    landmarks = np.zeros((1, 21, 3), dtype=np.float32)
+    handedness = np.array([RIGHT], dtype=np.int8)
+    kinds = []
+    for i, (x, y) in enumerate(points):
+        landmarks[0, :, 0] = x
+        landmarks[0, :, 1] = y
+        landmarks[0, PALM, :2] = (x, y)
+        events = recognizer.update(landmarks, handedness, 1, ts=start_ts + i / FPS)
+        kinds.extend(event.kind for event in events)
+    return kinds
+
+
+def stroke(start, step, frames, y=0.5):
+    return [(start + step * i, y) for i in range(frames)]
+
+
+def test_one_stroke_gives_one_event():
+    recognizer = MotionGestureRecognizer()
+    assert feed(recognizer, stroke(0.1, 0.05, 12)) == ["swipe_right"]
+
+
+def test_long_stroke_stays_disarmed_until_the_hand_slows():
+    recognizer = MotionGestureRecognizer(refractory=10.0)
+    assert feed(recognizer, stroke(0.0, 0.04, 25)) == ["swipe_right"]
+
+
+def test_rearms_after_the_hand_stops():
+    recognizer = MotionGestureRecognizer()
+    points = stroke(0.1, 0.05, 12)
+    points += [points[-1]] * 10  # hold still
+    points += stroke(points[-1][0], -0.05, 12)
+    assert feed(recognizer, points) == ["swipe_right", "swipe_left"]
+
+
+def test_rearms_after_refractory_time():
+    recognizer = MotionGestureRecognizer(refractory=0.2)
+    kinds = feed(recognizer, stroke(0.0, 0.03, 40))
+    assert len(kinds) > 1 and set(kinds) == {"swipe_right"}
+
+
+def test_slow_drift_is_not_a_swipe():
+    recognizer = MotionGestureRecognizer()
+    assert feed(recognizer, stroke(0.3, 0.005, 30)) == []
@@ -0,0 +1,95 @@
+import threading
+
+import numpy as np
+
+from gesture_controller_v2.src.services.frame_grabber import EndOfStream, FrameGrabber
+from gesture_controller_v2.src.services.session_recorder import ReplaySource, SessionRecorder, read_session
+
+
+def record_session(path, frames=5):
+    recorder = SessionRecorder(path, chunk_frames=2)
+    for i in range(frames):
+        recorder.write(np.full((4, 6, 3), i, dtype=np.uint8), ts=i / 30.0)
+    recorder.close()
+
+
+def test_replay_source_flags_end_of_session(tmp_path):
+    path = tmp_path / "s.gcs"
+    record_session(path, frames=3)
+    source = ReplaySource(path, realtime=False)
+    assert [source.read()[0] for _ in range(3)] == [True, True, True]
+    assert not source.at_end
+    assert source.read() == (False, None)
+    assert source.at_end
+
+
+def test_looping_replay_never_ends(tmp_path):
+    path = tmp_path / "s.gcs"
+    record_session(path, frames=2)
+    source = ReplaySource(path, realtime=False, loop=True)
+    assert all(source.read()[0] for _ in range(5))
+    assert not source.at_end
+
+
+def test_grabber_stops_at_end_of_stream_after_last_frame(tmp_path):
+    path = tmp_path / "s.gcs"
+    record_session(path, frames=5)
+    source = ReplaySource(path, realtime=False)
+    failures = []
+    ended = threading.Event()
+
+    def read(image=None):
+        ret, frame = source.read()
+        if not ret and source.at_end:
+            raise EndOfStream()
+        return ret, frame
+
+    grabber = FrameGrabber(read, on_failure=lambda: failures.append(1), lossless=True, on_eof=ended.set)
+    grabber.start()
+    values = []
+    while True:
+        latest = grabber.latest(timeout=1.0)
+        if latest is None:
+            break
+        values.append(int(latest[1][0, 0, 0]))
+    assert ended.wait(1.0)
+    assert grabber.finished and not grabber.running
+    assert values == [0, 1, 2, 3, 4]
+    assert failures == []
+    grabber.stop()
+
+
+def test_truncated_last_chunk_ends_the_replay_cleanly(tmp_path):
+    path = tmp_path / "s.gcs"
+    record_session(path, frames=5)  # chunks of 2, 2 and 1 frames
+    data = path.read_bytes()
+    path.write_bytes(data[:-5])  # recorder killed while writing the last chunk
+    source = ReplaySource(path, realtime=False)
+    values = []
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        values.append(int(frame[0, 0, 0]))
+    assert values == [0, 1, 2, 3]
+    assert source.at_end
+
+
+def test_truncated_chunk_header_ends_the_session(tmp_path):
+    path = tmp_path / "s.gcs"
+    record_session(path, frames=2)
+    with open(path, "ab") as fh:
+        fh.write(b"CHN")
+    assert [int(frame[0, 0, 0]) for _, frame in read_session(path)] == [0, 1]
+
+
+def test_grabber_ends_when_the_source_raises():
+    ended = threading.Event()
+
+    def read(image=None):
+        raise OSError("device gone")
+
+    grabber = FrameGrabber(read, on_eof=ended.set)
+    grabber.start()
+    assert ended.wait(1.0)
+    assert grabber.finished and grabber.latest(timeout=0.1) is None
@@ -0,0 +1,94 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from gesture_controller_v2.src.services.shared_frame_ring import (
+    HEADER,
+    SLOT_HEADER,
+    SharedFrameRing,
+    SharedFrameRingReader,
+    SharedRingLoop,
+)
+from gesture_controller_v2.src.services.session_recorder import SessionRecorder, read_session
+
+
+@pytest.fixture
+def ring_name(request):
+    return f"gc_test_{os.getpid()}_{request.node.name}"[:30]
+
+
+def hands(max_hands=2):
+    return (
+        np.zeros((max_hands, 21, 3), dtype=np.float32),
+        np.full(max_hands, -1, dtype=np.int8),
+        np.zeros(max_hands, dtype=np.float32),
+    )
+
+
+def publish(ring, value, shape=None):
+    frame = np.full(shape or ring.shape, value, dtype=np.uint8)
+    ring.publish(frame, *hands(), 0, float(value))
+
+
+def test_publish_rejects_other_shapes_without_leaving_the_slot_odd(ring_name):
+    ring = SharedFrameRing(ring_name, (4, 6, 3), slots=2)
+    reader = SharedFrameRingReader(ring_name)
+    try:
+        publish(ring, 1)
+        with pytest.raises(ValueError):
+            publish(ring, 2, shape=(8, 12, 3))
+        assert ring.write_seq == 1
+        for slot in range(ring.slots):
+            seq = SLOT_HEADER.unpack_from(ring.shm.buf, HEADER.size + slot * ring._views.slot_size)[0]
+            assert seq % 2 == 0
+        seq, frame, _ = reader.read()
+        assert seq == 1 and frame[0, 0, 0] == 1
+        publish(ring, 3)
+        seq, frame, _ = reader.read()
+        assert seq == 2 and frame[0, 0, 0] == 3
+    finally:
+        reader.close()
+        ring.close()
+
+
+def test_readers_see_a_retired_ring_and_reattach_at_the_new_shape(ring_name):
+    ring = SharedFrameRing(ring_name, (4, 6, 3), slots=2)
+    reader = SharedFrameRingReader(ring_name)
+    publish(ring, 1)
+    assert reader.read()[0] == 1
+
+    ring.close()
+    ring = SharedFrameRing(ring_name, (8, 12, 3), slots=2)
+    try:
+        publish(ring, 5)
+        assert reader.read() is None and reader.retired
+        reader.close()
+        reader = SharedFrameRingReader(ring_name)
+        seq, frame, _ = reader.read()
+        assert frame.shape == (8, 12, 3) and frame[0, 0, 0] == 5
+    finally:
+        reader.close()
+        ring.close()
+
+
+def test_ring_recording_replays_like_a_camera_recording(ring_name, tmp_path):
+    ring = SharedFrameRing(ring_name, (4, 6, 3), slots=2)
+    path = tmp_path / "ring.gcs"
+    loop = SharedRingLoop(ring_name, recorder=SessionRecorder(path))
+    camera = np.arange(4 * 6 * 3, dtype=np.uint8).reshape(4, 6, 3)
+    mirrored = np.ascontiguousarray(camera[:, ::-1])  # what CameraLoop publishes
+    try:
+        assert loop.start()
+        ring.publish(mirrored, *hands(), 0, 1.0)
+        deadline = time.monotonic() + 2.0
+        while loop.reader is None or loop.reader.frames_read == 0:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        loop.stop()
+        ring.close()
+    ((ts, frame),) = list(read_session(path))
+    assert ts == 1.0
+    np.testing.assert_array_equal(frame, camera)
@@ -0,0 +1,12 @@
+from gesture_controller_v2.src.train import holdout_split
+
+
+def test_holdout_is_the_tail_of_every_store():
+    val, train = holdout_split([10, 0, 5], 0.2)
+    assert val.tolist() == [8, 9, 14]
+    assert train.tolist() == [0, 1, 2, 3, 4, 5, 6, 7, 10, 11, 12, 13]
+
+
+def test_no_holdout():
+    val, train = holdout_split([4, 3], 0.0)
+    assert val.tolist() == [] and train.tolist() == list(range(7))
@@ -13,8 +13,12 @@ class CommandRouter:
         self.pipeline = pipeline
 
     def route_command(
-        self, action: str, payload: Optional[Dict[str, Any]] = None, source: str = "manual"
+        self,
+        action: str,
+        payload: Optional[Dict[str, Any]] = None,
+        source: str = "manual",
+        trace: Optional[Dict[str, float]] = None,
     ) -> Dict[str, object]:
-        command = RenderCommand(action=action, payload=payload, source=source)
+        command = RenderCommand(action=action, payload=payload, source=source, trace=trace)
         return self.pipeline.apply_command(command)
 
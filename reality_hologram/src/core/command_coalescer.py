@@ -0,0 +1,155 @@
+"""Merges bursts of same-kind viewer commands before they hit the transport.
+
+Commands are held for at most ``window`` seconds (one viewer frame by
+default) and merged per kind without changing their accumulated effect:
+
+- rotate: degrees summed per axis
+- zoom: camera factors multiplied (split when a viewer clamp would apply)
+- move: only the latest direction is kept
+
+Any other command is a barrier: pending merges are flushed first so the
+viewer still sees everything in order.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from ..utils.latency import mark
+
+Command = Dict[str, object]
+MergePolicy = Callable[[Command, Command], Optional[Command]]
+
+# Viewer camera zoom: factor applied to the follow offset for a zoom delta.
+ZOOM_MIN_FACTOR = 0.3
+ZOOM_MAX_FACTOR = 3.0
+
+
+def zoom_factor(delta: float) -> float:
+    if delta >= 0:
+        return max(ZOOM_MIN_FACTOR, 1.0 - delta * 0.5)  # acercar
+    return min(ZOOM_MAX_FACTOR, 1.0 + abs(delta) * 0.5)  # alejar
+
+
+def zoom_delta(factor: float) -> float:
+    """Inverse of ``zoom_factor`` inside the clamps."""
+    return 2.0 * (1.0 - factor) if factor <= 1.0 else -2.0 * (factor - 1.0)
+
+
+def _merged(first: Command, last: Command, payload: Dict[str, object]) -> Command:
+    # The oldest trace is kept: the merged command is as late as its first gesture.
+    data = dict(last, payload=payload)
+    if first.get("trace") is not None:
+        data["trace"] = first["trace"]
+    return data
+
+
+def merge_rotate(first: Command, last: Command) -> Optional[Command]:
+    a, b = first.get("payload") or {}, last.get("payload") or {}
+    if a.get("axis", "y") != b.get("axis", "y"):
+        return None
+    degrees = float(a.get("degrees", 0.0)) + float(b.get("degrees", 0.0))
+    return _merged(first, last, dict(b, degrees=degrees))
+
+
+def merge_zoom(first: Command, last: Command) -> Optional[Command]:
+    a, b = first.get("payload") or {}, last.get("payload") or {}
+    factor = zoom_factor(float(a.get("delta", 0.0))) * zoom_factor(float(b.get("delta", 0.0)))
+    if not ZOOM_MIN_FACTOR <= factor <= ZOOM_MAX_FACTOR:
+        return None  # one command would be clamped by the viewer; send them separately
+    return _merged(first, last, dict(b, delta=zoom_delta(factor)))
+
+
+def merge_latest(first: Command, last: Command) -> Optional[Command]:
+    return last
+
+
+DEFAULT_POLICIES: Dict[str, MergePolicy] = {
+    "rotate": merge_rotate,
+    "zoom": merge_zoom,
+    "move": merge_latest,
+}
+
+
+class CommandCoalescer:
+    """Buffers commands for ``window`` seconds and emits the merged result.
+
+    ``emit`` is called with the same dicts ``submit`` receives, in order,
+    from the submitting thread (barriers) or from a flush thread. A
+    ``window`` of 0 passes everything straight through.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[[Command], None],
+        window: float = 1.0 / 60.0,
+        policies: Optional[Dict[str, MergePolicy]] = None,
+    ):
+        self.emit = emit
+        self.window = window
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self.pending: Dict[str, Command] = {}  # action -> merged command, in order of first arrival
+        self.submitted = 0
+        self.emitted = 0
+        self._deadline: Optional[float] = None
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, data: Command):
+        action = str(data.get("action"))
+        merge = self.policies.get(action)
+        with self._cond:
+            self.submitted += 1
+            if self.window <= 0:
+                self._emit(data)
+                return
+            if merge is None:
+                self._flush_locked()
+                self._emit(data)
+                return
+            current = self.pending.get(action)
+            merged = merge(current, data) if current is not None else None
+            if merged is not None:
+                self.pending[action] = merged
+                return
+            if current is not None:
+                self._emit(self.pending.pop(action))
+            self.pending[action] = data
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.window
+                self._ensure_thread()
+                self._cond.notify()
+
+    def flush(self):
+        with self._cond:
+            self._flush_locked()
+
+    def stats(self):
+        return {"submitted": self.submitted, "emitted": self.emitted, "merged": self.submitted - self.emitted}
+
+    def _flush_locked(self):
+        while self.pending:
+            self._emit(self.pending.pop(next(iter(self.pending))))
+        self._deadline = None
+
+    def _emit(self, data: Command):
+        mark(data.get("trace"), "coalesce")
+        self.emitted += 1
+        self.emit(data)
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="CommandCoalescer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        with self._cond:
+            while True:
+                if self._deadline is None:
+                    self._cond.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                self._flush_locked()
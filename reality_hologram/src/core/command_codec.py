@@ -0,0 +1,112 @@
+"""Compact binary wire format for viewer commands, with JSON as the fallback.
+
+A binary record is::
+
+    header   magic 0xB1, action code, seq (u32), ts (f64, time.monotonic)
+    payload  fixed struct per action (see PAYLOADS)
+    trace    stage count (u8), then (stage code u8, perf_counter f64) pairs
+
+Anything the tables do not cover (unknown actions, stages, extra payload
+keys or values) is sent as UTF-8 JSON instead. JSON always starts with
+``{``, so ``decode_command`` tells the two apart from the first byte and
+both sides can mix them freely.
+"""
+
+import json
+import struct
+from typing import Callable, Dict, Optional, Tuple
+
+Command = Dict[str, object]
+
+MAGIC = 0xB1
+HEADER = struct.Struct("<BBId")
+TRACE_COUNT = struct.Struct("<B")
+TRACE_STAMP = struct.Struct("<Bd")
+
+ACTIONS = ("move", "rotate", "zoom", "accelerate", "pause", "resume")
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+DIRECTIONS = ("stop", "forward", "back")
+AXES = ("x", "y", "z")
+TARGETS = ("actor",)
+# Pipeline stages in utils.latency traces. A stage's code is its index, so
+# new stages are appended (codes must not change under a running viewer).
+STAGES = ("grab", "flip", "infer", "ring", "classify", "send", "coalesce", "write", "apply", "dispatch")
+STAGE_CODES = {name: code for code, name in enumerate(STAGES)}
+
+
+def _enum(values: Tuple[str, ...]):
+    """(encode, decode) pair mapping names to their index in ``values``."""
+    codes = {name: code for code, name in enumerate(values)}
+    return codes.__getitem__, values.__getitem__
+
+
+_direction, _axis, _target = _enum(DIRECTIONS), _enum(AXES), _enum(TARGETS)
+_float = (float, float)
+# action -> (struct, ordered payload keys, (encode, decode) per key)
+PAYLOADS: Dict[str, Tuple[struct.Struct, Tuple[str, ...], Tuple[Tuple[Callable, Callable], ...]]] = {
+    "move": (struct.Struct("<Bf"), ("direction", "speed"), (_direction, _float)),
+    "rotate": (struct.Struct("<Bf"), ("axis", "degrees"), (_axis, _float)),
+    "zoom": (struct.Struct("<f"), ("delta",), (_float,)),
+    "accelerate": (struct.Struct("<f"), ("factor",), (_float,)),
+    "pause": (struct.Struct("<B"), ("target",), (_target,)),
+    "resume": (struct.Struct("<B"), ("target",), (_target,)),
+}
+
+
+def encode_command(data: Command) -> bytes:
+    """Binary when the command fits the tables, compact JSON otherwise."""
+    try:
+        return _encode_binary(data)
+    except (KeyError, IndexError, TypeError, ValueError, struct.error):
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def decode_command(raw: bytes) -> Command:
+    """Inverse of ``encode_command``; raises ValueError on garbage."""
+    if raw[:1] == b"{":
+        return json.loads(raw)
+    try:
+        return _decode_binary(raw)
+    except (IndexError, struct.error) as exc:
+        raise ValueError(f"Malformed command record: {exc}") from exc
+
+
+def _encode_binary(data: Command) -> bytes:
+    action = data["action"]
+    layout, keys, codecs = PAYLOADS[action]
+    payload = data.get("payload") or {}
+    if set(payload) - set(keys):
+        raise ValueError("payload has keys without a binary field")
+    values = [encode(payload[key]) for key, (encode, _) in zip(keys, codecs)]
+    parts = [
+        HEADER.pack(MAGIC, ACTION_CODES[action], int(data.get("seq", 0)) & 0xFFFFFFFF, float(data.get("ts", 0.0))),
+        layout.pack(*values),
+    ]
+    trace: Optional[Dict[str, float]] = data.get("trace")
+    parts.append(TRACE_COUNT.pack(len(trace) if trace else 0))
+    for stage, stamp in (trace or {}).items():
+        parts.append(TRACE_STAMP.pack(STAGE_CODES[stage], stamp))
+    return b"".join(parts)
+
+
+def _decode_binary(raw: bytes) -> Command:
+    magic, code, seq, ts = HEADER.unpack_from(raw, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Unknown command record type 0x{magic:02x}")
+    action = ACTIONS[code]
+    layout, keys, codecs = PAYLOADS[action]
+    offset = HEADER.size
+    values = layout.unpack_from(raw, offset)
+    offset += layout.size
+    payload = {key: decode(value) for key, (_, decode), value in zip(keys, codecs, values)}
+    data: Command = {"action": action, "payload": payload, "ts": ts, "seq": seq}
+    (count,) = TRACE_COUNT.unpack_from(raw, offset)
+    offset += TRACE_COUNT.size
+    if count:
+        trace = {}
+        for _ in range(count):
+            stage, stamp = TRACE_STAMP.unpack_from(raw, offset)
+            trace[STAGES[stage]] = stamp
+            offset += TRACE_STAMP.size
+        data["trace"] = trace
+    return data
@@ -0,0 +1,35 @@
+"""In-memory command hand-off for a viewer running in the same process."""
+
+import collections
+from typing import Deque, Dict, List
+
+Command = Dict[str, object]
+
+
+class CommandQueue:
+    """Bounded queue between RealityPipeline (any thread) and the viewer's frame task.
+
+    Commands stay as dicts: no encoding, no syscalls. deque append/popleft
+    are atomic, so producers and the Panda3D task need no lock. When the
+    viewer stalls the oldest commands are dropped and counted.
+    """
+
+    def __init__(self, maxlen: int = 1024):
+        self._items: Deque[Command] = collections.deque(maxlen=maxlen)
+        self.put_count = 0
+        self.dropped = 0
+
+    def put(self, data: Command):
+        if len(self._items) == self._items.maxlen:
+            self.dropped += 1
+        self._items.append(data)
+        self.put_count += 1
+
+    def drain(self) -> List[Command]:
+        out = []
+        while self._items:
+            out.append(self._items.popleft())
+        return out
+
+    def stats(self):
+        return {"put": self.put_count, "dropped": self.dropped, "pending": len(self._items)}
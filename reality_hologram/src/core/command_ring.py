@@ -0,0 +1,149 @@
+"""Shared-memory ring of command records between RealityPipeline and the viewer.
+
+Replaces the ``.commands.json`` hand-off: every command gets its own
+fixed-size record with a sequence number, the producer never blocks and
+the viewer drains everything pending once per frame, so bursts are not
+lost and no file is touched per frame.
+
+Layout::
+
+    header   magic, slots, record_size, write_seq, read_seq
+    record   seq (odd while being written), length, payload bytes
+
+Both sides open-or-create the segment by name and neither unlinks it, so
+the viewer and the gesture controller can start in any order and restart
+independently (``write_seq`` lives in the segment). One producer process
+at a time; readers see overwritten records as gaps, never torn data.
+"""
+
+import logging
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import List
+
+log = logging.getLogger(__name__)
+
+DEFAULT_NAME = "reality_hologram_commands"
+MAGIC = 0x52484331  # "RHC1"
+# magic, slots, record_size, reserved, write_seq, read_seq
+HEADER = struct.Struct("<IIIIQQ")
+WRITE_SEQ = 16
+READ_SEQ = 24
+DATA_OFFSET = 64
+# seq, payload length, reserved
+RECORD_HEADER = struct.Struct("<QII")
+
+
+def _untrack(shm: shared_memory.SharedMemory):
+    # The segment outlives both processes; keep the resource tracker from
+    # unlinking it when the process that created it exits.
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")  # noqa: SLF001
+    except Exception:
+        pass
+
+
+class CommandRing:
+    """Fixed-size command records in shared memory; ``write`` on one side, ``drain`` on the other."""
+
+    def __init__(self, name: str = DEFAULT_NAME, slots: int = 256, record_size: int = 512):
+        self.name = name
+        size = DATA_OFFSET + slots * record_size
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            HEADER.pack_into(self.shm.buf, 0, MAGIC, slots, record_size, 0, 0, 0)
+        except FileExistsError:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self._wait_ready()
+        _untrack(self.shm)
+        magic, self.slots, self.record_size, _, write_seq, _ = HEADER.unpack_from(self.shm.buf, 0)
+        if magic != MAGIC:
+            self.shm.close()
+            raise ValueError(f"Shared memory '{name}' is not a command ring")
+        self.capacity = self.record_size - RECORD_HEADER.size
+        # Readers start at the present: commands sent before the viewer opened are stale.
+        self.cursor = write_seq
+        self.written = 0
+        self.overruns = 0
+        self.drained = 0
+        self.missed = 0
+
+    def _wait_ready(self, timeout: float = 1.0):
+        # The creator writes the header right after creating the segment.
+        deadline = time.monotonic() + timeout
+        while struct.unpack_from("<I", self.shm.buf, 0)[0] == 0 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    def write(self, data: bytes):
+        """Append one record; raises ValueError if it does not fit in a record."""
+        if len(data) > self.capacity:
+            raise ValueError(f"Command of {len(data)} bytes exceeds the {self.capacity}-byte record")
+        buf = self.shm.buf
+        n, read_seq = struct.unpack_from("<QQ", buf, WRITE_SEQ)
+        if n - read_seq >= self.slots:
+            # No viewer is draining (closed, stalled or only socket viewers): the oldest unread record is lost.
+            self.overruns += 1
+            if self.overruns == 1:
+                log.info("Command ring '%s' full; no viewer is draining it, overwriting old commands", self.name)
+        base = DATA_OFFSET + (n % self.slots) * self.record_size
+        RECORD_HEADER.pack_into(buf, base, 2 * n + 1, len(data), 0)  # odd: write in progress
+        start = base + RECORD_HEADER.size
+        buf[start : start + len(data)] = data
+        RECORD_HEADER.pack_into(buf, base, 2 * n + 2, len(data), 0)
+        struct.pack_into("<Q", buf, WRITE_SEQ, n + 1)
+        self.written += 1
+
+    def drain(self) -> List[bytes]:
+        """Every record written since the last drain, oldest first."""
+        buf = self.shm.buf
+        n = struct.unpack_from("<Q", buf, WRITE_SEQ)[0]
+        if n < self.cursor:
+            self.cursor = n  # segment recreated under us
+        if n - self.cursor > self.slots:
+            self.missed += n - self.cursor - self.slots
+            self.cursor = n - self.slots
+        out: List[bytes] = []
+        while self.cursor < n:
+            expected = 2 * self.cursor + 2
+            base = DATA_OFFSET + (self.cursor % self.slots) * self.record_size
+            seq, length, _ = RECORD_HEADER.unpack_from(buf, base)
+            if seq == expected:
+                start = base + RECORD_HEADER.size
+                data = bytes(buf[start : start + length])
+                if RECORD_HEADER.unpack_from(buf, base)[0] == expected:
+                    out.append(data)
+                else:
+                    self.missed += 1  # lapped while copying
+            else:
+                self.missed += 1
+            self.cursor += 1
+        struct.pack_into("<Q", buf, READ_SEQ, self.cursor)
+        self.drained += len(out)
+        return out
+
+    def stats(self):
+        return {
+            "written": self.written,
+            "overruns": self.overruns,
+            "drained": self.drained,
+            "missed": self.missed,
+        }
+
+    def close(self):
+        self.shm.close()
+
+    def unlink(self):
+        """Remove the segment (both sides normally leave it in place)."""
+        try:
+            from multiprocessing import resource_tracker
+
+            resource_tracker.register(self.shm._name, "shared_memory")  # noqa: SLF001 (unlink unregisters it)
+        except Exception:
+            pass
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,343 @@
+"""Local-socket command transport: viewers listen, pipelines fan out to all of them.
+
+A viewer started with ``--listen`` runs a ``CommandServer`` (asyncio, Unix
+domain socket; TCP on localhost where AF_UNIX is unavailable) and drops an
+``<name>.endpoint`` file in ``endpoint_dir()``. ``CommandFanout`` on the
+pipeline side picks up every endpoint file and keeps one connection per
+viewer, so one gesture controller drives any number of pyramids. Endpoint
+files whose viewer is gone (socket missing or refusing connections) are
+removed by the fan-out.
+
+Frames are a 4-byte little-endian length followed by the encoded command.
+Each viewer link has its own bounded queue: a slow or stalled viewer only
+loses its own oldest commands and never blocks the controller or the
+other viewers. Dropped connections are retried with backoff.
+"""
+
+import asyncio
+import collections
+import logging
+import os
+import socket
+import struct
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+FRAME = struct.Struct("<I")
+MAX_FRAME = 1 << 20
+HAS_UNIX_SOCKETS = hasattr(socket, "AF_UNIX") and sys.platform != "win32"
+
+
+def endpoint_dir() -> Path:
+    """Where listening viewers publish their endpoints (``REALITY_HOLOGRAM_ENDPOINTS`` overrides)."""
+    override = os.environ.get("REALITY_HOLOGRAM_ENDPOINTS")
+    return Path(override) if override else Path(tempfile.gettempdir()) / "reality_hologram"
+
+
+def default_endpoint(name: str) -> str:
+    if HAS_UNIX_SOCKETS:
+        return f"unix:{endpoint_dir() / (name + '.sock')}"
+    return "tcp:127.0.0.1:0"  # port picked by the OS and published in the endpoint file
+
+
+def parse_endpoint(text: str) -> Tuple[str, object]:
+    """``unix:PATH``, ``tcp:HOST:PORT``, a bare ``HOST:PORT`` or a bare socket path."""
+    if text.startswith("unix:"):
+        return "unix", text[5:]
+    if text.startswith("tcp:"):
+        text = text[4:]
+    elif HAS_UNIX_SOCKETS and not _looks_like_tcp(text):
+        return "unix", text
+    host, _, port = text.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+def _looks_like_tcp(text: str) -> bool:
+    return ":" in text and "/" not in text and text.rsplit(":", 1)[1].isdigit()
+
+
+def encode_frame(data: bytes) -> bytes:
+    return FRAME.pack(len(data)) + data
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    (length,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+    if length > MAX_FRAME:
+        raise ValueError(f"Command frame of {length} bytes")
+    return await reader.readexactly(length)
+
+
+class _LoopThread:
+    """An asyncio loop on a daemon thread (Panda3D and Qt own the main thread)."""
+
+    def __init__(self, name: str):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self.thread.start()
+
+    def run(self, coro, timeout: Optional[float] = None):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=1.0)
+
+
+class CommandServer:
+    """Viewer side: accepts any number of senders; ``drain`` is called once per frame."""
+
+    def __init__(self, endpoint: Optional[str] = None, name: Optional[str] = None, max_pending: int = 4096):
+        self.name = name or f"viewer-{os.getpid()}"
+        self.endpoint = endpoint or default_endpoint(self.name)
+        # deque append/popleft are atomic, so the loop thread and the render thread share it without a lock.
+        self.pending: Deque[bytes] = collections.deque(maxlen=max_pending)
+        self.address: Optional[str] = None
+        self.clients = 0
+        self.received = 0
+        self._loop: Optional[_LoopThread] = None
+        self._server = None
+        self._handlers: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._socket_path: Optional[Path] = None
+        self._endpoint_file = endpoint_dir() / f"{self.name}.endpoint"
+
+    def start(self) -> str:
+        """Bind and publish the endpoint; returns the address senders should use."""
+        self._loop = _LoopThread(f"CommandServer-{self.name}")
+        try:
+            self.address = self._loop.run(self._listen(), timeout=5.0)
+        except Exception:
+            self._loop.stop()
+            raise
+        self._endpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        self._endpoint_file.write_text(self.address, encoding="utf-8")
+        log.info("Listening for commands on %s", self.address)
+        return self.address
+
+    async def _listen(self) -> str:
+        kind, addr = parse_endpoint(self.endpoint)
+        if kind == "unix":
+            path = Path(addr)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if path.exists():
+                path.unlink()  # left behind by a viewer that crashed
+            self._server = await asyncio.start_unix_server(self._handle, path=str(path))
+            self._socket_path = path
+            return f"unix:{path}"
+        host, port = addr
+        self._server = await asyncio.start_server(self._handle, host, port)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"tcp:{host}:{port}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.clients += 1
+        self._handlers[asyncio.current_task()] = writer
+        try:
+            while True:
+                self.pending.append(await read_frame(reader))
+                self.received += 1
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.clients -= 1
+            self._handlers.pop(asyncio.current_task(), None)
+            writer.close()
+
+    async def _shutdown(self):
+        if self._server is not None:
+            self._server.close()
+        # Closing the sockets ends each handler's read with EOF.
+        handlers = list(self._handlers.items())
+        for _, writer in handlers:
+            writer.close()
+        await asyncio.gather(*(task for task, _ in handlers), return_exceptions=True)
+
+    def drain(self) -> List[bytes]:
+        out = []
+        while self.pending:
+            out.append(self.pending.popleft())
+        return out
+
+    def stop(self):
+        if self._loop is None:
+            return
+        try:
+            self._loop.run(self._shutdown(), timeout=1.0)
+        except Exception:
+            pass
+        self._loop.stop()
+        self._loop = None
+        for path in (self._endpoint_file, self._socket_path):
+            try:
+                if path is not None:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class _ViewerLink:
+    """One viewer connection with its own bounded queue and reconnect loop."""
+
+    def __init__(self, endpoint: str, queue_size: int):
+        self.endpoint = endpoint
+        self.queue: Deque[bytes] = collections.deque(maxlen=queue_size)
+        self.ready = asyncio.Event()
+        self.connected = False
+        self.closed = False
+        self.dead = False  # nothing listens at the endpoint (refused / socket gone)
+        self.sent = 0
+        self.dropped = 0
+        self.reconnects = 0
+
+    def put(self, data: bytes):
+        if not self.connected:
+            return  # nothing is replayed on reconnect: those commands would be stale
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1  # viewer too slow; lose its oldest command, not everyone's time
+        self.queue.append(data)
+        self.ready.set()
+
+    async def run(self):
+        backoff = 0.1
+        while not self.closed:
+            writer = None
+            try:
+                kind, addr = parse_endpoint(self.endpoint)
+                if kind == "unix":
+                    _, writer = await asyncio.open_unix_connection(addr)
+                else:
+                    _, writer = await asyncio.open_connection(*addr)
+                self.connected = True
+                self.dead = False
+                backoff = 0.1
+                log.info("Connected to viewer %s", self.endpoint)
+                while not self.closed:
+                    await self.ready.wait()
+                    self.ready.clear()
+                    while self.queue:
+                        writer.write(encode_frame(self.queue.popleft()))
+                        self.sent += 1
+                    await writer.drain()  # flow control: only this link waits
+            except (ConnectionRefusedError, FileNotFoundError) as exc:
+                if self.connected:
+                    log.info("Viewer %s disconnected: %s", self.endpoint, exc)
+                self.dead = True
+            except (OSError, ValueError) as exc:
+                if self.connected:
+                    log.info("Viewer %s disconnected: %s", self.endpoint, exc)
+            finally:
+                if writer is not None:
+                    writer.close()
+                if self.connected:
+                    self.reconnects += 1
+                self.connected = False
+                self.queue.clear()
+            if not self.closed:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2.0, 2.0)
+
+    def close(self):
+        self.closed = True
+        self.ready.set()
+
+
+class CommandFanout:
+    """Pipeline side: sends every command to all listening viewers.
+
+    Viewers are the fixed ``endpoints`` plus, with ``discover``, every
+    endpoint file found in ``endpoint_dir()`` (rescanned each
+    ``scan_interval`` seconds). ``send`` is thread-safe and never blocks.
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[str] = (),
+        discover: bool = True,
+        queue_size: int = 256,
+        scan_interval: float = 1.0,
+    ):
+        self.static_endpoints = list(endpoints)
+        self.discover = discover
+        self.queue_size = queue_size
+        self.scan_interval = scan_interval
+        self.links: Dict[str, _ViewerLink] = {}
+        self._loop: Optional[_LoopThread] = None
+        self._lock = threading.Lock()
+
+    def send(self, data: bytes):
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    self._loop = _LoopThread("CommandFanout")
+                    self._loop.loop.call_soon_threadsafe(self._loop.loop.create_task, self._watch())
+        self._loop.loop.call_soon_threadsafe(self._broadcast, data)
+
+    def _broadcast(self, data: bytes):
+        for link in self.links.values():
+            link.put(data)
+
+    async def _watch(self):
+        while True:
+            discovered = self._discovered() if self.discover else {}
+            for endpoint, path in list(discovered.items()):
+                link = self.links.get(endpoint)
+                if link is not None and link.dead and endpoint not in self.static_endpoints:
+                    self._prune(endpoint, path)  # viewer crashed and left its socket file behind
+                    del discovered[endpoint]
+            wanted = set(self.static_endpoints) | set(discovered)
+            for endpoint in wanted - self.links.keys():
+                link = self.links[endpoint] = _ViewerLink(endpoint, self.queue_size)
+                asyncio.get_running_loop().create_task(link.run())
+            for endpoint in self.links.keys() - wanted:
+                self.links.pop(endpoint).close()
+            await asyncio.sleep(self.scan_interval)
+
+    @classmethod
+    def _discovered(cls) -> Dict[str, Path]:
+        """endpoint -> its file, skipping (and removing) files whose Unix socket is gone."""
+        found = {}
+        for path in endpoint_dir().glob("*.endpoint"):
+            try:
+                endpoint = path.read_text(encoding="utf-8").strip()
+            except OSError:
+                continue  # removed while scanning
+            kind, addr = parse_endpoint(endpoint)
+            if kind == "unix" and not os.path.exists(addr):
+                cls._prune(endpoint, path)
+                continue
+            found[endpoint] = path
+        return found
+
+    @staticmethod
+    def _prune(endpoint: str, path: Path):
+        """Remove the endpoint file of a viewer that is no longer there."""
+        try:
+            if path.read_text(encoding="utf-8").strip() != endpoint:
+                return  # a restarted viewer published a new address meanwhile
+            path.unlink()
+        except OSError:
+            return
+        log.info("Removed stale viewer endpoint %s (%s)", path.name, endpoint)
+
+    def stats(self):
+        return {
+            endpoint: {
+                "connected": link.connected,
+                "sent": link.sent,
+                "dropped": link.dropped,
+                "reconnects": link.reconnects,
+            }
+            for endpoint, link in self.links.items()
+        }
+
+    def close(self):
+        if self._loop is None:
+            return
+        for link in self.links.values():
+            self._loop.loop.call_soon_threadsafe(link.close)
+        self._loop.stop()
+        self._loop = None
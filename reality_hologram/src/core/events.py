@@ -11,6 +11,7 @@ class RenderCommand:
     action: str
     payload: Optional[Dict[str, object]] = None
     source: str = "gesture_controller"
+    trace: Optional[Dict[str, float]] = None  # stage -> perf_counter, see utils.latency
 
 
 @dataclass
@@ -2,24 +2,69 @@
 
 from pathlib import Path
 from typing import Dict, Optional
-import json
+import logging
 import time
 
 from ..rendering.camera_rig import CameraRig
 from ..rendering.pepper_renderer import PepperRenderer
 from ..rendering.scene_manager import SceneManager
+from ..utils.latency import mark
+from .command_codec import encode_command
+from .command_coalescer import CommandCoalescer
+from .command_queue import CommandQueue
+from .command_ring import DEFAULT_NAME, CommandRing
+from .command_socket import CommandFanout
 from .events import RenderCommand
+from .service_container import get_services
+
+log = logging.getLogger(__name__)
 
 
 class RealityPipeline:
     """Bridge between gesture intents and the hologram renderer output."""
 
-    def __init__(self, asset_root: Optional[Path] = None):
-        self.scene_manager = SceneManager(asset_root=asset_root)
-        self.camera_rig = CameraRig()
-        self.renderer = PepperRenderer()
+    def __init__(
+        self,
+        asset_root: Optional[Path] = None,
+        command_ring: str = DEFAULT_NAME,
+        fanout: Optional[CommandFanout] = None,
+        coalesce_window: float = 1.0 / 60.0,
+        command_queue: Optional[CommandQueue] = None,
+    ):
+        # Scene registry, rig and renderer come from the process-wide container
+        # on first use (a custom ``asset_root`` gets its own SceneManager).
+        self.asset_root = asset_root
+        self._scene_manager: Optional[SceneManager] = None
         self.current_scene: Optional[Dict[str, object]] = None
-        self.command_file = Path(__file__).resolve().parents[2] / ".commands.json"
+        # Viewer in this same process (embedded mode): commands skip the ring.
+        self.command_queue = command_queue
+        # Shared-memory ring drained by the viewer; opened on the first command.
+        self.command_ring_name = command_ring
+        self.command_ring: Optional[CommandRing] = None
+        # Viewers listening on a local socket (``viewer --listen``), one link each.
+        # Opt-in: the fan-out runs its own thread and endpoint scan.
+        self.fanout = fanout
+        # Same-kind commands within one viewer frame go out as one (0 disables).
+        self.coalescer = CommandCoalescer(self._write_command, window=coalesce_window)
+        self._seq = 0
+
+    @property
+    def scene_manager(self) -> SceneManager:
+        if self._scene_manager is None:
+            if self.asset_root is None:
+                self._scene_manager = get_services().get("scene_manager")
+            else:
+                self._scene_manager = SceneManager(asset_root=self.asset_root)
+        return self._scene_manager
+
+    @property
+    def camera_rig(self) -> CameraRig:
+        return get_services().get("camera_rig")
+
+    @property
+    def renderer(self) -> PepperRenderer:
+        # One per process: Panda3D allows a single ShowBase.
+        return get_services().get("renderer")
 
     def apply_command(self, command: RenderCommand) -> Dict[str, object]:
         action = command.action.lower()
@@ -31,13 +76,18 @@ class RealityPipeline:
             return {"status": "scene_loaded", "scene": scene_id}
 
         if action in {"rotate", "zoom", "move", "pause", "resume", "accelerate"}:
-            self._write_command({"action": action, "payload": payload, "ts": time.time()})
+            data = {"action": action, "payload": payload, "ts": time.monotonic()}
+            if command.trace:
+                data["trace"] = command.trace
+            self.coalescer.submit(data)
             return {"status": "queued", "action": action, "payload": payload}
 
         if action == "render_frame":
             return self.render_frame()
 
         if action == "shutdown":
+            self.coalescer.flush()
+            log.info("Command coalescing: %s", self.coalescer.stats())
             self.current_scene = None
             return {"status": "stopped"}
 
@@ -50,7 +100,27 @@ class RealityPipeline:
         return self.renderer.render(scene_state, camera_views)
 
     def _write_command(self, data: Dict[str, object]) -> None:
+        # Stamped before the write so it travels with the command; the viewer's
+        # "apply" stage covers the hand-off and the wait for its next frame.
+        mark(data.get("trace"), "write")
+        self._seq += 1  # the coalescer serializes writes
+        data["seq"] = self._seq
+        encoded = encode_command(data)
+        if self.fanout is not None:
+            try:
+                self.fanout.send(encoded)
+            except Exception as exc:
+                log.warning("Could not send command %s to listening viewers: %s", data.get("action"), exc)
+        if self.command_queue is not None:
+            # Handed over last: the viewer thread stamps the trace when it applies it.
+            self.command_queue.put(data)
+            return
         try:
-            self.command_file.write_text(json.dumps(data), encoding="utf-8")
-        except Exception:
-            pass
+            if self.command_ring is None:
+                self.command_ring = CommandRing(self.command_ring_name)
+            if len(encoded) > self.command_ring.capacity and "trace" in data:
+                # Never drop a command for its diagnostics.
+                encoded = encode_command({key: value for key, value in data.items() if key != "trace"})
+            self.command_ring.write(encoded)
+        except Exception as exc:
+            log.warning("Could not send command %s to the viewer: %s", data.get("action"), exc)
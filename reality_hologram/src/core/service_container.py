@@ -0,0 +1,87 @@
+"""Process-wide, lazily built services shared by the GUI, CLI, pipeline and viewer.
+
+Scanning the asset folder (``ModelRegistry``) and creating a
+``PepperRenderer`` are the expensive parts of startup, and every entry point
+used to build its own. ``get_services().get(name)`` builds a service on
+first use and hands the same instance to everyone after that.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """Named factories, each called at most once (thread-safe)."""
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[["ServiceContainer"], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self.build_seconds: Dict[str, float] = {}
+        # Re-entrant: factories resolve their own dependencies through ``get``.
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[["ServiceContainer"], Any]):
+        """Add or replace a factory; a replaced service is rebuilt on next use."""
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            if name not in self._instances:
+                factory = self._factories.get(name)
+                if factory is None:
+                    raise KeyError(f"Unknown service '{name}'")
+                start = time.perf_counter()
+                self._instances[name] = factory(self)
+                self.build_seconds[name] = time.perf_counter() - start
+                log.debug("Built service %s in %.1f ms", name, self.build_seconds[name] * 1000.0)
+            return self._instances[name]
+
+    def is_built(self, name: str) -> bool:
+        return name in self._instances
+
+    def reset(self, name: Optional[str] = None):
+        """Forget one built service (or all of them); factories stay registered."""
+        with self._lock:
+            if name is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(name, None)
+
+
+def _default_container() -> ServiceContainer:
+    # Imported here: rendering imports core, and most processes never need all of them.
+    from ..rendering.camera_rig import CameraRig
+    from ..rendering.pepper_renderer import PepperRenderer
+    from ..rendering.scene_manager import SceneManager
+    from ..services.model_registry import ModelRegistry
+
+    container = ServiceContainer()
+    # The one watched registry: an inotify instance per process, not per SceneManager.
+    container.register("model_registry", lambda services: ModelRegistry(watch=True))
+    container.register("scene_manager", lambda services: SceneManager(registry=services.get("model_registry")))
+    container.register("camera_rig", lambda services: CameraRig())
+    container.register("renderer", lambda services: PepperRenderer())
+    return container
+
+
+_services: Optional[ServiceContainer] = None
+_services_lock = threading.Lock()
+
+
+def get_services() -> ServiceContainer:
+    """The container shared by everything in this process."""
+    global _services
+    if _services is None:
+        with _services_lock:
+            if _services is None:
+                _services = _default_container()
+    return _services
@@ -1,7 +1,8 @@
 """Loads 3D assets and prepares scene metadata."""
 
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 from ..services.model_registry import ModelRegistry
 from ..scenes.catalog import get_scene_config
@@ -10,32 +11,60 @@ from ..scenes.catalog import get_scene_config
 class SceneManager:
     """Tracks available assets and basic scene state."""
 
-    def __init__(self, asset_root: Optional[Path] = None):
-        self.registry = ModelRegistry(asset_root=asset_root)
+    def __init__(
+        self,
+        asset_root: Optional[Path] = None,
+        registry: Optional[ModelRegistry] = None,
+        miss_ttl: float = 5.0,
+    ):
+        self.asset_root = asset_root
+        self._registry = registry
+        # scene_id -> (expiry, registry generation): ids that did not resolve,
+        # so asking again does not rescan until the TTL runs out or assets change.
+        self.miss_ttl = miss_ttl
+        self._misses: Dict[str, Tuple[float, int]] = {}
+
+    @property
+    def registry(self) -> ModelRegistry:
+        # The asset scan runs on first lookup, not at construction.
+        if self._registry is None:
+            self._registry = ModelRegistry(asset_root=self.asset_root)
+        return self._registry
 
     def load(self, scene_id: str) -> Dict[str, object]:
         """Resolve a scene id to an asset path and return scene metadata."""
         config = get_scene_config(scene_id)
         candidate_ids = [config.get("asset_id") or scene_id, scene_id]
 
-        asset_path = None
-        asset_id = None
-        for candidate in candidate_ids:
-            asset_path = self.registry.resolve(candidate)
-            if asset_path:
-                asset_id = candidate
-                break
+        # Picks up assets copied while running (watcher events, or a periodic mtime check).
+        self.registry.refresh_changes()
+        asset_id, asset_path = self._resolve(candidate_ids)
 
-        if asset_path is None:
-            # Re-scan in case new assets were copied after startup.
+        if asset_path is None and not self._known_missing(scene_id):
+            # Re-scan in case a change slipped past the watcher.
             self.registry.refresh()
-            for candidate in candidate_ids:
-                asset_path = self.registry.resolve(candidate)
-                if asset_path:
-                    asset_id = candidate
-                    break
+            asset_id, asset_path = self._resolve(candidate_ids)
+            if asset_path is None:
+                self._misses[scene_id] = (time.monotonic() + self.miss_ttl, self.registry.generation)
 
         return {"id": scene_id, "asset_id": asset_id, "asset": asset_path, "config": config}
 
+    def _resolve(self, candidate_ids: List[str]):
+        for candidate in candidate_ids:
+            asset_path = self.registry.resolve(candidate)
+            if asset_path:
+                return candidate, asset_path
+        return None, None
+
+    def _known_missing(self, scene_id: str) -> bool:
+        miss = self._misses.get(scene_id)
+        if miss is None:
+            return False
+        expiry, generation = miss
+        if time.monotonic() >= expiry or generation != self.registry.generation:
+            self._misses.pop(scene_id, None)  # another thread may have dropped it already
+            return False
+        return True
+
     def list_available(self):
         return self.registry.list_available()
@@ -0,0 +1,242 @@
+"""Persistent index of the asset tree, revalidated by directory mtime.
+
+``ModelRegistry`` used to ``rglob`` the whole asset folder on every start.
+The index remembers, per directory, its mtime and the asset files it held
+(size, mtime, format). ``update`` stats every directory but only lists the
+ones whose mtime changed, so a warm start on an unchanged tree is one
+``stat`` per directory. Content hashes are computed on demand by ``info``
+and kept until the file's size or mtime changes.
+
+Adding, removing or renaming a file changes its directory's mtime; a file
+rewritten in place does not, so ``update(full=True)`` re-stats every file.
+``update(dirs=...)`` re-lists just the given directories (and any new
+subdirectories), for callers that know what changed (``AssetWatcher``).
+The index lives next to the asset folder; when that is not writable (a
+read-only install) it goes to a per-user cache directory instead. The JSON
+file is plain data other tools can read::
+
+    {"version": 1, "root": "...", "extensions": [".glb", ...],
+     "dirs": {"models/cars": {"mtime_ns": ..., "subdirs": [...],
+                              "files": {"car.glb": {"size": ..., "mtime_ns": ...,
+                                                    "format": "glb", "sha256": "..." (once asked for)}}}}}
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+VERSION = 1
+INDEX_NAME = ".asset_index.json"
+HASH_CHUNK = 1 << 20
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_index_path(asset_root: Path) -> Path:
+    """Next to the asset folder (``reality_hologram/.asset_index.json`` for the bundled one)."""
+    return asset_root.parent / INDEX_NAME
+
+
+def user_cache_dir() -> Path:
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "reality_hologram"
+
+
+def fallback_index_path(asset_root: Path) -> Path:
+    """Per-user cache location for asset folders that cannot hold their own index."""
+    key = hashlib.sha1(str(Path(asset_root).resolve()).encode("utf-8")).hexdigest()[:16]
+    return user_cache_dir() / f"asset_index-{key}.json"
+
+
+class AssetIndex:
+    """Directory-mtime keyed catalog of the asset files under ``root``."""
+
+    def __init__(self, root: Path, extensions: Iterable[str], path: Optional[Path] = None):
+        self.root = Path(root)
+        self.extensions = sorted(ext.lower() for ext in extensions)
+        self.path = Path(path) if path else default_index_path(self.root)
+        self.fallback_path = fallback_index_path(self.root)
+        self.dirs: Dict[str, Dict[str, object]] = {}
+        self.listed = 0  # directories listed by the last update (0 = nothing changed)
+        self.hashed = 0  # content hashes computed by info()
+        self._dirty = False
+        for candidate in (self.path, self.fallback_path):
+            if self._load(candidate):
+                break
+
+    def _load(self, path: Path) -> bool:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        same_tree = (
+            data.get("version") == VERSION
+            and data.get("root") == str(self.root.resolve())
+            and data.get("extensions") == self.extensions
+        )
+        if same_tree:
+            self.dirs = data.get("dirs") or {}
+        return same_tree
+
+    def save(self):
+        """Write the index if it changed (atomically), falling back to the user cache directory."""
+        if not self._dirty:
+            return
+        data = json.dumps(
+            {
+                "version": VERSION,
+                "root": str(self.root.resolve()),
+                "extensions": self.extensions,
+                "dirs": self.dirs,
+            },
+            separators=(",", ":"),
+        )
+        for path in dict.fromkeys((self.path, self.fallback_path)):
+            tmp = path.with_name(path.name + ".tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(data, encoding="utf-8")
+                os.replace(tmp, path)
+            except OSError as exc:
+                log.debug("Could not save asset index %s: %s", path, exc)
+                continue
+            if path != self.path:
+                log.info("Asset folder is read-only; asset index kept in %s", path)
+                self.path = path  # stop retrying the read-only location
+            self._dirty = False
+            return
+        log.warning("Could not save the asset index anywhere; the next start rescans %s", self.root)
+
+    def update(self, full: bool = False, dirs: Optional[Iterable[str]] = None) -> bool:
+        """Revalidate against the tree; True if anything changed. Saves when it did."""
+        self.listed = 0
+        if dirs is None:
+            seen = set()
+            if self.root.is_dir():
+                self._walk("", full, seen)
+            for rel in set(self.dirs) - seen:
+                del self.dirs[rel]  # directory removed
+                self._dirty = True
+        else:
+            for rel in sorted(dirs):
+                self._relist(rel)
+        changed = self._dirty
+        self.save()
+        return changed
+
+    def _relist(self, rel: str):
+        previous = self.dirs.get(rel)
+        directory = self.root / rel if rel else self.root
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except OSError:
+            self._prune(rel)
+            return
+        entry = self._list(directory, mtime_ns, previous)
+        if entry != previous:
+            self.dirs[rel] = entry
+            self._dirty = True
+        old_subdirs = set(previous["subdirs"]) if previous else set()
+        for name in old_subdirs - set(entry["subdirs"]):
+            self._prune(f"{rel}/{name}" if rel else name)
+        for name in set(entry["subdirs"]) - old_subdirs:
+            self._walk(f"{rel}/{name}" if rel else name, False, set())
+
+    def _prune(self, rel: str):
+        """Drop ``rel`` and everything below it."""
+        prefix = f"{rel}/" if rel else ""
+        for key in [key for key in self.dirs if key == rel or key.startswith(prefix)]:
+            del self.dirs[key]
+            self._dirty = True
+
+    def _walk(self, start: str, full: bool, seen: set):
+        stack = [start]
+        while stack:
+            rel = stack.pop()
+            directory = self.root / rel if rel else self.root
+            try:
+                mtime_ns = directory.stat().st_mtime_ns
+            except OSError:
+                continue
+            seen.add(rel)
+            entry = self.dirs.get(rel)
+            if entry is None or entry["mtime_ns"] != mtime_ns or full:
+                entry = self._list(directory, mtime_ns, entry)
+                if entry != self.dirs.get(rel):
+                    self.dirs[rel] = entry
+                    self._dirty = True
+            stack.extend(f"{rel}/{name}" if rel else name for name in entry["subdirs"])
+
+    def _list(self, directory: Path, mtime_ns: int, previous: Optional[Dict[str, object]]) -> Dict[str, object]:
+        self.listed += 1
+        old_files = (previous or {}).get("files") or {}
+        files: Dict[str, Dict[str, object]] = {}
+        subdirs = []
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            entries = []
+        for item in entries:
+            try:
+                if item.is_dir():
+                    if not item.is_symlink():  # like rglob: no cycles through links
+                        subdirs.append(item.name)
+                    continue
+                if not item.is_file():
+                    continue
+                suffix = os.path.splitext(item.name)[1].lower()
+                if suffix not in self.extensions:
+                    continue
+                stat = item.stat()
+                old = old_files.get(item.name)
+                if old and old["size"] == stat.st_size and old["mtime_ns"] == stat.st_mtime_ns:
+                    files[item.name] = old  # keeps its sha256, if one was computed
+                    continue
+                # No content read here: hashing every asset would dominate the scan.
+                files[item.name] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "format": suffix.lstrip("."),
+                }
+            except OSError:
+                continue  # removed while listing
+        return {"mtime_ns": mtime_ns, "subdirs": sorted(subdirs), "files": files}
+
+    def info(self, path: Path) -> Optional[Dict[str, object]]:
+        """Indexed size/mtime/format of one asset path, plus its sha256 (hashed on first request)."""
+        rel = Path(path).parent.relative_to(self.root).as_posix()
+        entry = self.dirs.get("" if rel == "." else rel)
+        info = entry["files"].get(Path(path).name) if entry else None
+        if info is not None and "sha256" not in info:
+            try:
+                info["sha256"] = file_sha256(Path(path))
+            except OSError:
+                return info
+            self.hashed += 1
+            self._dirty = True
+            self.save()
+        return info
+
+    def assets(self) -> Iterator[Tuple[Path, Dict[str, object]]]:
+        """(path, info) for every indexed asset."""
+        for rel, entry in self.dirs.items():
+            directory = self.root / rel if rel else self.root
+            for name, info in entry["files"].items():
+                yield directory / name, info
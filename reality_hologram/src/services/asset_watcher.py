@@ -0,0 +1,140 @@
+"""Tells ModelRegistry which asset directories changed since it last looked.
+
+On Linux this is inotify (through ctypes, no extra dependency): one watch
+per indexed directory, and ``poll`` is a non-blocking read of the queued
+events. Elsewhere, or when inotify is unavailable or out of watches, it
+falls back to mtime polling: ``poll`` asks for a revalidation of the whole
+index (one ``stat`` per directory) at most every ``poll_interval`` seconds.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
+
+log = logging.getLogger(__name__)
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class AssetWatcher:
+    """``poll`` returns the changed directories (relative to ``root``), or None for "revalidate all"."""
+
+    def __init__(self, root: Path, poll_interval: float = 2.0, use_inotify: bool = True):
+        self.root = Path(root)
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+        self._libc = _load_libc() if use_inotify else None
+        self._watches: Dict[str, int] = {}  # rel dir -> wd
+        self._dirs_by_wd: Dict[int, str] = {}
+        self._last_poll = time.monotonic()
+        if self._libc is not None:
+            fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+            else:
+                log.debug("inotify_init1 failed (errno %s); polling asset mtimes", ctypes.get_errno())
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._fd is not None else "poll"
+
+    def sync(self, dirs: Iterable[str]):
+        """Watch exactly ``dirs`` (the directories currently in the index)."""
+        if self._fd is None:
+            return
+        wanted = set(dirs)
+        for rel in set(self._watches) - wanted:
+            wd = self._watches.pop(rel)
+            self._dirs_by_wd.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+        for rel in wanted - set(self._watches):
+            path = os.fsencode(self.root / rel if rel else self.root)
+            wd = self._libc.inotify_add_watch(self._fd, path, WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if errno == 28:  # ENOSPC: fs.inotify.max_user_watches reached
+                    log.info("Out of inotify watches; polling asset mtimes instead")
+                    self._fall_back()
+                    return
+                continue  # directory vanished meanwhile; its parent reports it
+            self._watches[rel] = wd
+            self._dirs_by_wd[wd] = rel
+
+    def poll(self) -> Optional[Set[str]]:
+        if self._fd is None:
+            now = time.monotonic()
+            if now - self._last_poll < self.poll_interval:
+                return set()
+            self._last_poll = now
+            return None
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return changed
+            except OSError:
+                return None
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT.unpack_from(data, offset)
+                offset += EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    return None  # events lost: revalidate everything
+                rel = self._dirs_by_wd.get(wd)
+                if rel is None:
+                    continue
+                if mask & IN_IGNORED:
+                    # Watch gone with its directory; the parent's event covers it.
+                    self._dirs_by_wd.pop(wd, None)
+                    self._watches.pop(rel, None)
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    rel = rel.rpartition("/")[0] if "/" in rel else ""
+                changed.add(rel)
+
+    def _fall_back(self):
+        self.close()
+        self._last_poll = time.monotonic()
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._watches.clear()
+        self._dirs_by_wd.clear()
@@ -1,16 +1,39 @@
 """Indexes 3D assets for the hologram renderer."""
 
+import threading
 from pathlib import Path
 from typing import Dict, Iterable, Optional, Set
 
+from .asset_index import AssetIndex
+from .asset_watcher import AssetWatcher
+
 
 class ModelRegistry:
-    """Scans the assets folder and keeps a simple catalog."""
+    """Scans the assets folder and keeps a simple catalog.
+
+    The scan goes through a persistent ``AssetIndex`` (``index_path``, by
+    default ``.asset_index.json`` next to the asset folder), so only
+    directories that changed since the last run are listed again. With
+    ``watch`` an ``AssetWatcher`` (inotify, or mtime polling) feeds
+    ``refresh_changes``, which re-lists only what changed while running.
+    Watching holds an inotify instance until ``close``, so only the shared
+    registry in the service container turns it on.
+    """
 
-    def __init__(self, asset_root: Optional[Path] = None, extensions: Optional[Iterable[str]] = None):
+    def __init__(
+        self,
+        asset_root: Optional[Path] = None,
+        extensions: Optional[Iterable[str]] = None,
+        index_path: Optional[Path] = None,
+        watch: bool = False,
+    ):
         self.extensions: Set[str] = set(ext.lower() for ext in (extensions or {".glb", ".gltf", ".obj"}))
         self.asset_root = self._pick_root(asset_root)
         self.catalog: Dict[str, Path] = {}
+        self.index = AssetIndex(self.asset_root, self.extensions, path=index_path)
+        self.watcher = AssetWatcher(self.asset_root) if watch else None
+        self.generation = 0  # bumped whenever the catalog changes
+        self._lock = threading.RLock()
         self.refresh()
 
     def _pick_root(self, asset_root: Optional[Path]) -> Path:
@@ -30,20 +53,39 @@ class ModelRegistry:
 
         return candidates[0]
 
-    def refresh(self) -> None:
-        """Re-scan the asset directory and update the catalog."""
-        self.catalog.clear()
-        if not self.asset_root.exists():
-            return
+    def refresh(self, full: bool = False, dirs: Optional[Iterable[str]] = None) -> bool:
+        """Re-scan the asset directory and update the catalog; True if it changed.
 
-        for file_path in self.asset_root.rglob("*"):
-            if not file_path.is_file():
-                continue
-            if file_path.suffix.lower() not in self.extensions:
-                continue
+        Unchanged directories come from the index; ``full`` also re-checks
+        files rewritten in place, ``dirs`` limits the scan to those directories.
+        """
+        with self._lock:
+            changed = self.index.update(full=full, dirs=dirs)
+            if changed or not self.catalog:
+                self.catalog = {file_path.stem: file_path for file_path, _ in self.index.assets()}
+            if changed:
+                self.generation += 1
+            if self.watcher is not None:
+                self.watcher.sync(self.index.dirs)
+        return changed
 
-            key = file_path.stem
-            self.catalog[key] = file_path
+    def refresh_changes(self) -> bool:
+        """Apply what the watcher reported since the last call (microseconds when nothing did)."""
+        if self.watcher is None:
+            return False
+        with self._lock:
+            changes = self.watcher.poll()
+            if changes is None:
+                return self.refresh()  # polling backend, or inotify lost events
+            return self.refresh(dirs=changes) if changes else False
+
+    def info(self, key: str) -> Optional[Dict[str, object]]:
+        """Indexed size and format of a registered model, plus its sha256 (computed on first call)."""
+        path = self.catalog.get(key)
+        if path is None:
+            return None
+        with self._lock:  # may hash the file and save the index
+            return self.index.info(path)
 
     def resolve(self, key: str) -> Optional[Path]:
         """Get a path for a registered model id."""
@@ -53,3 +95,10 @@ class ModelRegistry:
         """Return a sorted list of registered model ids."""
         return sorted(self.catalog.keys())
 
+    def close(self):
+        """Stop watching the asset folder (releases the inotify descriptor)."""
+        with self._lock:
+            if self.watcher is not None:
+                self.watcher.close()
+                self.watcher = None
+
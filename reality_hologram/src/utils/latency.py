@@ -0,0 +1,138 @@
+"""Per-stage latency tracing for the gesture -> hologram path.
+
+A trace is a plain ``{stage: perf_counter()}`` dict that travels with a frame,
+then with its GestureEvent, RenderCommand and the command written for the
+viewer. ``mark`` stamps the next stage and records the time since the
+previous one in this process's ``LatencyRecorder``; the viewer closes the
+trace with the end-to-end latency from frame grab to applied command.
+
+``time.perf_counter`` is a system-wide monotonic clock on Linux, Windows and
+macOS, so stamps taken in the capture process can be compared in the viewer.
+"""
+
+import atexit
+import json
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+Trace = Dict[str, float]
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, int(round(q / 100.0 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class LatencyRecorder:
+    """Rolling window of samples per stage with p50/p95/p99 summaries.
+
+    ``record`` is cheap (a deque append) and thread-safe; every ``interval``
+    seconds the next call logs a summary.
+    """
+
+    def __init__(self, window: int = 1024, interval: float = 10.0):
+        self.window = window
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._last_summary = time.perf_counter()
+
+    def record(self, stage: str, seconds: float):
+        samples = self._samples.get(stage)
+        if samples is None:
+            with self._lock:
+                samples = self._samples.setdefault(stage, deque(maxlen=self.window))
+        samples.append(seconds)
+        self.counts[stage] = self.counts.get(stage, 0) + 1
+        if self.interval and time.perf_counter() - self._last_summary >= self.interval:
+            self._log_summary()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Milliseconds per stage over the current window."""
+        out = {}
+        with self._lock:
+            stages = list(self._samples.items())
+        for stage, samples in stages:
+            ordered = sorted(samples)
+            out[stage] = {
+                "count": self.counts.get(stage, 0),
+                "p50_ms": percentile(ordered, 50) * 1000.0,
+                "p95_ms": percentile(ordered, 95) * 1000.0,
+                "p99_ms": percentile(ordered, 99) * 1000.0,
+                "max_ms": (ordered[-1] if ordered else 0.0) * 1000.0,
+            }
+        return out
+
+    def dump(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.summary(), indent=2), encoding="utf-8")
+
+    def _log_summary(self):
+        with self._lock:
+            now = time.perf_counter()
+            if now - self._last_summary < self.interval:
+                return  # another thread got here first
+            self._last_summary = now
+        for stage, stats in self.summary().items():
+            log.info(
+                "latency %-12s p50=%.1fms p95=%.1fms p99=%.1fms (n=%s)",
+                stage,
+                stats["p50_ms"],
+                stats["p95_ms"],
+                stats["p99_ms"],
+                stats["count"],
+            )
+
+
+_recorder: Optional[LatencyRecorder] = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder() -> LatencyRecorder:
+    """Process-wide recorder shared by every stage."""
+    global _recorder
+    if _recorder is None:
+        with _recorder_lock:
+            if _recorder is None:
+                _recorder = LatencyRecorder()
+    return _recorder
+
+
+def dump_at_exit(path):
+    """Write the summary of this process to ``path`` as JSON on exit."""
+    atexit.register(lambda: get_recorder().dump(path))
+
+
+def start_trace(ts: Optional[float] = None, stage: str = "grab") -> Trace:
+    return {stage: time.perf_counter() if ts is None else ts}
+
+
+def mark(trace: Optional[Trace], stage: str) -> Optional[Trace]:
+    """Stamp ``stage`` and record the time since the previous stamp."""
+    if trace is None:
+        return None
+    now = time.perf_counter()
+    if trace:
+        get_recorder().record(stage, now - next(reversed(trace.values())))
+    trace[stage] = now
+    return trace
+
+
+def finish(trace: Optional[Trace], stage: str, total: str = "end_to_end") -> Optional[Trace]:
+    """``mark`` plus the total since the first stamp under ``total``."""
+    if mark(trace, stage) is None:
+        return None
+    first = next(iter(trace.values()))
+    get_recorder().record(total, trace[stage] - first)
+    return trace
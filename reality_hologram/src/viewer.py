@@ -1,6 +1,7 @@
 """Panda3D viewer with VideoBI mode (actor + terrain grid + follow camera)."""
 
 import argparse
+import logging
 import sys
 from pathlib import Path
 
@@ -27,11 +28,17 @@ try:
 except ImportError:
     gltf_load_model = None
 
-from .rendering.scene_manager import SceneManager
 from .rendering.camera_rig import CameraRig
+from .core.command_codec import decode_command
+from .core.command_coalescer import zoom_factor
+from .core.command_queue import CommandQueue
+from .core.command_ring import DEFAULT_NAME, CommandRing
+from .core.command_socket import CommandServer
+from .core.service_container import get_services
+from .utils.latency import dump_at_exit, finish
 
 
-def parse_args():
+def build_parser():
     parser = argparse.ArgumentParser(description="Reality Hologram Viewer (Panda3D)")
     parser.add_argument("--scene", type=str, default="default", help="Scene id or asset_id to load.")
     parser.add_argument("--scale", type=float, default=0.8, help="Scale factor for the loaded model.")
@@ -42,7 +49,24 @@ def parse_args():
     parser.add_argument("--videobi", action="store_true", help="Activa modo VideoBI (actor + terreno + camara follow).")
     parser.add_argument("--speed", type=float, default=3.0, help="Velocidad del actor en VideoBI (u/s).")
     parser.add_argument("--video", type=str, help="Ruta a un .mp4 para reproducir en la ventana del holograma.")
-    return parser.parse_args()
+    parser.add_argument(
+        "--latency-report", type=str, help="Al salir, guarda p50/p95/p99 de latencia por etapa (JSON) en esta ruta."
+    )
+    parser.add_argument(
+        "--listen",
+        nargs="?",
+        const="",
+        metavar="ENDPOINT",
+        help=(
+            "Recibe comandos por socket local en vez del ring compartido (permite varios viewers). "
+            "Sin valor usa un socket propio en el directorio de endpoints; acepta unix:RUTA o tcp:HOST:PUERTO."
+        ),
+    )
+    return parser
+
+
+def parse_args():
+    return build_parser().parse_args()
 
 
 class Viewer(ShowBase):
@@ -57,6 +81,8 @@ class Viewer(ShowBase):
         videobi: bool = False,
         move_speed: float = 3.0,
         video_path: Path | None = None,
+        listen: str | None = None,
+        command_queue: CommandQueue | None = None,
     ):
         # Config Panda3D
         plugin_dir = Path(panda3d.__path__[0])  # site-packages/panda3d
@@ -88,8 +114,17 @@ class Viewer(ShowBase):
         self._tile_size = (0.0, 0.0)
         self._tile_center_idx = (0, 0)
         self.video_path = video_path
-        self.command_file = Path(__file__).resolve().parents[1] / ".commands.json"
-        self._cmd_last_ts = 0.0
+        # Commands from RealityPipeline, drained once per frame: the shared ring
+        # (single viewer), this viewer's own socket server with ``listen``, or
+        # an in-memory queue when the pipeline runs in this process.
+        self.command_server = None
+        self.command_ring = None
+        self.command_queue = command_queue
+        if command_queue is None and listen is not None:
+            self.command_server = CommandServer(listen or None)
+            self.command_server.start()
+        elif command_queue is None:
+            self.command_ring = CommandRing(DEFAULT_NAME)
         self._cmd_move_dir = 0  # -1 back, 0 stop, 1 forward
         self._cmd_paused = False
         self._cmd_zoom_factor = 1.0
@@ -244,7 +279,7 @@ class Viewer(ShowBase):
     def _update_actor(self, task):
         if not self.actor:
             return task.cont
-        self._poll_commands()
+        self._drain_commands()
         dt = globalClock.getDt()
         heading = self.actor.getH()
         if self._keys["left"]:
@@ -347,22 +382,21 @@ class Viewer(ShowBase):
     # --------------------------
     # Command polling (bridge with gesture controller)
     # --------------------------
-    def _poll_commands(self):
-        if not self.command_file.exists():
-            return
-        try:
-            data = self.command_file.read_text(encoding="utf-8")
-            import json
-
-            cmd = json.loads(data)
-        except Exception:
-            return
-
-        ts = cmd.get("ts", 0.0)
-        if ts <= self._cmd_last_ts:
+    def _drain_commands(self):
+        # Every command since the last frame, in order (a burst is no longer collapsed).
+        if self.command_queue is not None:
+            for cmd in self.command_queue.drain():
+                self._apply_command(cmd)
             return
-        self._cmd_last_ts = ts
+        source = self.command_server or self.command_ring
+        for raw in source.drain():
+            try:
+                cmd = decode_command(raw)
+            except ValueError:
+                continue
+            self._apply_command(cmd)
 
+    def _apply_command(self, cmd: dict):
         action = cmd.get("action")
         payload = cmd.get("payload", {}) or {}
 
@@ -380,12 +414,8 @@ class Viewer(ShowBase):
             deg = float(payload.get("degrees", 0.0))
             self.actor.setH(self.actor.getH() + deg)
         elif action == "zoom":
-            delta = float(payload.get("delta", 0.0))
+            factor = zoom_factor(float(payload.get("delta", 0.0)))
             x, y, z = self._follow_offset
-            if delta >= 0:
-                factor = max(0.3, 1.0 - delta * 0.5)  # acercar
-            else:
-                factor = min(3.0, 1.0 + abs(delta) * 0.5)  # alejar
             self._follow_offset = (x, y * factor, z * factor)
             self._setup_follow_camera()
         elif action == "pause":
@@ -396,6 +426,8 @@ class Viewer(ShowBase):
         elif action == "accelerate":
             factor = float(payload.get("factor", 0.5))
             self._speed_mult = max(0.5, min(3.0, self._speed_mult + factor))
+        # Gesture -> actor motion: the actor moves with this state on this same task tick.
+        finish(cmd.get("trace"), "apply")
 
     def _setup_video_plane(self, video_path: Path):
         """Crea un plano con textura de video (mp4) en la escena."""
@@ -426,9 +458,9 @@ class Viewer(ShowBase):
         print(f"[viewer] Video adjuntado: {video_path}")
 
 
-def main():
-    args = parse_args()
-    manager = SceneManager()
+def create_viewer(args, command_queue: CommandQueue | None = None) -> Viewer:
+    """Resolve the scene/actor/terrain assets named in ``args`` and build the Viewer."""
+    manager = get_services().get("scene_manager")
     scene_info = manager.load(args.scene)
     scene_path = scene_info.get("asset")
     if not scene_path:
@@ -447,7 +479,7 @@ def main():
         if args.terrain and not terrain_path:
             print(f"[viewer] No se encontro terreno '{args.terrain}'. Disponible: {manager.list_available()}")
 
-    viewer = Viewer(
+    return Viewer(
         scene_path=scene_path,
         scale=args.scale,
         spin=args.spin,
@@ -457,8 +489,22 @@ def main():
         videobi=args.videobi,
         move_speed=args.speed,
         video_path=Path(args.video) if args.video else None,
+        listen=args.listen,
+        command_queue=command_queue,
     )
-    viewer.run()
+
+
+def main():
+    args = parse_args()
+    if args.latency_report:
+        logging.basicConfig(level=logging.INFO, format="[viewer] %(message)s")
+        dump_at_exit(args.latency_report)
+    viewer = create_viewer(args)
+    try:
+        viewer.run()
+    finally:
+        if viewer.command_server:
+            viewer.command_server.stop()
 
 
 if __name__ == "__main__":
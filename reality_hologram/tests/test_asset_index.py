@@ -0,0 +1,79 @@
+import hashlib
+import os
+
+import pytest
+
+from reality_hologram.src.services import asset_index
+from reality_hologram.src.services.asset_index import AssetIndex
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    root = tmp_path / "assets"
+    (root / "cars").mkdir(parents=True)
+    (root / "cars" / "car.glb").write_bytes(b"glTF-car")
+    (root / "tree.obj").write_bytes(b"o tree")
+    (root / "notes.txt").write_text("not an asset")
+    return root
+
+
+def make_index(root, path=None):
+    index = AssetIndex(root, {".glb", ".obj"}, path=path)
+    index.update()
+    return index
+
+
+def test_warm_start_lists_nothing_and_reads_no_content(tree, monkeypatch):
+    make_index(tree)
+    monkeypatch.setattr(asset_index, "file_sha256", lambda path: pytest.fail("hashed during a scan"))
+    index = make_index(tree)
+    assert index.listed == 0
+    assert sorted(path.name for path, _ in index.assets()) == ["car.glb", "tree.obj"]
+
+
+def test_new_files_are_listed_but_not_hashed(tree, monkeypatch):
+    make_index(tree)
+    (tree / "cars" / "van.glb").write_bytes(b"glTF-van")
+    monkeypatch.setattr(asset_index, "file_sha256", lambda path: pytest.fail("hashed during a scan"))
+    index = make_index(tree)
+    assert index.listed == 1
+    entry = index.dirs["cars"]["files"]["van.glb"]
+    assert entry["size"] == 8 and entry["format"] == "glb" and "sha256" not in entry
+    assert index.hashed == 0
+
+
+def test_info_hashes_lazily_and_persists(tree):
+    index = make_index(tree)
+    info = index.info(tree / "cars" / "car.glb")
+    assert info["sha256"] == hashlib.sha256(b"glTF-car").hexdigest()
+    assert index.hashed == 1
+    index.info(tree / "cars" / "car.glb")
+    assert index.hashed == 1
+
+    again = make_index(tree)
+    assert again.info(tree / "cars" / "car.glb")["sha256"] == info["sha256"]
+    assert again.hashed == 0
+
+
+def test_rewritten_file_drops_its_hash(tree):
+    index = make_index(tree)
+    index.info(tree / "tree.obj")
+    path = tree / "tree.obj"
+    path.write_bytes(b"o bigger tree")
+    os.utime(path, ns=(1, 1))
+    index.update(full=True)
+    info = index.info(path)
+    assert info["size"] == 13
+    assert info["sha256"] == hashlib.sha256(b"o bigger tree").hexdigest()
+
+
+def test_unwritable_index_location_falls_back_to_user_cache(tree, tmp_path):
+    blocker = tmp_path / "blocker"
+    blocker.write_text("a file, so nothing can be created below it")
+    index = make_index(tree, path=blocker / "index.json")
+    assert index.path == asset_index.fallback_index_path(tree)
+    assert index.path.exists()
+
+    warm = make_index(tree, path=blocker / "index.json")
+    assert warm.listed == 0
@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+
+from reality_hologram.src.core.command_coalescer import (
+    ZOOM_MIN_FACTOR,
+    CommandCoalescer,
+    zoom_factor,
+)
+from reality_hologram.src.core.command_queue import CommandQueue
+from reality_hologram.src.core.events import RenderCommand
+from reality_hologram.src.core.pipeline import RealityPipeline
+
+
+def command(action, **payload):
+    return {"action": action, "payload": payload}
+
+
+def held(window=10.0):
+    """A coalescer whose timer never fires during the test, and what it emitted."""
+    emitted = []
+    return CommandCoalescer(emitted.append, window=window), emitted
+
+
+@pytest.mark.parametrize("deltas", [(0.2, 0.4), (0.4, -0.6), (-0.5, -0.5, -0.5), (0.1, 0.1, 0.1, 0.1)])
+def test_merged_zoom_equals_the_sequential_factor(deltas):
+    coalescer, emitted = held()
+    for delta in deltas:
+        coalescer.submit(command("zoom", delta=delta))
+    coalescer.flush()
+    assert len(emitted) == 1
+    sequential = 1.0
+    for delta in deltas:
+        sequential *= zoom_factor(delta)
+    assert zoom_factor(emitted[0]["payload"]["delta"]) == pytest.approx(sequential)
+
+
+def test_zoom_pair_that_the_viewer_would_clamp_is_not_merged():
+    coalescer, emitted = held()
+    assert zoom_factor(1.0) * zoom_factor(1.0) < ZOOM_MIN_FACTOR
+    coalescer.submit(command("zoom", delta=1.0))
+    coalescer.submit(command("zoom", delta=1.0))
+    coalescer.flush()
+    assert [data["payload"]["delta"] for data in emitted] == [1.0, 1.0]
+
+
+def test_rotate_sums_per_axis_and_keeps_the_oldest_trace():
+    coalescer, emitted = held()
+    coalescer.submit(dict(command("rotate", axis="y", degrees=10.0), trace={"grab": 1.0}))
+    coalescer.submit(dict(command("rotate", axis="y", degrees=-4.0), trace={"grab": 2.0}))
+    coalescer.submit(command("rotate", axis="x", degrees=5.0))
+    coalescer.flush()
+    assert [data["payload"] for data in emitted] == [{"axis": "y", "degrees": 6.0}, {"axis": "x", "degrees": 5.0}]
+    assert emitted[0]["trace"]["grab"] == 1.0
+
+
+def test_move_keeps_the_latest_direction():
+    coalescer, emitted = held()
+    for direction in ("left", "up", "right"):
+        coalescer.submit(command("move", direction=direction))
+    coalescer.flush()
+    assert [data["payload"]["direction"] for data in emitted] == ["right"]
+
+
+def test_barrier_flushes_pending_commands_in_order():
+    coalescer, emitted = held()
+    coalescer.submit(command("zoom", delta=0.2))
+    coalescer.submit(command("rotate", degrees=15.0))
+    coalescer.submit(command("zoom", delta=0.2))
+    coalescer.submit(command("pause"))
+    coalescer.submit(command("rotate", degrees=5.0))
+    assert [data["action"] for data in emitted] == ["zoom", "rotate", "pause"]
+    coalescer.flush()
+    assert [data["action"] for data in emitted] == ["zoom", "rotate", "pause", "rotate"]
+    assert coalescer.stats() == {"submitted": 5, "emitted": 4, "merged": 1}
+
+
+def test_timer_flushes_after_the_window():
+    done = threading.Event()
+    emitted = []
+
+    def emit(data):
+        emitted.append(data)
+        done.set()
+
+    coalescer = CommandCoalescer(emit, window=0.01)
+    coalescer.submit(command("rotate", degrees=1.0))
+    coalescer.submit(command("rotate", degrees=2.0))
+    assert done.wait(1.0)
+    assert [data["payload"]["degrees"] for data in emitted] == [3.0]
+
+
+def test_zero_window_passes_through():
+    coalescer, emitted = held(window=0)
+    coalescer.submit(command("rotate", degrees=1.0))
+    coalescer.submit(command("rotate", degrees=2.0))
+    assert [data["payload"]["degrees"] for data in emitted] == [1.0, 2.0]
+
+
+def test_pipeline_shutdown_flushes_pending_commands():
+    queue = CommandQueue()
+    pipeline = RealityPipeline(command_queue=queue, coalesce_window=10.0)
+    pipeline.apply_command(RenderCommand(action="rotate", payload={"degrees": 10.0}))
+    pipeline.apply_command(RenderCommand(action="rotate", payload={"degrees": 5.0}))
+    assert queue.drain() == []
+    assert pipeline.apply_command(RenderCommand(action="shutdown")) == {"status": "stopped"}
+    sent = queue.drain()
+    assert [(data["action"], data["payload"]["degrees"], data["seq"]) for data in sent] == [("rotate", 15.0, 1)]
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from reality_hologram.src.core.command_codec import MAGIC, PAYLOADS, STAGES, decode_command, encode_command
+from reality_hologram.src.core.command_ring import CommandRing
+from reality_hologram.src.core.pipeline import RealityPipeline
+
+SAMPLES = {
+    "move": {"direction": "forward", "speed": 1.5},
+    "rotate": {"axis": "x", "degrees": -22.5},
+    "zoom": {"delta": 0.25},
+    "accelerate": {"factor": 2.0},
+    "pause": {"target": "actor"},
+    "resume": {"target": "actor"},
+}
+
+
+def full_trace():
+    return {stage: 100.0 + i * 0.125 for i, stage in enumerate(STAGES)}
+
+
+def test_samples_cover_every_binary_action():
+    assert set(SAMPLES) == set(PAYLOADS)
+
+
+@pytest.mark.parametrize("action", sorted(SAMPLES))
+def test_binary_round_trip(action):
+    data = {"action": action, "payload": SAMPLES[action], "ts": 12.5, "seq": 7}
+    raw = encode_command(data)
+    assert raw[0] == MAGIC
+    assert decode_command(raw) == data
+
+
+def test_trace_round_trips_with_every_stage_code():
+    data = {"action": "rotate", "payload": SAMPLES["rotate"], "ts": 1.0, "seq": 3, "trace": full_trace()}
+    raw = encode_command(data)
+    assert raw[0] == MAGIC
+    assert decode_command(raw) == data
+
+
+def test_seq_wraps_at_32_bits():
+    raw = encode_command({"action": "pause", "payload": {"target": "actor"}, "seq": 2**32 + 5})
+    assert decode_command(raw)["seq"] == 5
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"action": "spin", "payload": {"turns": 2}, "ts": 1.0, "seq": 1},
+        {"action": "zoom", "payload": {"delta": 0.5, "anchor": "actor"}, "ts": 1.0, "seq": 2},
+        {"action": "move", "payload": {"direction": "sideways", "speed": 1.0}, "ts": 1.0, "seq": 3},
+        {"action": "zoom", "payload": {"delta": 0.5}, "ts": 1.0, "seq": 4, "trace": {"render": 2.0}},
+    ],
+    ids=["unknown action", "extra payload key", "unknown enum value", "unknown stage"],
+)
+def test_json_fallback_round_trips(data):
+    raw = encode_command(data)
+    assert raw[:1] == b"{"
+    assert decode_command(raw) == data
+
+
+def test_malformed_record_raises_value_error():
+    raw = encode_command({"action": "move", "payload": SAMPLES["move"], "trace": full_trace()})
+    with pytest.raises(ValueError):
+        decode_command(raw[:-3])
+    with pytest.raises(ValueError):
+        decode_command(bytes([0x42]) + raw[1:])
+
+
+def test_oversized_trace_is_dropped_to_fit_the_ring():
+    name = f"rh_test_codec_{os.getpid()}"
+    ring = CommandRing(name, slots=4, record_size=64)
+    try:
+        pipeline = RealityPipeline(command_ring=name, coalesce_window=0)
+        pipeline.command_ring = ring
+        data = {"action": "rotate", "payload": SAMPLES["rotate"], "ts": 1.0, "trace": full_trace()}
+        assert len(encode_command(data)) > ring.capacity
+        pipeline._write_command(data)
+        (raw,) = ring.drain()
+        sent = decode_command(raw)
+        assert "trace" not in sent
+        assert sent["payload"] == SAMPLES["rotate"] and sent["seq"] == 1
+    finally:
+        ring.close()
+        ring.unlink()
@@ -0,0 +1,58 @@
+import socket
+import time
+
+import pytest
+
+from reality_hologram.src.core.command_socket import HAS_UNIX_SOCKETS, CommandFanout, CommandServer
+from reality_hologram.src.core.pipeline import RealityPipeline
+
+pytestmark = pytest.mark.skipif(not HAS_UNIX_SOCKETS, reason="Unix domain sockets")
+
+
+@pytest.fixture
+def endpoints(tmp_path, monkeypatch):
+    monkeypatch.setenv("REALITY_HOLOGRAM_ENDPOINTS", str(tmp_path))
+    return tmp_path
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_pipeline_fanout_is_opt_in():
+    assert RealityPipeline().fanout is None
+
+
+def test_endpoint_without_socket_is_removed(endpoints):
+    stale = endpoints / "gone.endpoint"
+    stale.write_text(f"unix:{endpoints / 'gone.sock'}")
+    assert CommandFanout._discovered() == {}
+    assert not stale.exists()
+
+
+def test_crashed_viewer_endpoint_is_pruned_and_live_viewer_kept(endpoints):
+    # A viewer that crashed: socket file still there, nobody listening.
+    path = endpoints / "crashed.sock"
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(path))
+    sock.close()
+    stale = endpoints / "crashed.endpoint"
+    stale.write_text(f"unix:{path}")
+
+    server = CommandServer(name="alive")
+    server.start()
+    fanout = CommandFanout(scan_interval=0.02)
+    try:
+        fanout.send(b"hello")
+        wait_for(lambda: not stale.exists())
+        wait_for(lambda: server.address in fanout.links and fanout.links[server.address].connected)
+        assert set(fanout.links) == {server.address}
+        fanout.send(b"again")
+        wait_for(lambda: server.received)
+        assert server.drain() == [b"again"]
+    finally:
+        fanout.close()
+        server.stop()
@@ -0,0 +1,39 @@
+import pytest
+
+from reality_hologram.src.rendering.scene_manager import SceneManager
+from reality_hologram.src.services.model_registry import ModelRegistry
+
+
+@pytest.fixture
+def assets(tmp_path):
+    root = tmp_path / "assets"
+    root.mkdir()
+    (root / "car.glb").write_bytes(b"glTF")
+    return root
+
+
+def test_registries_do_not_watch_by_default(assets, tmp_path):
+    registry = ModelRegistry(asset_root=assets, index_path=tmp_path / "index.json")
+    assert registry.watcher is None
+    assert registry.resolve("car") == assets / "car.glb"
+    assert registry.refresh_changes() is False
+
+
+def test_close_releases_the_watcher(assets, tmp_path):
+    registry = ModelRegistry(asset_root=assets, index_path=tmp_path / "index.json", watch=True)
+    watcher = registry.watcher
+    registry.close()
+    assert registry.watcher is None
+    assert watcher.backend == "poll" and not watcher._watches
+    registry.close()  # idempotent
+
+
+def test_scene_manager_picks_up_assets_without_a_watcher(assets, tmp_path):
+    registry = ModelRegistry(asset_root=assets, index_path=tmp_path / "index.json")
+    scenes = SceneManager(registry=registry, miss_ttl=60.0)
+    assert scenes.load("truck")["asset"] is None
+    (assets / "truck.glb").write_bytes(b"glTF")
+    # Known miss: no rescan until the TTL runs out or the catalog changes.
+    assert scenes.load("truck")["asset"] is None
+    registry.refresh()
+    assert scenes.load("truck")["asset"] == assets / "truck.glb"